@@ -1,3 +1,4 @@
 from . import node
 from . import structure
+from . import graph
 from . import parameters
\ No newline at end of file
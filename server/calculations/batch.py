@@ -0,0 +1,56 @@
+# Copyright (C) Jakub Więckowski 2024
+
+# CALCULATIONS
+from .structure import CalculationStructure
+from .pool import map_jobs
+
+def calculate_structure_job(data, locale):
+    """
+    Evaluates the structure, catching the calculation error to not abort other structures of the batch.
+
+    Parameters
+    ----------
+    data : list
+        List of node data dictionaries to create the structure.
+    locale : str
+        User application language.
+
+    Returns
+    -------
+    dict
+        Dictionary with the calculation results under the 'response' key, or the error message under the 'error' key.
+    """
+    try:
+        calculation = CalculationStructure(data, locale)
+        return {
+            "response": calculation.calculate()
+        }
+    except Exception as err:
+        return {
+            "error": str(err)
+        }
+
+def calculate_batch(structures, locale, parallel=False):
+    """
+    Evaluates the batch of structures.
+
+    Results of the MCDA and weighting methods are shared between the structures through the results cache.
+
+    Parameters
+    ----------
+    structures : list
+        List of structures, each given as the list of node data dictionaries.
+    locale : str
+        User application language.
+    parallel : bool, optional
+        If True, structures are evaluated in the pool of worker processes, limited to the jobs of a single request evaluated at the same time (default is False).
+
+    Returns
+    -------
+    list
+        Results of each structure in the order of the given structures.
+    """
+    if parallel:
+        return map_jobs([(calculate_structure_job, (data, locale)) for data in structures])
+
+    return [calculate_structure_job(data, locale) for data in structures]
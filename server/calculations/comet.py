@@ -0,0 +1,202 @@
+# Copyright (C) Jakub Więckowski 2024
+
+import json
+import uuid
+import numpy as np
+
+# CONST
+from config import COMET_MODELS_LIMIT, COMET_MODELS_TTL, COMET_CHUNK_SIZE
+from methods.comet import comet_inference
+
+# CALCULATIONS
+from .node import MatrixNode, create_method_object
+
+# UTILS
+from utils.cache import LRUCache
+from utils.errors import get_error_message
+from utils.validator import validate_matrix, validate_types, validate_dimensions
+
+# fitted COMET models used to evaluate new alternatives, removed after COMET_MODELS_TTL seconds without use
+models = LRUCache(COMET_MODELS_LIMIT, COMET_MODELS_TTL)
+
+COMET_EXPERTS = ['method_expert', 'esp_expert', 'compromise_expert']
+
+class CometModel:
+    def __init__(self, cvalues, preferences, expert_function) -> None:
+        """
+        Initializes the fitted COMET model with its rule base.
+
+        Parameters
+        ----------
+        cvalues : list
+            Characteristic values of each criterion.
+        preferences : ndarray
+            Preferences of characteristic objects.
+        expert_function : str
+            Name of the expert function used to evaluate the characteristic objects.
+        """
+        self.id = uuid.uuid4().hex
+        self.cvalues = [np.asarray(cv, dtype=float) for cv in cvalues]
+        self.preferences = np.asarray(preferences, dtype=float)
+        self.expert_function = expert_function
+
+    def predict(self, alternatives, locale):
+        """
+        Calculates the preferences of the new alternatives, in full precision.
+
+        Parameters
+        ----------
+        alternatives : list or ndarray
+            Evaluated alternatives, each with the values of all criteria of the model.
+        locale : str
+            User application language.
+
+        Raises
+        ------
+        ValueError
+            If the alternatives are not numeric or the number of criteria is different than in the model.
+
+        Returns
+        -------
+        ndarray
+            Preferences of the alternatives.
+        """
+        try:
+            alternatives = np.array(alternatives, dtype=float)
+        except Exception as err:
+            raise ValueError(get_error_message(locale, 'comet-alternatives-error'))
+
+        if alternatives.ndim != 2 or alternatives.shape[1] != len(self.cvalues) or not np.all(np.isfinite(alternatives)):
+            raise ValueError(f'{get_error_message(locale, "comet-alternatives-error")} ({len(self.cvalues)})')
+
+        return comet_inference(alternatives, self.cvalues, self.preferences, COMET_CHUNK_SIZE)
+
+    def predict_lines(self, lines, locale):
+        """
+        Calculates the preferences of the alternatives given as the lines of JSON vectors, in chunks of alternatives.
+
+        Parameters
+        ----------
+        lines : iterable
+            Lines with the values of all criteria of the model for a single alternative, empty lines are skipped.
+        locale : str
+            User application language.
+
+        Raises
+        ------
+        ValueError
+            If any line is not a numeric vector with the number of criteria of the model.
+
+        Yields
+        ------
+        ndarray
+            Preferences of the consecutive chunks of alternatives.
+        """
+        size = max(1, COMET_CHUNK_SIZE // self.preferences.shape[0])
+        chunk = []
+        for line in lines:
+            if len(line.strip()) == 0:
+                continue
+            try:
+                chunk.append(json.loads(line))
+            except Exception as err:
+                raise ValueError(get_error_message(locale, 'comet-alternatives-error'))
+
+            if len(chunk) == size:
+                yield self.predict(chunk, locale)
+                chunk = []
+
+        if len(chunk) > 0:
+            yield self.predict(chunk, locale)
+
+    def get_response(self):
+        return {
+            "model_id": self.id,
+            "expert_function": self.expert_function,
+            "cvalues": [cv.tolist() for cv in self.cvalues],
+            "characteristic_objects": self.preferences.shape[0],
+        }
+
+def fit_model(matrix, criteria_types, weights, kwargs, locale):
+    """
+    Fits the COMET model and stores it for the evaluation of new alternatives.
+
+    Parameters
+    ----------
+    matrix : list
+        Decision matrix used to determine the characteristic values and bounds of the expert function.
+    criteria_types : list
+        Vector of criteria types.
+    weights : list
+        Vector of criteria weights used by the expert function, equal weights are used if not given.
+    kwargs : dict
+        Parameters of the COMET method: 'expert_function', and optionally 'cvalues' and 'esp'.
+    locale : str
+        User application language.
+
+    Raises
+    ------
+    ValueError
+        If the data or parameters are invalid, or the model cannot be fitted.
+
+    Returns
+    -------
+    CometModel
+        The fitted model.
+    """
+    if kwargs.get('expert_function') not in COMET_EXPERTS:
+        raise ValueError(get_error_message(locale, 'comet-expert-error'))
+
+    try:
+        matrix_node = MatrixNode(locale, 0, 'matrix', 'crisp', [], [], 0, 0, matrix, criteria_types, 'input')
+    except Exception as err:
+        raise ValueError(get_error_message(locale, 'crisp-matrix-not-numeric-error'))
+    validate_matrix(locale, matrix_node.matrix, 'crisp')
+    validate_types(locale, matrix_node.criteria_types)
+    validate_dimensions(locale, matrix_node.matrix, matrix_node.criteria_types)
+
+    criteria = matrix_node.matrix.shape[1]
+    if weights is None or len(weights) == 0:
+        weights = np.ones(criteria) / criteria
+    weights = np.array(weights, dtype=float)
+    if weights.shape != (criteria, ):
+        raise ValueError(f'{get_error_message(locale, "criteria-dimension-error")} {criteria}, {weights.shape[0] if weights.ndim == 1 else weights.shape}, {criteria}')
+
+    # the expert function is given first, so the characteristic values given by the user are not replaced
+    item = {"matrix_id": matrix_node.id, "expert_function": kwargs['expert_function']} | {key: kwargs[key] for key in ['cvalues', 'esp'] if key in kwargs}
+    method_obj, _ = create_method_object('COMET', 'crisp', [item], matrix_node, weights, locale)
+
+    model = CometModel(method_obj.cvalues, method_obj.p, kwargs['expert_function'])
+    models.set(model.id, model)
+
+    return model
+
+def get_model(model_id, locale):
+    """
+    Retrieves the fitted COMET model.
+
+    Parameters
+    ----------
+    model_id : str
+        Id of the model.
+    locale : str
+        User application language.
+
+    Raises
+    ------
+    ValueError
+        If the model is not found or expired.
+
+    Returns
+    -------
+    CometModel
+        The fitted model.
+    """
+    model = models.get(model_id)
+    if model is None:
+        raise ValueError(f'{get_error_message(locale, "comet-model-not-found")} {model_id}')
+
+    # the time of model expiration is counted from the last use
+    models.set(model_id, model)
+
+    return model
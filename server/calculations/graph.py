@@ -0,0 +1,175 @@
+# Copyright (C) Jakub Więckowski 2023 - 2024
+
+from collections import deque
+
+# UTILS
+from utils.errors import get_error_message
+
+class CalculationGraph:
+    def __init__(self, structure, plan=None) -> None:
+        """
+        Builds the execution graph of the calculation structure.
+
+        Parameters
+        ----------
+        structure : CalculationStructure
+            The structure with nodes for which the execution graph is built.
+        plan : CalculationPlan, optional
+            The plan compiled for the structure with the same topology, applied to the nodes of the structure instead of building the graph (default is None).
+
+        Raises
+        ------
+        ValueError
+            If the connections between nodes contain a cycle.
+        """
+        self.structure = structure
+        self.locale = structure.locale
+        self.matrix_mode = len(structure._find_node_by_type('matrix')) > 0
+
+        if plan is not None:
+            get_node = lambda position: None if position is None else structure.nodes[position]
+            self.dependencies = {node_id: list(ids) for node_id, ids in plan.dependencies.items()}
+            self.order = [get_node(position) for position in plan.order]
+            self.matrices = {node_id: [get_node(position) for position in positions] for node_id, positions in plan.matrices.items()}
+            self.tasks = [(node, matrix_node) for node in self.order for matrix_node in self.matrices[node.id]]
+            self.levels = [[(get_node(position), get_node(matrix_position)) for position, matrix_position in level] for level in plan.levels]
+            return
+
+        self.dependencies = self._build_dependencies() # node id -> list of ids of nodes required before the node
+        self.order = self._sort() # nodes in the topological order
+        self.matrices = self._resolve_matrices() # node id -> list of matrix nodes for which the node is evaluated
+        self.tasks = [(node, matrix_node) for node in self.order for matrix_node in self.matrices[node.id]]
+        self.levels = self._group_levels() # groups of tasks independent of each other
+
+    def _build_dependencies(self):
+        """
+        Determines the dependencies of each node based on the connections between nodes.
+
+        Matrix, weights, methods and rankings are linked by the outgoing connections,
+        while correlations, visualizations, sensitivity analyses, SMAA and input rankings are linked by the incoming connections.
+
+        Returns
+        -------
+        dict
+            Dictionary with node id as key and list of ids of the nodes it depends on as value.
+        """
+        structure = self.structure
+        dependencies = {node.id: [] for node in structure.nodes}
+
+        def add(node_id, dependency_id):
+            if dependency_id not in dependencies[node_id]:
+                dependencies[node_id].append(dependency_id)
+
+        for node in structure.nodes:
+            if node.node_type == 'matrix':
+                connected_nodes = [n for n in structure._get_connected_nodes(node) if n is not None]
+            elif node.node_type == 'weights':
+                connected_nodes = structure._get_connected_nodes(node, node_type='method')
+            elif node.node_type == 'method':
+                connected_nodes = structure._get_connected_nodes(node, node_type='ranking')
+            else:
+                connected_nodes = []
+
+            for connected_node in connected_nodes:
+                add(connected_node.id, node.id)
+
+            if node.node_type == 'ranking':
+                for input_node in structure._get_connected_nodes(node, node_type='method', output=False):
+                    if input_node.method.lower() == 'input':
+                        add(node.id, input_node.id)
+            elif node.node_type in ['correlation', 'visualization', 'sensitivity', 'smaa']:
+                for input_node in structure._get_connected_nodes(node, output=False):
+                    if input_node is not None:
+                        add(node.id, input_node.id)
+
+        return dependencies
+
+    def _sort(self):
+        """
+        Sorts the nodes topologically, keeping the order of nodes from the structure for independent nodes.
+
+        Returns
+        -------
+        list
+            List of nodes in which each node is placed after the nodes it depends on.
+
+        Raises
+        ------
+        ValueError
+            If the connections between nodes contain a cycle.
+        """
+        structure = self.structure
+        remaining = {node.id: len(self.dependencies[node.id]) for node in structure.nodes}
+        dependents = {node.id: [] for node in structure.nodes}
+        for node_id, dependencies in self.dependencies.items():
+            for dependency_id in dependencies:
+                dependents[dependency_id].append(node_id)
+
+        queue = deque([node for node in structure.nodes if remaining[node.id] == 0])
+        order = []
+        while len(queue) > 0:
+            node = queue.popleft()
+            order.append(node)
+            for dependent_id in dependents[node.id]:
+                remaining[dependent_id] -= 1
+                if remaining[dependent_id] == 0:
+                    queue.append(structure._find_node_by_id(dependent_id))
+
+        if len(order) != len(structure.nodes):
+            cycle = [node.id for node in structure.nodes if remaining[node.id] > 0]
+            raise ValueError(f'{get_error_message(self.locale, "connection-cycle-error")} {cycle}')
+
+        return order
+
+    def _resolve_matrices(self):
+        """
+        Determines for which matrices each node is evaluated.
+
+        In the structure with matrices, node is evaluated once for each matrix it is reachable from.
+        In the structure without matrices, input preferences, rankings, correlations and visualizations are evaluated once.
+
+        Returns
+        -------
+        dict
+            Dictionary with node id as key and list of matrix nodes (or [None]) as value.
+        """
+        matrices = {}
+        if self.matrix_mode:
+            matrix_nodes = self.structure._find_node_by_type('matrix')
+            for node in self.order:
+                if node.node_type == 'matrix':
+                    matrices[node.id] = [node]
+                else:
+                    ids = set()
+                    for dependency_id in self.dependencies[node.id]:
+                        ids.update([matrix_node.id for matrix_node in matrices[dependency_id]])
+                    matrices[node.id] = [matrix_node for matrix_node in matrix_nodes if matrix_node.id in ids]
+        else:
+            for node in self.order:
+                if node.node_type in ['ranking', 'correlation', 'visualization'] or (node.node_type == 'method' and node.method.lower() == 'input'):
+                    matrices[node.id] = [None]
+                else:
+                    matrices[node.id] = []
+
+        return matrices
+
+    def _group_levels(self):
+        """
+        Groups the tasks by the depth of their nodes in the graph.
+
+        Tasks from the same level do not depend on each other and can be evaluated concurrently.
+
+        Returns
+        -------
+        list
+            List of levels, each containing the list of (node, matrix_node) tasks.
+        """
+        depth = {}
+        for node in self.order:
+            depth[node.id] = max([depth[dependency_id] + 1 for dependency_id in self.dependencies[node.id]], default=0)
+
+        levels = {}
+        for node, matrix_node in self.tasks:
+            levels.setdefault(depth[node.id], []).append((node, matrix_node))
+
+        return [levels[level] for level in sorted(levels.keys())]
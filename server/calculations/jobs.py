@@ -0,0 +1,234 @@
+# Copyright (C) Jakub Więckowski 2024
+
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# CONST
+from config import REQUEST_TIMEOUT, JOBS_WORKERS, JOBS_TIMEOUT_LIMIT, JOBS_RETENTION, JOBS_LIMIT, RESULTS_PRECISION
+
+# CALCULATIONS
+from .structure import CalculationStructure
+
+# UTILS
+from utils.errors import get_error_message
+
+_executor = None
+_executor_lock = threading.Lock()
+
+_jobs = {} # job id -> CalculationJob
+_jobs_lock = threading.Lock()
+
+def get_executor():
+    """
+    Retrieves the shared pool of threads evaluating the jobs, creating it on first use.
+
+    Returns
+    -------
+    ThreadPoolExecutor
+        The pool of threads.
+    """
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=JOBS_WORKERS, thread_name_prefix='calculation-job')
+
+    return _executor
+
+class CalculationJob:
+    def __init__(self, data, locale, parallel=False, timeout=REQUEST_TIMEOUT, precision=RESULTS_PRECISION) -> None:
+        """
+        Initializes the calculation job with the structure validated before queueing.
+
+        Parameters
+        ----------
+        data : list
+            List of node data dictionaries to create the structure.
+        locale : str
+            User application language.
+        parallel : bool, optional
+            If True, methods and correlations are evaluated in the pool of worker processes (default is False).
+        timeout : float, optional
+            Time budget of the calculation in seconds, counted from the start of evaluation (default is REQUEST_TIMEOUT).
+        precision : int or None, optional
+            Number of decimal places of the numeric results in the response, None for the results without rounding (default is RESULTS_PRECISION).
+
+        Raises
+        ------
+        ValueError
+            If the structure or its connections are invalid.
+        """
+        self.id = uuid.uuid4().hex
+        self.locale = locale
+        self.timeout = timeout
+        self.structure = CalculationStructure(data, locale, parallel, precision=precision)
+        self.total = len(self.structure.build_graph().order) # number of nodes to evaluate
+        self.done = 0 # number of evaluated nodes
+        self.status = 'queued' # queued, running, finished, failed, cancelled
+        self.response = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self.cancel_event = threading.Event()
+        self.future = None
+
+    def run(self):
+        """
+        Evaluates the structure node by node, checking the time budget and cancellation after each node.
+
+        The time budget is also checked between the chunks of samples of the SMAA and sensitivity analysis
+        and the chunks of characteristic objects of the COMET model, so long nodes are stopped as well.
+        """
+        if self.cancel_event.is_set():
+            self.status = 'cancelled'
+            self.error = get_error_message(self.locale, 'job-cancelled')
+            self.structure = None
+            self.finished_at = time.time()
+            return
+
+        self.status = 'running'
+        deadline = time.monotonic() + self.timeout
+        self.structure.deadline = deadline
+        responses = {}
+        try:
+            for node_response in self.structure.calculate_stream():
+                responses[node_response['id']] = node_response
+                self.done += 1
+                if self.cancel_event.is_set():
+                    raise ValueError(get_error_message(self.locale, 'job-cancelled'))
+                if time.monotonic() > deadline:
+                    raise ValueError(f'{get_error_message(self.locale, "job-timeout")} ({self.timeout})')
+
+            self.response = [responses[node.id] for node in self.structure.nodes if node.id in responses]
+            self.status = 'finished'
+        except TimeoutError:
+            self.error = f'{get_error_message(self.locale, "job-timeout")} ({self.timeout})'
+            self.status = 'cancelled' if self.cancel_event.is_set() else 'failed'
+        except Exception as err:
+            self.error = str(err)
+            self.status = 'cancelled' if self.cancel_event.is_set() else 'failed'
+        finally:
+            # results are kept in the response only
+            self.structure = None
+            self.finished_at = time.time()
+
+    def cancel(self):
+        """
+        Cancels the job. Queued job is not started, running job stops after the currently evaluated node.
+        """
+        self.cancel_event.set()
+        if self.future is not None and self.future.cancel():
+            self.status = 'cancelled'
+            self.error = get_error_message(self.locale, 'job-cancelled')
+            self.finished_at = time.time()
+
+    def get_status(self):
+        """
+        Creates the response with the job status, progress and results.
+
+        Returns
+        -------
+        dict
+            Status of the job, number of evaluated nodes and the calculation results or error message when finished.
+        """
+        response = {
+            "job_id": self.id,
+            "status": self.status,
+            "progress": {
+                "done": self.done,
+                "total": self.total,
+            },
+            "timeout": self.timeout,
+        }
+
+        if self.status == 'finished':
+            response['response'] = self.response
+        elif self.error is not None:
+            response['error'] = self.error
+
+        return response
+
+def _remove_expired_jobs():
+    """
+    Removes the jobs finished more than JOBS_RETENTION seconds ago.
+    """
+    now = time.time()
+    with _jobs_lock:
+        for job_id in [job_id for job_id, job in _jobs.items() if job.finished_at is not None and now - job.finished_at > JOBS_RETENTION]:
+            del _jobs[job_id]
+
+def submit_job(data, locale, parallel=False, timeout=None, precision=RESULTS_PRECISION):
+    """
+    Validates the structure and queues its calculation.
+
+    Parameters
+    ----------
+    data : list
+        List of node data dictionaries to create the structure.
+    locale : str
+        User application language.
+    parallel : bool, optional
+        If True, methods and correlations are evaluated in the pool of worker processes (default is False).
+    timeout : float, optional
+        Time budget of the calculation in seconds (default is None for REQUEST_TIMEOUT).
+    precision : int or None, optional
+        Number of decimal places of the numeric results in the response, None for the results without rounding (default is RESULTS_PRECISION).
+
+    Raises
+    ------
+    ValueError
+        If the time budget is invalid, the limit of jobs is reached, or the structure or its connections are invalid.
+
+    Returns
+    -------
+    CalculationJob
+        The queued job.
+    """
+    if timeout is None:
+        timeout = REQUEST_TIMEOUT
+    if timeout <= 0 or timeout > JOBS_TIMEOUT_LIMIT:
+        raise ValueError(f'{get_error_message(locale, "job-timeout-error")} {JOBS_TIMEOUT_LIMIT}')
+
+    _remove_expired_jobs()
+
+    job = CalculationJob(data, locale, parallel, timeout, precision)
+    with _jobs_lock:
+        if len(_jobs) >= JOBS_LIMIT:
+            raise ValueError(f'{get_error_message(locale, "jobs-limit")} {JOBS_LIMIT}')
+        _jobs[job.id] = job
+    job.future = get_executor().submit(job.run)
+
+    return job
+
+def get_job(job_id, locale):
+    """
+    Retrieves the calculation job.
+
+    Parameters
+    ----------
+    job_id : str
+        Id of the job.
+    locale : str
+        User application language.
+
+    Raises
+    ------
+    ValueError
+        If the job is not found or its results expired.
+
+    Returns
+    -------
+    CalculationJob
+        The calculation job.
+    """
+    _remove_expired_jobs()
+
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+
+    if job is None:
+        raise ValueError(f'{get_error_message(locale, "job-not-found")} {job_id}')
+
+    return job
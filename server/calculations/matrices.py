@@ -0,0 +1,266 @@
+# Copyright (C) Jakub Więckowski 2024
+
+import os
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+import numpy as np
+
+# CONST
+from config import MATRIX_STORE_MEMORY, MATRIX_STORE_FILES, MATRIX_STORE_DIR, MATRIX_STORE_MMAP_SIZE
+
+# UTILS
+from utils.cache import get_cache_key
+from utils.errors import get_error_message
+
+class MatrixStore:
+    def __init__(self, memory=MATRIX_STORE_MEMORY, files=MATRIX_STORE_FILES, directory=MATRIX_STORE_DIR, mmap_size=MATRIX_STORE_MMAP_SIZE) -> None:
+        """
+        Initializes the store of validated decision matrices referenced by the content hash.
+
+        Recently used matrices are kept in memory, and the least recently used ones are spilled to `.npy` files above the memory limit.
+        Matrices larger than the memory map size are kept only in files and opened as read-only memory maps, so they are never loaded at once.
+
+        Parameters
+        ----------
+        memory : int, optional
+            Maximum size in bytes of the matrices kept in memory (default is MATRIX_STORE_MEMORY).
+        files : int, optional
+            Maximum number of matrices kept in files, the least recently used files are removed (default is MATRIX_STORE_FILES).
+        directory : str, optional
+            Directory of the spilled matrices, files left by the previous run are reused (default is MATRIX_STORE_DIR).
+        mmap_size : int, optional
+            Size in bytes of the matrix above which it is opened as the memory map (default is MATRIX_STORE_MMAP_SIZE).
+        """
+        self.memory = memory
+        self.files = files
+        self.directory = directory
+        self.mmap_size = mmap_size
+        self.items = OrderedDict() # handle -> (matrix, criteria_types)
+        self.size = 0 # size in bytes of the matrices in memory
+        self.spilled = OrderedDict() # handle -> None, handles of the matrices in files from the least recently used
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.spills = 0
+        self.mapped = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        paths = [os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith('.matrix.npy')]
+        for path in sorted(paths, key=os.path.getmtime):
+            self.spilled[os.path.basename(path)[:-len('.matrix.npy')]] = None
+
+    def _get_paths(self, handle):
+        return os.path.join(self.directory, f'{handle}.matrix.npy'), os.path.join(self.directory, f'{handle}.types.npy')
+
+    def _save(self, handle, matrix, criteria_types):
+        """
+        Writes the matrix and criteria types to the files, replacing them at once to avoid reading partially written files.
+        """
+        for path, values in zip(self._get_paths(handle), [matrix, criteria_types]):
+            temp_path = f'{path}.{uuid.uuid4().hex}.tmp'
+            with open(temp_path, 'wb') as file:
+                np.save(file, values)
+            os.replace(temp_path, path)
+
+    def _remove_files(self, handle):
+        for path in self._get_paths(handle):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _spill(self):
+        """
+        Moves the least recently used matrices above the memory limit to the files.
+        """
+        while self.size > self.memory and len(self.items) > 0:
+            handle, (matrix, criteria_types) = self.items.popitem(last=False)
+            self.size -= matrix.nbytes + criteria_types.nbytes
+            if handle not in self.spilled:
+                self._save(handle, matrix, criteria_types)
+                self.spills += 1
+            self.spilled[handle] = None
+            self.spilled.move_to_end(handle)
+
+        while len(self.spilled) > self.files:
+            handle, _ = self.spilled.popitem(last=False)
+            self._remove_files(handle)
+
+    def put(self, matrix, criteria_types):
+        """
+        Stores the validated decision matrix and criteria types.
+
+        Parameters
+        ----------
+        matrix : ndarray
+            Decision matrix, 2 dimensional for crisp data and 3 dimensional for fuzzy data.
+        criteria_types : ndarray
+            Criteria types.
+
+        Returns
+        -------
+        str
+            Handle of the matrix, the content hash of the matrix and criteria types.
+        """
+        matrix = np.array(matrix, dtype=np.float64)
+        criteria_types = np.array(criteria_types, dtype=np.float64)
+        handle = get_cache_key('matrix', matrix, criteria_types)
+
+        # stored matrices are shared by the calculations, so they are never changed
+        matrix.flags.writeable = False
+        criteria_types.flags.writeable = False
+
+        with self.lock:
+            if handle in self.items:
+                self.items.move_to_end(handle)
+                return handle
+
+            if matrix.nbytes > self.mmap_size:
+                if handle not in self.spilled:
+                    self._save(handle, matrix, criteria_types)
+                self.spilled[handle] = None
+                self.spilled.move_to_end(handle)
+                self._spill()
+                return handle
+
+            self.items[handle] = (matrix, criteria_types)
+            self.size += matrix.nbytes + criteria_types.nbytes
+            self._spill()
+
+        return handle
+
+    def get(self, handle):
+        """
+        Retrieves the stored matrix, loading it from the files if it was spilled.
+
+        Parameters
+        ----------
+        handle : str
+            Handle of the matrix.
+
+        Returns
+        -------
+        tuple
+            (matrix, criteria_types) read-only arrays, or None if the handle is not found.
+        """
+        with self.lock:
+            item = self.items.get(handle)
+            if item is not None:
+                self.items.move_to_end(handle)
+                self.hits += 1
+                return item
+
+            if handle not in self.spilled:
+                self.misses += 1
+                return None
+
+            matrix_path, types_path = self._get_paths(handle)
+            try:
+                mapped = os.path.getsize(matrix_path) > self.mmap_size
+                matrix = np.load(matrix_path, mmap_mode='r' if mapped else None)
+                criteria_types = np.load(types_path)
+            except Exception as err:
+                del self.spilled[handle]
+                self.misses += 1
+                return None
+
+            criteria_types.flags.writeable = False
+            self.spilled.move_to_end(handle)
+            self.hits += 1
+            if mapped:
+                self.mapped += 1
+                return matrix, criteria_types
+
+            matrix.flags.writeable = False
+            self.items[handle] = (matrix, criteria_types)
+            self.size += matrix.nbytes + criteria_types.nbytes
+            self._spill()
+
+            return matrix, criteria_types
+
+    def get_stats(self):
+        """
+        Retrieves the statistics of the store usage.
+
+        Returns
+        -------
+        dict
+            Number of matrices in memory and in files, size of matrices in memory, hits, misses, spills to files and matrices opened as memory maps.
+        """
+        with self.lock:
+            return {
+                "size": len(self.items),
+                "memory": self.size,
+                "files": len(self.spilled),
+                "hits": self.hits,
+                "misses": self.misses,
+                "spills": self.spills,
+                "mapped": self.mapped,
+            }
+
+# uploaded and generated matrices referenced by the handles in the matrix nodes
+matrices = MatrixStore()
+
+def store_matrix(matrix, criteria_types):
+    """
+    Stores the validated decision matrix to be referenced in the calculations.
+
+    Parameters
+    ----------
+    matrix : ndarray
+        Decision matrix, 2 dimensional for crisp data and 3 dimensional for fuzzy data.
+    criteria_types : ndarray
+        Criteria types.
+
+    Returns
+    -------
+    str
+        Handle of the matrix.
+    """
+    return matrices.put(matrix, criteria_types)
+
+def create_results_array(size):
+    """
+    Creates the output array of the results backed by the temporary file in the store directory.
+
+    The file is removed by the system when the array is released, so the results of the out-of-core evaluation are not kept in memory.
+
+    Parameters
+    ----------
+    size : int
+        Number of results.
+
+    Returns
+    -------
+    memmap
+        Writable memory-mapped array of float64 numbers.
+    """
+    with tempfile.TemporaryFile(dir=matrices.directory) as file:
+        return np.memmap(file, dtype=np.float64, mode='w+', shape=(size, ))
+
+def get_matrix(handle, locale):
+    """
+    Retrieves the stored decision matrix.
+
+    Parameters
+    ----------
+    handle : str
+        Handle of the matrix.
+    locale : str
+        User application language.
+
+    Raises
+    ------
+    ValueError
+        If the matrix is not found.
+
+    Returns
+    -------
+    tuple
+        (matrix, criteria_types) read-only arrays.
+    """
+    item = matrices.get(handle)
+    if item is None:
+        raise ValueError(f'{get_error_message(locale, "matrix-handle-not-found")} {handle}')
+
+    return item
@@ -1,17 +1,601 @@
 # Copyright (C) Jakub Więckowski 2023 - 2024
 
 from abc import ABC
+import copy
+import time
 import numpy as np
-from pymcdm.helpers import correlation_matrix, rrankdata
+from pymcdm.helpers import correlation_matrix, rankdata, rrankdata
+from pyfdm.helpers import rank as fuzzy_rank
 
 # CONST
-from methods import weights_methods, mcda_methods, correlation_methods
+from config import RESULTS_PRECISION, OUT_OF_CORE_CHUNK_SIZE, CORRELATION_CHUNK_SIZE, SENSITIVITY_SAMPLES, SENSITIVITY_SAMPLES_LIMIT, SENSITIVITY_CHUNK_SIZE, SMAA_SAMPLES, SMAA_SAMPLES_LIMIT, SMAA_CHUNK_SAMPLES, SMAA_CHUNK_SIZE
+from methods import weights_methods, mcda_methods, mcda_batch_methods, mcda_kernels, mcda_chunked_methods, correlation_methods, correlation_kernels, perturbation_methods, weights_distributions
+from methods.sensitivity import weights_sensitivity
+from methods.smaa import triangular_matrices, acceptability_chunk, confidence_chunk
 from graphs import graphs_methods, generate_graph
 
 # HELPERS
-from .parameters import get_parameters, get_call_kwargs
+from .parameters import get_parameters, get_call_kwargs, get_comet_key
+from .matrices import get_matrix, create_results_array
 
 from utils.errors import get_error_message
+from utils.fuzzy import parse_fuzzy_cells, fuzzy_to_strings
+from utils.encoding import encode_array, encode_fields, round_values, round_fields
+from utils.validator import validate_fuzzy_numbers
+from utils.cache import get_cache_key, preferences_cache, weights_cache, comet_cache
+
+def _get_matrix_key(matrix_node):
+    """
+    Retrieves the item identifying the decision matrix in the cache keys.
+
+    Parameters
+    ----------
+    matrix_node : MatrixNode
+        The matrix node with the decision matrix.
+
+    Returns
+    -------
+    ndarray or str
+        The decision matrix, or the handle of the stored matrix, which is its content hash, so the memory-mapped matrix is not read to be hashed again.
+    """
+    return matrix_node.matrix if matrix_node.handle is None else matrix_node.handle
+
+def get_preferences_key(method, extension, kwargs, matrix_node, criteria_weights):
+    """
+    Creates the key of the preferences in the results cache.
+
+    Parameters
+    ----------
+    method : str
+        Name of the MCDA method.
+    extension : str
+        Data extension of the method node.
+    kwargs : list
+        Additional parameters of the method given for each matrix.
+    matrix_node : MatrixNode
+        The matrix node with the decision matrix and criteria types.
+    criteria_weights : ndarray
+        Vector of criteria weights.
+
+    Returns
+    -------
+    str
+        Content hash of the calculation data.
+    """
+    items = [{k: v for k, v in item.items() if k != 'matrix_id'} for item in kwargs if item['matrix_id'] == matrix_node.id]
+    return get_cache_key(method, extension, matrix_node.extension, _get_matrix_key(matrix_node), matrix_node.criteria_types, np.asarray(criteria_weights, dtype=float), items[:1])
+
+def create_method_object(method, extension, kwargs, matrix_node, criteria_weights, locale, deadline=None):
+    """
+    Creates the MCDA method object with the additional parameters given for the matrix.
+
+    Parameters
+    ----------
+    method : str
+        Name of the MCDA method.
+    extension : str
+        Data extension of the method node.
+    kwargs : list
+        Additional parameters of the method given for each matrix.
+    matrix_node : MatrixNode
+        The matrix node with the decision matrix and criteria types.
+    criteria_weights : ndarray
+        Vector of criteria weights.
+    locale : str
+        User application language.
+    deadline : float, optional
+        Value of `time.monotonic()` after which the calculation is stopped with TimeoutError (default is None for no time limit).
+
+    Raises
+    ------
+    ValueError
+        If the parameters are invalid or the method object cannot be created.
+    TimeoutError
+        If the deadline passes while the COMET model is fitted.
+
+    Returns
+    -------
+    tuple
+        (method_obj, call_kwargs) with the MCDA method object and the parameters of its call.
+    """
+    init_kwargs = get_parameters(kwargs, matrix_node.extension, matrix_node, criteria_weights, locale, deadline)
+    
+    call_kwargs = get_call_kwargs(method, init_kwargs, extension, locale)
+
+    # fitted COMET model only evaluates the alternatives, so it is shared by the matrices with the same model data
+    key = get_comet_key(kwargs, init_kwargs, matrix_node, criteria_weights) if method == 'COMET' and matrix_node.extension == 'crisp' else None
+    method_obj = comet_cache.get(key) if key is not None else None
+    if method_obj is not None:
+        return method_obj, call_kwargs
+
+    try: 
+        method_obj = mcda_methods[method][matrix_node.extension](**init_kwargs)
+    except TimeoutError:
+        raise
+    except Exception as err:
+        raise ValueError(get_error_message(locale, "mcda-method-object-error"))
+
+    if key is not None:
+        comet_cache.set(key, method_obj)
+
+    return method_obj, call_kwargs
+
+def is_kernel_evaluation(method, method_obj, matrix_node, criteria_weights):
+    """
+    Checks if the preferences of the method can be calculated with the kernel instead of the method object.
+
+    Parameters
+    ----------
+    method : str
+        Name of the MCDA method.
+    method_obj : object
+        The MCDA method object created with the additional parameters.
+    matrix_node : MatrixNode
+        The matrix node with the decision matrix.
+    criteria_weights : ndarray
+        Vector of criteria weights.
+
+    Returns
+    -------
+    bool
+        True if the crisp method has the kernel and the method object uses the default normalization function.
+    """
+    return method in mcda_kernels \
+        and matrix_node.extension == 'crisp' \
+        and getattr(method_obj, 'normalization', None) is mcda_kernels[method][1] \
+        and np.shape(criteria_weights) == (matrix_node.matrix.shape[1], )
+
+def is_chunked_evaluation(method, method_obj, matrix_node, criteria_weights):
+    """
+    Checks if the preferences of the method are calculated for the chunks of rows of the memory-mapped decision matrix.
+
+    Parameters
+    ----------
+    method : str
+        Name of the MCDA method.
+    method_obj : object
+        The MCDA method object created with the additional parameters.
+    matrix_node : MatrixNode
+        The matrix node with the decision matrix.
+    criteria_weights : ndarray
+        Vector of criteria weights.
+
+    Returns
+    -------
+    bool
+        True if the crisp matrix is memory-mapped and the method has the chunked implementation and uses the default normalization function.
+    """
+    return method in mcda_chunked_methods \
+        and isinstance(matrix_node.matrix, np.memmap) \
+        and matrix_node.extension == 'crisp' \
+        and matrix_node.matrix.ndim == 2 \
+        and getattr(method_obj, 'normalization', None) is mcda_chunked_methods[method][1] \
+        and np.shape(criteria_weights) == (matrix_node.matrix.shape[1], )
+
+def calculate_preferences(method, extension, kwargs, matrix_node, criteria_weights, locale, resolved=None, deadline=None):
+    """
+    Calculates the preferences of alternatives with the given MCDA method.
+
+    Preferences are kept in full precision and stored in the cache shared between requests, keyed by the content of the calculation data.
+    The cache is checked before the method object is created, so the cached preferences do not require parsing of the parameters.
+    Preferences for the memory-mapped matrices are evaluated in chunks of rows and written to the memory-mapped output, without the cache.
+
+    Parameters
+    ----------
+    method : str
+        Name of the MCDA method.
+    extension : str
+        Data extension of the method node.
+    kwargs : list
+        Additional parameters of the method given for each matrix.
+    matrix_node : MatrixNode
+        The matrix node with the decision matrix and criteria types.
+    criteria_weights : ndarray
+        Vector of criteria weights.
+    locale : str
+        User application language.
+    resolved : tuple, optional
+        (method_obj, call_kwargs) resolved in the calculation plan, created with `create_method_object` if not given (default is None).
+    deadline : float, optional
+        Value of `time.monotonic()` after which the calculation is stopped with TimeoutError (default is None for no time limit).
+
+    Raises
+    ------
+    ValueError
+        If the method object cannot be created or the calculation fails.
+
+    Returns
+    -------
+    ndarray
+        Preferences of alternatives.
+    """
+    key = get_preferences_key(method, extension, kwargs, matrix_node, criteria_weights)
+    cached = preferences_cache.get(key)
+    if cached is not None:
+        return cached.copy()
+
+    method_obj, call_kwargs = resolved if resolved is not None else create_method_object(method, extension, kwargs, matrix_node, criteria_weights, locale, deadline)
+
+    chunked = is_chunked_evaluation(method, method_obj, matrix_node, criteria_weights)
+
+    try: 
+        if chunked:
+            out = create_results_array(matrix_node.matrix.shape[0])
+            pref = mcda_chunked_methods[method][0](method_obj, matrix_node.matrix, np.asarray(criteria_weights, dtype=float), matrix_node.criteria_types, out, OUT_OF_CORE_CHUNK_SIZE)
+        elif is_kernel_evaluation(method, method_obj, matrix_node, criteria_weights):
+            pref = mcda_kernels[method][0](matrix_node.matrix[np.newaxis], np.asarray(criteria_weights, dtype=float)[np.newaxis], matrix_node.criteria_types, **call_kwargs)[0]
+        else:
+            pref = np.asarray(method_obj(matrix_node.matrix, criteria_weights, matrix_node.criteria_types, **call_kwargs), dtype=float)
+        if np.isnan(pref).any() or np.isinf(pref).any():
+            raise ValueError(get_error_message(locale, 'not-numeric-results'))
+    except ValueError as err:
+        raise ValueError(err)
+    except Exception as err:
+        raise ValueError(get_error_message(locale, 'method-calculation-error'))
+    
+    if method == 'VIKOR' and np.array(pref).ndim == 2:
+        pref = pref[2]
+
+    if chunked:
+        return pref
+
+    preferences_cache.set(key, pref.copy())
+
+    return pref
+
+def is_batch_evaluation(method, matrix_node, criteria_weights):
+    """
+    Checks if the preferences of the method can be calculated for all vectors of weights at once.
+
+    Parameters
+    ----------
+    method : str
+        Name of the MCDA method.
+    matrix_node : MatrixNode
+        The matrix node with the decision matrix.
+    criteria_weights : list
+        Vectors of criteria weights.
+
+    Returns
+    -------
+    bool
+        True if the crisp method has the batch implementation and more than one vector of weights is given.
+    """
+    return method in mcda_batch_methods \
+        and matrix_node.extension == 'crisp' \
+        and len(criteria_weights) > 1 \
+        and all([np.shape(weights) == (matrix_node.matrix.shape[1], ) for weights in criteria_weights])
+
+def calculate_preferences_batch(method, extension, kwargs, matrix_node, criteria_weights, locale, resolved=None, deadline=None):
+    """
+    Calculates the preferences of alternatives with the given MCDA method for many vectors of criteria weights at once.
+
+    Results are identical to the results of `calculate_preferences` for each vector of weights, and share the same cache.
+
+    Parameters
+    ----------
+    method : str
+        Name of the MCDA method with the batch implementation.
+    extension : str
+        Data extension of the method node.
+    kwargs : list
+        Additional parameters of the method given for each matrix.
+    matrix_node : MatrixNode
+        The matrix node with the decision matrix and criteria types.
+    criteria_weights : list
+        Vectors of criteria weights.
+    locale : str
+        User application language.
+    resolved : tuple, optional
+        (method_obj, call_kwargs) resolved in the calculation plan, created with `create_method_object` if not given (default is None).
+    deadline : float, optional
+        Value of `time.monotonic()` after which the calculation is stopped with TimeoutError (default is None for no time limit).
+
+    Raises
+    ------
+    ValueError
+        If the method object cannot be created or the calculation fails.
+
+    Returns
+    -------
+    list
+        Preferences of alternatives for each vector of weights.
+    """
+    keys = [get_preferences_key(method, extension, kwargs, matrix_node, weights) for weights in criteria_weights]
+    results = [preferences_cache.get(key) for key in keys]
+    missing = [idx for idx, result in enumerate(results) if result is None]
+
+    if len(missing) > 0:
+        method_obj, call_kwargs = resolved if resolved is not None else create_method_object(method, extension, kwargs, matrix_node, criteria_weights[0], locale, deadline)
+        try:
+            weights = np.array([criteria_weights[idx] for idx in missing], dtype=float)
+            prefs = mcda_batch_methods[method](method_obj, matrix_node.matrix, weights, matrix_node.criteria_types, **call_kwargs)
+            if np.isnan(prefs).any() or np.isinf(prefs).any():
+                raise ValueError(get_error_message(locale, 'not-numeric-results'))
+        except ValueError as err:
+            raise ValueError(err)
+        except Exception as err:
+            raise ValueError(get_error_message(locale, 'method-calculation-error'))
+
+        for idx, pref in zip(missing, prefs):
+            results[idx] = pref.copy()
+            preferences_cache.set(keys[idx], pref.copy())
+
+    return [pref.copy() for pref in results]
+
+def get_crisp_matrix_node(matrix_node):
+    """
+    Creates the crisp view of the matrix node used to create the crisp MCDA method object.
+
+    For the fuzzy matrix, the lower and upper bounds of the Triangular Fuzzy Numbers are stacked as the decision matrix,
+    so the parameters derived from the matrix (e.g. bounds or characteristic values) cover all sampled matrices.
+
+    Parameters
+    ----------
+    matrix_node : MatrixNode
+        The crisp or fuzzy matrix node.
+
+    Returns
+    -------
+    MatrixNode
+        The crisp matrix node.
+    """
+    if matrix_node.extension == 'crisp':
+        return matrix_node
+
+    crisp_node = copy.copy(matrix_node)
+    crisp_node.extension = 'crisp'
+    crisp_node.matrix = np.concatenate([matrix_node.matrix[..., 0], matrix_node.matrix[..., 2]])
+
+    return crisp_node
+
+def create_evaluators(method, method_obj, call_kwargs, matrix_node, criteria_weights, locale):
+    """
+    Creates the functions calculating the preferences of the crisp MCDA method for many vectors of criteria weights.
+
+    Methods with the batch implementation or the kernel evaluate all vectors of weights at once,
+    other methods are called for each vector of weights.
+
+    Parameters
+    ----------
+    method : str
+        Name of the MCDA method.
+    method_obj : object
+        The crisp MCDA method object.
+    call_kwargs : dict
+        Parameters of the method call.
+    matrix_node : MatrixNode
+        The crisp matrix node with the criteria types.
+    criteria_weights : ndarray
+        Vector of criteria weights.
+    locale : str
+        User application language.
+
+    Returns
+    -------
+    tuple
+        (evaluate, evaluate_stack) with the function calculating the preferences (k x m) for the decision matrix (m x n)
+        and the vectors of weights (k x n), and the function calculating the preferences (k x m) for the stack of decision matrices
+        (k x m x n) and the vectors of weights (k x n), or None if the method has no kernel.
+    """
+    def check(prefs):
+        if np.isnan(prefs).any() or np.isinf(prefs).any():
+            raise ValueError(get_error_message(locale, 'not-numeric-results'))
+        return prefs
+
+    evaluate_stack = None
+    if is_kernel_evaluation(method, method_obj, matrix_node, criteria_weights):
+        def evaluate_stack(matrices, weights):
+            return check(mcda_kernels[method][0](matrices, weights, matrix_node.criteria_types, **call_kwargs))
+
+    def evaluate(matrix, weights):
+        if method in mcda_batch_methods:
+            return check(mcda_batch_methods[method](method_obj, matrix, weights, matrix_node.criteria_types, **call_kwargs))
+        if evaluate_stack is not None:
+            return evaluate_stack(matrix[np.newaxis], weights)
+        return check(np.array([method_obj(matrix, w, matrix_node.criteria_types, **call_kwargs) for w in weights]))
+
+    return evaluate, evaluate_stack
+
+def calculate_smaa_chunk(method, kwargs, matrix_node, criteria_weights, distribution, params, seed, size, locale, central_weights=None, deadline=None):
+    """
+    Evaluates the chunk of samples of the SMAA with the crisp MCDA method.
+
+    Vectors of weights are sampled from the given distribution, and for the fuzzy matrix
+    the crisp decision matrices are sampled from its Triangular Fuzzy Numbers.
+    With the central vectors of weights given, only the decision matrices are sampled to count the confidence factors.
+
+    Parameters
+    ----------
+    method : str
+        Name of the MCDA method.
+    kwargs : list
+        Additional parameters of the method given for each matrix.
+    matrix_node : MatrixNode
+        The matrix node with the crisp or fuzzy decision matrix and criteria types.
+    criteria_weights : ndarray
+        Vector of crisp criteria weights.
+    distribution : str
+        Name of the distribution of the sampled weights, from the `weights_distributions`.
+    params : dict
+        Parameters of the distribution.
+    seed : SeedSequence
+        Seed of the random numbers generator of the chunk.
+    size : int
+        Number of samples in the chunk.
+    locale : str
+        User application language.
+    central_weights : ndarray, optional
+        Central vectors of weights of the alternatives (default is None).
+    deadline : float, optional
+        Value of `time.monotonic()` after which the calculation is stopped with TimeoutError (default is None for no time limit).
+
+    Raises
+    ------
+    ValueError
+        If the method object cannot be created or the calculation fails.
+    TimeoutError
+        If the deadline passed before the chunk is evaluated.
+
+    Returns
+    -------
+    tuple or ndarray
+        (counts, central) with the number of samples with each position of each alternative and the sum of the vectors of weights
+        for which each alternative is the best, or the number of samples for which each alternative is the best with its central weights.
+    """
+    # chunks queued after the deadline are not evaluated
+    if deadline is not None and time.monotonic() > deadline:
+        raise TimeoutError()
+
+    rng = np.random.default_rng(seed)
+    crisp_node = get_crisp_matrix_node(matrix_node)
+    method_obj, call_kwargs = create_method_object(method, 'crisp', kwargs, crisp_node, criteria_weights, locale, deadline)
+
+    evaluate, evaluate_stack = create_evaluators(method, method_obj, call_kwargs, crisp_node, criteria_weights, locale)
+
+    try:
+        if matrix_node.extension == 'fuzzy':
+            matrices = triangular_matrices(rng, matrix_node.matrix, size)
+        elif central_weights is not None:
+            matrices = matrix_node.matrix[np.newaxis]
+        else:
+            matrices = matrix_node.matrix
+
+        if central_weights is not None:
+            return confidence_chunk(evaluate, central_weights, matrices, method_obj.reverse_ranking, evaluate_stack)
+
+        weights = weights_distributions[distribution](rng, criteria_weights, size, **params)
+        return acceptability_chunk(evaluate, weights, matrices, method_obj.reverse_ranking, evaluate_stack)
+    except ValueError as err:
+        raise ValueError(err)
+    except Exception as err:
+        raise ValueError(f'{get_error_message(locale, "smaa-calculation-error")} ({method})')
+
+# fuzzy methods ranking the alternatives in ascending order of preferences, as in the pyfdm method objects
+FUZZY_ASCENDING_METHODS = ['VIKOR']
+
+def rank_preferences(method, preference, extension, locale):
+    """
+    Calculates the ranking of alternatives from the preferences obtained with the MCDA method.
+
+    Alternatives are ranked in the order of preferences of the method class, so the method object is not needed.
+
+    Parameters
+    ----------
+    method : str
+        Name of the MCDA method, 'INPUT' for the preferences given by the user.
+    preference : array_like
+        Preferences of alternatives.
+    extension : str
+        Data extension of the matrix.
+    locale : str
+        User application language.
+
+    Raises
+    ------
+    ValueError
+        If the ranking cannot be calculated.
+
+    Returns
+    -------
+    list
+        Ranking of alternatives.
+    """
+    try:
+        if method == 'INPUT':
+            ranking = rrankdata(preference)
+        else:
+            if extension == 'crisp':
+                ranking = rankdata(preference, reverse=mcda_methods[method]['crisp'].reverse_ranking).tolist()
+            elif extension == 'fuzzy':
+                # ranked from the given preferences, as the fuzzy method object ranks the preferences of its last call
+                ranking = fuzzy_rank(np.asarray(preference, dtype=float), method not in FUZZY_ASCENDING_METHODS).tolist()
+    except Exception as err:
+        raise ValueError(get_error_message(locale, 'ranking-calculation-error'))
+
+    return ranking
+
+def calculate_correlation_matrix(corr_data, method, locale):
+    """
+    Calculates the correlation matrix between the given rows of data.
+
+    Coefficients with the kernel are calculated for all pairs of rows at once, with the same results as the correlation method.
+
+    Parameters
+    ----------
+    corr_data : list
+        Rows of data (weights, preferences or rankings) to correlate.
+    method : str
+        Name of the correlation method.
+    locale : str
+        User application language.
+
+    Raises
+    ------
+    ValueError
+        If the correlation cannot be calculated.
+
+    Returns
+    -------
+    ndarray
+        Correlation matrix.
+    """
+    correlation_obj = correlation_methods[method]
+
+    try:
+        data = np.array(corr_data, dtype=float)
+        if method in correlation_kernels and data.ndim == 2 and data.shape[1] > 1:
+            return correlation_kernels[method](data, CORRELATION_CHUNK_SIZE)
+        return correlation_matrix(data, correlation_obj)
+    except Exception as err:
+        raise ValueError(f"{get_error_message(locale, 'correlation-calculation-error')} ({method})")
+
+def get_sampling_parameters(kwargs, sampler, samples, samples_limit, locale):
+    """
+    Retrieves the number of samples, seed and the parameters of the distribution of sampled weights.
+
+    Parameters
+    ----------
+    kwargs : list
+        Additional parameters of the node, the first item is used.
+    sampler : callable
+        Function sampling the vectors of weights.
+    samples : int
+        Default number of samples.
+    samples_limit : int
+        Maximum number of samples.
+    locale : str
+        User application language.
+
+    Raises
+    ------
+    ValueError
+        If the number of samples exceeds the limit or the parameters are invalid.
+
+    Returns
+    -------
+    tuple
+        (samples, seed, params) with the number of samples, the seed of the random numbers generator
+        (None for random) and the dictionary with parameters of the distribution.
+    """
+    params = {k: v for k, v in (kwargs[0] if len(kwargs) > 0 else {}).items() if k != 'matrix_id' and v != ''}
+
+    try:
+        samples = int(params.pop('samples', samples))
+        seed = params.pop('seed', None)
+        seed = int(seed) if seed is not None else None
+    except Exception as err:
+        raise ValueError(get_error_message(locale, "sampling-params-error"))
+
+    if samples <= 0 or samples > samples_limit:
+        raise ValueError(f'{get_error_message(locale, "sampling-samples-limit")} {samples_limit}')
+
+    try:
+        sampler(np.random.default_rng(), np.full(2, 0.5), 1, **params)
+    except Exception as err:
+        raise ValueError(get_error_message(locale, "sampling-params-error"))
+
+    return samples, seed, params
 
 class Node(ABC):
     def __init__(self, locale, id, node_type, extension, connections_from, connections_to, position_x, position_y) -> None:
@@ -25,8 +609,76 @@ class Node(ABC):
         self.connections_to = connections_to
         self.position_x = position_x
         self.position_y = position_y
-
-    def get_response(self):
+        self.results_index = {} # (matrix_id, weights_id) -> result data
+        self.matrix_results_index = {} # matrix_id -> list of results data in the order of calculation
+
+    def _add_calculation_data(self, data, weights_id=None):
+        """
+        Stores the calculated result of the node and indexes it by the matrix and weights identifiers.
+
+        Parameters
+        ----------
+        data : dict
+            Result data with the 'matrix_id' key.
+        weights_id : int, optional
+            Identifier of the weights node used in calculation (default is None).
+        """
+        self.calculation_data.append(data)
+        self.results_index[(data['matrix_id'], weights_id)] = data
+        self.matrix_results_index.setdefault(data['matrix_id'], []).append(data)
+
+    def get_result(self, matrix_id, weights_id=None):
+        """
+        Retrieves the result calculated for the given matrix and weights.
+
+        Parameters
+        ----------
+        matrix_id : int
+            Identifier of the matrix node.
+        weights_id : int, optional
+            Identifier of the weights node (default is None).
+
+        Returns
+        -------
+        dict
+            Result data, or None if not calculated.
+        """
+        return self.results_index.get((matrix_id, weights_id))
+
+    def get_results(self, matrix_id):
+        """
+        Retrieves all results calculated for the given matrix.
+
+        Parameters
+        ----------
+        matrix_id : int
+            Identifier of the matrix node.
+
+        Returns
+        -------
+        list
+            Results data in the order of calculation.
+        """
+        return self.matrix_results_index.get(matrix_id, [])
+
+    def get_response(self, binary=False, precision=RESULTS_PRECISION):
+        """
+        Creates the response with the calculation results of the node.
+
+        Calculated numeric results are kept in full precision and rounded only here.
+
+        Parameters
+        ----------
+        binary : bool, optional
+            If True, numeric results are encoded as base64 buffers of little-endian float64 numbers (default is False).
+        precision : int or None, optional
+            Number of decimal places of the calculated results, None for the results without rounding (default is RESULTS_PRECISION).
+
+        Returns
+        -------
+        dict
+            The response of the node.
+        """
         return {
             "id": self.id,
             "node_type": self.node_type,
@@ -34,37 +686,74 @@ class Node(ABC):
         }
 
 class MatrixNode(Node):
-    def __init__(self, locale, id, node_type, extension, connections_from, connections_to, position_x, position_y, matrix, criteria_types, method) -> None:
+    def __init__(self, locale, id, node_type, extension, connections_from, connections_to, position_x, position_y, matrix=None, criteria_types=None, method='input', handle=None) -> None:
         
         super().__init__(locale, id, node_type, extension, connections_from, connections_to, position_x, position_y)
 
-        if isinstance(matrix[0][0], str):
+        self.method = method.upper()
+        self.handle = handle
+        if self.handle is not None:
+            # stored matrices are validated on upload and shared read-only between calculations
+            self.matrix, stored_types = get_matrix(self.handle, self.locale)
+            self.criteria_types = stored_types if criteria_types is None else np.array(criteria_types, dtype=float)
+            return
+
+        if matrix is None or len(matrix) == 0 or criteria_types is None:
+            raise ValueError(f'{get_error_message(self.locale, "matrix-data-error")} ({self.id})')
+
+        if isinstance(matrix[0][0], str) and ',' in matrix[0][0]:
             try:
-                if ',' in matrix[0][0]:
-                    matrix = [[col.split(',') for col in row] for row in matrix]
+                matrix = parse_fuzzy_cells(matrix)
             except:
-                raise ValueError(f'{get_error_message(self.locale, "matrix-data-error")} ({self.id})')
-        self.matrix = np.array(matrix, dtype=float)
-        self.method = method.upper()
+                raise ValueError(f'{get_error_message(self.locale, "fuzzy-matrix-format-error")} ({self.id})')
+        self.matrix = np.array(matrix, dtype=np.float64)
         self.criteria_types = np.array(criteria_types, dtype=float)
 
+        if self.extension == 'fuzzy' and self.matrix.ndim == 3:
+            validate_fuzzy_numbers(self.locale, self.matrix)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # memory-mapped matrices are sent to the worker processes as the file paths and mapped again
+        if isinstance(self.matrix, np.memmap) and self.matrix.filename is not None:
+            state['matrix'] = self.matrix.filename
+        return state
+
+    def __setstate__(self, state):
+        if isinstance(state['matrix'], str):
+            state['matrix'] = np.load(state['matrix'], mmap_mode='r')
+        self.__dict__.update(state)
+
     def _convert_matrix_to_string(self):
-        str_matrix = []
-        if np.array(self.matrix).ndim == 3:
-            str_matrix = [[', '.join([str(c) for c in col]) for col in row] for row in self.matrix]
-        else:
-            str_matrix = np.array(self.matrix, dtype=str).tolist()
+        if self.matrix.ndim == 3:
+            return fuzzy_to_strings(self.matrix)
+
+        return self.matrix.astype(str).tolist()
+
+    def _get_matrix_data(self, binary=False):
+        # matrices referenced by the handle are not sent back, the client already has them
+        if self.handle is not None:
+            return {"handle": self.handle}
 
-        return str_matrix
+        return {"matrix": encode_array(self.matrix) if binary else self._convert_matrix_to_string()}
 
-    def get_response(self):
+    def get_response(self, binary=False, precision=RESULTS_PRECISION):
         response = super().get_response()
         
+        if binary:
+            return response | {
+                "method": self.method,
+                "data": [
+                    self._get_matrix_data(binary) | {
+                        "criteria_types": encode_array(self.criteria_types),
+                    }
+                ]
+            }
+
         return response | {
             "method": self.method,
             "data": [
-                {
-                    "matrix": self._convert_matrix_to_string(),
+                self._get_matrix_data(binary) | {
                     "criteria_types": self.criteria_types.tolist(),
                 }
             ]
@@ -81,8 +770,16 @@ class WeightsNode(Node):
             raise ValueError(f"'{self.method}': {get_error_message(self.locale, 'method-name-not-found')}")
             
         self.calculation_data = []
+        self.results = {} # weights calculated for each matrix, reused by all connected methods
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def calculate(self, matrix_node):
+        if matrix_node.id in self.results:
+            self.cache_hits += 1
+            return self.results[matrix_node.id]
 
-    def calculate(self, matrix_node, precision=3):
+        self.cache_misses += 1
         if self.method != 'INPUT':
             try: 
                 self.method_obj = weights_methods[self.method][matrix_node.extension]
@@ -93,7 +790,13 @@ class WeightsNode(Node):
                 if self.method in ['MEREC', 'CILOS', 'IDOCRIW']:
                     kwargs = kwargs | {"types": matrix_node.criteria_types}
                 
-                weights = np.round(self.method_obj(**kwargs), precision)
+                key = get_cache_key(self.method, matrix_node.extension, _get_matrix_key(matrix_node), matrix_node.criteria_types)
+                weights = weights_cache.get(key)
+                if weights is None:
+                    weights = np.asarray(self.method_obj(**kwargs), dtype=float)
+                    weights_cache.set(key, weights.copy())
+                else:
+                    weights = weights.copy()
                 if len(weights) != len(matrix_node.matrix[0]):
                     raise ValueError(f'{self.method} {get_error_message(self.locale, "matrix-weights-size-error")}') 
             except Exception as err:
@@ -101,20 +804,22 @@ class WeightsNode(Node):
         else:
             weights = self.weights
 
-        if len([data for data in self.calculation_data if data['matrix_id'] == matrix_node.id]) == 0:
-            self.calculation_data.append({
-                "matrix_id": matrix_node.id,
-                "weights": weights.tolist(),
-            })
+        self.results[matrix_node.id] = weights
+        self._add_calculation_data({
+            "matrix_id": matrix_node.id,
+            "weights": weights.tolist(),
+        })
         
         return weights
     
-    def get_response(self):
+    def get_response(self, binary=False, precision=RESULTS_PRECISION):
         response = super().get_response()
+        # weights given by the user are returned as they are
+        data = round_fields(self.calculation_data, ('weights',) if self.method != 'INPUT' else (), precision)
 
         return response | {
             "method": self.method,
-            "data": self.calculation_data
+            "data": encode_fields(data, ('weights',)) if binary else data
         }
 
 class MethodNode(Node):
@@ -128,78 +833,91 @@ class MethodNode(Node):
             
         self.kwargs = kwargs
         self.calculation_data = []
+        self.resolved = {} # method objects and call parameters resolved in the calculation plan for the matrix id
 
-    def calculate(self, matrix_node, weights_node, precision=3):
+    def calculate(self, matrix_node, weights_node, deadline=None):
 
         if self.method == 'INPUT':
-            method_obj = None
             weights_node = None
             pref = list(self.kwargs[0]['preference'])
         else:
             criteria_weights = weights_node.calculate(matrix_node)
-            init_kwargs = get_parameters(self.kwargs, matrix_node.extension, matrix_node, criteria_weights, self.locale)
-            
-            call_kwargs = get_call_kwargs(self.method, init_kwargs, self.extension, self.locale)
+            pref = calculate_preferences(self.method, self.extension, self.kwargs, matrix_node, criteria_weights, self.locale, self.resolved.get(matrix_node.id), deadline)
 
-            try: 
-                method_obj = mcda_methods[self.method][matrix_node.extension](**init_kwargs)
-            except Exception as err:
-                raise ValueError(get_error_message(self.locale, "mcda-method-object-error"))
+        self.add_result(matrix_node, weights_node, pref)
 
-            try: 
-                pref = np.round(method_obj(matrix_node.matrix, criteria_weights, matrix_node.criteria_types, **call_kwargs), precision)
-                if np.isnan(pref).any() or np.isinf(pref).any():
-                    raise ValueError(get_error_message(self.locale, 'not-numeric-results'))
-            except ValueError as err:
-                raise ValueError(err)
-            except Exception as err:
-                raise ValueError(get_error_message(self.locale, 'method-calculation-error'))
-            
-            if self.method == 'VIKOR' and np.array(pref).ndim == 2:
-                pref = pref[2]
+        return pref
+
+    def calculate_many(self, matrix_node, weights_nodes, deadline=None):
+        """
+        Calculates the preferences for the given matrix with each of the weights nodes.
+
+        Methods with the batch implementation are evaluated for all vectors of weights at once.
+
+        Parameters
+        ----------
+        matrix_node : MatrixNode
+            The matrix node for which the preferences are calculated.
+        weights_nodes : list
+            Weights nodes connected to the method.
+        deadline : float, optional
+            Value of `time.monotonic()` after which the calculation is stopped with TimeoutError (default is None for no time limit).
+        """
+        if self.method == 'INPUT':
+            for weights_node in weights_nodes:
+                self.calculate(matrix_node, weights_node)
+            return
+
+        criteria_weights = [weights_node.calculate(matrix_node) for weights_node in weights_nodes]
+        if is_batch_evaluation(self.method, matrix_node, criteria_weights):
+            results = calculate_preferences_batch(self.method, self.extension, self.kwargs, matrix_node, criteria_weights, self.locale, self.resolved.get(matrix_node.id), deadline)
+        else:
+            results = [calculate_preferences(self.method, self.extension, self.kwargs, matrix_node, weights, self.locale, self.resolved.get(matrix_node.id), deadline) for weights in criteria_weights]
 
+        for weights_node, pref in zip(weights_nodes, results):
+            self.add_result(matrix_node, weights_node, pref)
+
+    def add_result(self, matrix_node, weights_node, pref, ranking=None):
+        # preferences are kept as the array (memory-mapped for the out-of-core evaluation) and converted in the response
         if matrix_node:
-            self.calculation_data.append({
+            data = {
                 "matrix_id": matrix_node.id,
-                "method_obj": method_obj,
                 "weights_node": weights_node,
-                "preference": pref.tolist(),
+                "preference": pref,
                 "kwargs": self.kwargs
-            })
+            }
         else:
-            self.calculation_data.append({
+            data = {
                 "matrix_id": 0,
-                "method_obj": method_obj,
                 "weights_node": weights_node,
                 "preference": pref,
                 "kwargs": self.kwargs
-            })
+            }
 
-        return pref
+        # ranking calculated together with preferences in the worker process
+        if ranking is not None:
+            data['ranking'] = ranking
+
+        self._add_calculation_data(data, weights_node.id if weights_node else None)
 
     def rank(self, matrix_id=None, weights_id=None, extension=None):
 
         if matrix_id and weights_id and extension:
-            try:
-                data = [data for data in self.calculation_data if data['matrix_id'] == matrix_id and data['weights_node'].id == weights_id][0]
-                if data['method_obj'] == None:
-                    ranking = rrankdata(data['preference'])
-                else:
-                    if extension == 'crisp':
-                        ranking = data['method_obj'].rank(data['preference']).tolist()
-                    elif extension == 'fuzzy':
-                        ranking = data['method_obj'].rank().tolist()
-                        if self.method == 'VIKOR' and np.array(ranking).ndim == 2:
-                            ranking = ranking[2]
-            except Exception as err:
+            data = self.get_result(matrix_id, weights_id)
+            if data is None:
                 raise ValueError(get_error_message(self.locale, 'ranking-calculation-error'))
+
+            if 'ranking' in data.keys():
+                ranking = data['ranking']
+            else:
+                ranking = rank_preferences(self.method, data['preference'], extension, self.locale)
         else:
             data = self.calculation_data[0]
             ranking = list(rrankdata(data['preference']))
 
         return ranking, data
 
-    def get_response(self):
+    def get_response(self, binary=False, precision=RESULTS_PRECISION):
         response = super().get_response()
 
         data = []
@@ -208,16 +926,20 @@ class MethodNode(Node):
                 data.append({
                     "matrix_id": 0,
                     "weights_method": '',
-                    "preference": cdata['preference'],
+                    "preference": encode_array(cdata['preference']) if binary else cdata['preference'],
                     "kwargs": cdata['kwargs']
                 })
             else:
                 kwargs = [kwarg for kwarg in cdata['kwargs'] if kwarg['matrix_id'] == cdata['matrix_id'] and len(kwarg.values()) > 1]
                 kwargs = [{k:v for k, v in kwarg.items() if v != ''} for kwarg in kwargs]
+                if binary:
+                    preference = encode_array(cdata['preference'] if precision is None else np.round(cdata['preference'], precision))
+                else:
+                    preference = cdata['preference'].tolist() if precision is None else round_values(cdata['preference'], precision)
                 data.append({
                     "matrix_id": cdata['matrix_id'],
                     "weights_method": cdata['weights_node'].method,
-                    "preference": cdata['preference'],
+                    "preference": preference,
                     "kwargs": kwargs
                 })
 
@@ -241,7 +963,7 @@ class RankingNode(Node):
         if matrix_node and weights_node:
             ranking, data = method_node.rank(matrix_node.id, weights_node.id, matrix_node.extension)
             
-            self.calculation_data.append({
+            self._add_calculation_data({
                 "matrix_id": matrix_node.id,
                 "method": method_node.method,
                 "weights_method": data['weights_node'].method,
@@ -250,7 +972,7 @@ class RankingNode(Node):
             })
         else:
             ranking, data = method_node.rank()
-            self.calculation_data.append({
+            self._add_calculation_data({
                 "matrix_id": 0,
                 "method": method_node.method,
                 "weights_method": '',
@@ -261,7 +983,7 @@ class RankingNode(Node):
         return ranking
 
     def get_input_rank(self):
-        self.calculation_data.append({
+        self._add_calculation_data({
             "matrix_id": 0,
             "method": 'INPUT RANK',
             "weights_method": '',
@@ -276,7 +998,7 @@ class RankingNode(Node):
 
         ranking = rrankdata(np.array(method_node.kwargs[0]['preference'], dtype=float)).tolist()
 
-        ranking_node.calculation_data.append({
+        ranking_node._add_calculation_data({
             "matrix_id": matrix_id,
             "method": method_node.method,
             "weights_method": '',
@@ -287,11 +1009,11 @@ class RankingNode(Node):
         return ranking
 
 
-    def get_response(self):
+    def get_response(self, binary=False, precision=RESULTS_PRECISION):
         response = super().get_response()
 
         return response | {
-            "data": self.calculation_data
+            "data": encode_fields(self.calculation_data, ('ranking',)) if binary else self.calculation_data
         }
 
 class CorrelationNode(Node):
@@ -320,27 +1042,45 @@ class CorrelationNode(Node):
                         corr_labels.append(node.method.upper())
                         corr_data.append(node.kwargs[0][data_field])
                     else:
-                        for data in node.calculation_data:
-                            if data['matrix_id'] == matrix_id:
-                                corr_data.append(data[data_field])
-                                if data_field == 'ranking':
-                                    if 'weights_method' in data.keys():
-                                        corr_labels.append(f'{data["method"]}\n{data["weights_method"]}')
-                                    else:
-                                        corr_labels.append(data['method'])
+                        for data in node.get_results(matrix_id):
+                            corr_data.append(data[data_field])
+                            if data_field == 'ranking':
+                                if 'weights_method' in data.keys():
+                                    corr_labels.append(f'{data["method"]}\n{data["weights_method"]}')
                                 else:
-                                    if 'weights_node' in data.keys():
-                                        corr_labels.append(f'{node.method}\n{data["weights_node"].method}')
-                                    else:
-                                        corr_labels.append(node.method)
+                                    corr_labels.append(data['method'])
+                            else:
+                                if 'weights_node' in data.keys():
+                                    corr_labels.append(f'{node.method}\n{data["weights_node"].method}')
+                                else:
+                                    corr_labels.append(node.method)
         except Exception as err:
             raise ValueError(f"{get_error_message(self.locale, 'correlation-generating-error')} ({self.method})")
 
         return corr_data, corr_labels
 
-    def calculate(self, nodes, matrix_node=None, precision=3):
-
-        corr_matrix = []
+    def prepare(self, nodes, matrix_node=None):
+        """
+        Collects the data of connected nodes to be correlated.
+
+        Parameters
+        ----------
+        nodes : list
+            Nodes connected to the correlation node.
+        matrix_node : MatrixNode, optional
+            The matrix node for which the data are collected (default is None for input data).
+
+        Raises
+        ------
+        ValueError
+            If the rows of data have different sizes.
+
+        Returns
+        -------
+        list
+            List of (corr_data, corr_labels) pairs for which correlation matrices are calculated.
+        """
+        items = []
 
         if matrix_node:
             for node_type in ['weights', 'method', 'ranking']:
@@ -348,19 +1088,7 @@ class CorrelationNode(Node):
                 if len(corr_data) > 0:
                     if len(set([len(row) for row in corr_data])) > 1:
                         raise ValueError(get_error_message(self.locale, 'correlation-same-size-error'))
-
-                    correlation_obj = correlation_methods[self.method]
-
-                    try:
-                        corr_matrix = np.round(correlation_matrix(np.array(corr_data, dtype=float), correlation_obj), precision)
-                    except Exception as err:
-                        raise ValueError(f"{get_error_message(self.locale, 'correlation-calculation-error')} ({self.method})")
-
-                    self.calculation_data.append({
-                        "matrix_id": matrix_node.id,
-                        "correlation": corr_matrix.tolist(),
-                        "labels": corr_labels
-                    })  
+                    items.append((corr_data, corr_labels))
         else:
             corr_key = 'preference'
             if nodes[0].node_type == 'ranking':
@@ -374,28 +1102,220 @@ class CorrelationNode(Node):
             if len(corr_data) > 0:
                 if len(set([len(row) for row in corr_data])) > 1:
                     raise ValueError(get_error_message(self.locale, 'correlation-same-size-error'))
+                items.append((corr_data, corr_labels))
+
+        return items
+
+    def add_result(self, matrix_node, corr_matrix, corr_labels):
+        self._add_calculation_data({
+            "matrix_id": matrix_node.id if matrix_node else 0,
+            "correlation": corr_matrix.tolist(),
+            "labels": corr_labels
+        })
+
+    def calculate(self, nodes, matrix_node=None):
+
+        corr_matrix = []
+
+        for corr_data, corr_labels in self.prepare(nodes, matrix_node):
+            corr_matrix = calculate_correlation_matrix(corr_data, self.method, self.locale)
+            self.add_result(matrix_node, corr_matrix, corr_labels)
+
+        return corr_matrix if len(corr_matrix) > 0 else []
+
+    def get_response(self, binary=False, precision=RESULTS_PRECISION):
+        response = super().get_response()
+        data = round_fields(self.calculation_data, ('correlation',), precision)
+
+        return response | {
+            "method": self.method,
+            "data": encode_fields(data, ('correlation',)) if binary else data
+        }
+
+class SensitivityNode(Node):
+    def __init__(self, locale, id, node_type, extension, connections_from, connections_to, position_x, position_y, method, kwargs=[]) -> None:
+        
+        super().__init__(locale, id, node_type, extension, connections_from, connections_to, position_x, position_y)
+        
+        self.method = method.upper()
+        if self.method not in list(perturbation_methods.keys()):
+            raise ValueError(f"'{self.method}': {get_error_message(self.locale, 'method-name-not-found')}")
+
+        self.kwargs = kwargs
+        self.calculation_data = []
 
-                correlation_obj = correlation_methods[self.method]
+    def calculate(self, nodes, matrix_node, deadline=None):
+        """
+        Estimates the stability of rankings of the connected methods under perturbations of the criteria weights.
+
+        For each connected method and weights, sampled vectors of weights are evaluated with the batch implementation or the kernel of the method.
+
+        Parameters
+        ----------
+        nodes : list
+            Method nodes connected to the sensitivity node.
+        matrix_node : MatrixNode
+            The matrix node for which the sensitivity is analyzed.
+        deadline : float, optional
+            Value of `time.monotonic()` after which the calculation is stopped with TimeoutError (default is None for no time limit).
+
+        Raises
+        ------
+        ValueError
+            If the method has no batch implementation or kernel, the parameters are invalid or the calculation fails.
+        TimeoutError
+            If the deadline passes before all chunks of samples are evaluated.
+        """
+        samples, seed, params = get_sampling_parameters(self.kwargs, perturbation_methods[self.method], SENSITIVITY_SAMPLES, SENSITIVITY_SAMPLES_LIMIT, self.locale)
+        chunk_size = max(1, SENSITIVITY_CHUNK_SIZE // (matrix_node.matrix.shape[0] * max(matrix_node.matrix.shape)))
+
+        for method_node in nodes:
+            if matrix_node.extension != 'crisp' or (method_node.method not in mcda_batch_methods and method_node.method not in mcda_kernels):
+                raise ValueError(f'{get_error_message(self.locale, "sensitivity-method-error")} ({method_node.method})')
+
+            for data in method_node.get_results(matrix_node.id):
+                weights_node = data['weights_node']
+                criteria_weights = np.array(weights_node.calculate(matrix_node), dtype=float)
+                method_obj, call_kwargs = create_method_object(method_node.method, method_node.extension, method_node.kwargs, matrix_node, criteria_weights, self.locale, deadline)
+                evaluate, evaluate_stack = create_evaluators(method_node.method, method_obj, call_kwargs, matrix_node, criteria_weights, self.locale)
+                if method_node.method not in mcda_batch_methods and evaluate_stack is None:
+                    raise ValueError(f'{get_error_message(self.locale, "sensitivity-method-error")} ({method_node.method})')
 
                 try:
-                    corr_matrix = np.round(correlation_matrix(np.array(corr_data, dtype=float), correlation_obj), precision)
+                    ranking, distribution, changes = weights_sensitivity(
+                        lambda weights: evaluate(matrix_node.matrix, weights),
+                        criteria_weights,
+                        method_obj.reverse_ranking,
+                        perturbation_methods[self.method],
+                        np.random.default_rng(seed),
+                        samples,
+                        chunk_size,
+                        deadline,
+                        **params
+                    )
+                except TimeoutError:
+                    raise
+                except ValueError as err:
+                    raise ValueError(err)
                 except Exception as err:
-                    raise ValueError(f"{get_error_message(self.locale, 'correlation-calculation-error')} ({self.method})")
+                    raise ValueError(f'{get_error_message(self.locale, "sensitivity-calculation-error")} ({self.method})')
+
+                self._add_calculation_data({
+                    "matrix_id": matrix_node.id,
+                    "method": method_node.method,
+                    "weights_method": weights_node.method,
+                    "samples": samples,
+                    "ranking": ranking.tolist(),
+                    "rank_distribution": distribution.tolist(),
+                    "rank_change": changes.tolist(),
+                    "kwargs": self.kwargs
+                }, weights_node.id)
+
+    def get_response(self, binary=False, precision=RESULTS_PRECISION):
+        response = super().get_response()
+        data = round_fields(self.calculation_data, ('rank_distribution', 'rank_change'), precision)
 
-                self.calculation_data.append({
-                    "matrix_id": 0,
-                    "correlation": corr_matrix.tolist(),
-                    "labels": corr_labels
-                })  
+        return response | {
+            "method": self.method,
+            "data": encode_fields(data, ('ranking', 'rank_distribution', 'rank_change')) if binary else data
+        }
 
-        return corr_matrix if len(corr_matrix) > 0 else []
+class SMAANode(Node):
+    def __init__(self, locale, id, node_type, extension, connections_from, connections_to, position_x, position_y, method, kwargs=[]) -> None:
+        
+        super().__init__(locale, id, node_type, extension, connections_from, connections_to, position_x, position_y)
+        
+        self.method = method.upper()
+        if self.method not in list(weights_distributions.keys()):
+            raise ValueError(f"'{self.method}': {get_error_message(self.locale, 'method-name-not-found')}")
+
+        self.kwargs = kwargs
+        self.calculation_data = []
 
-    def get_response(self):
+    def calculate(self, nodes, matrix_node, map_chunks=None, deadline=None):
+        """
+        Calculates the SMAA-2 rank acceptability indices, central vectors of weights and confidence factors of the connected methods.
+
+        Samples are evaluated in chunks of fixed size, each with its own random numbers generator derived from the seed,
+        so the results do not depend on the order of evaluation of chunks.
+
+        Parameters
+        ----------
+        nodes : list
+            Method nodes connected to the SMAA node.
+        matrix_node : MatrixNode
+            The matrix node for which the SMAA is calculated.
+        map_chunks : callable, optional
+            Function evaluating the list of (function, args) chunk jobs and returning their results in order,
+            e.g. in the pool of worker processes (default is None for evaluation in the current process).
+        deadline : float, optional
+            Value of `time.monotonic()` after which the calculation is stopped with TimeoutError (default is None for no time limit).
+
+        Raises
+        ------
+        ValueError
+            If the method has no crisp implementation, the parameters are invalid or the calculation fails.
+        TimeoutError
+            If the deadline passes before all chunks of samples are evaluated.
+        """
+        if map_chunks is None:
+            map_chunks = lambda jobs: [function(*args) for function, args in jobs]
+
+        samples, seed, params = get_sampling_parameters(self.kwargs, weights_distributions[self.method], SMAA_SAMPLES, SMAA_SAMPLES_LIMIT, self.locale)
+        m, n = matrix_node.matrix.shape[:2]
+        chunk_size = max(1, min(SMAA_CHUNK_SAMPLES, SMAA_CHUNK_SIZE // (m * max(m, n))))
+        sizes = [min(chunk_size, samples - start) for start in range(0, samples, chunk_size)]
+
+        for method_node in nodes:
+            if 'crisp' not in mcda_methods[method_node.method]:
+                raise ValueError(f'{get_error_message(self.locale, "smaa-method-error")} ({method_node.method})')
+
+            for data in method_node.get_results(matrix_node.id):
+                weights_node = data['weights_node']
+                criteria_weights = np.array(weights_node.calculate(matrix_node), dtype=float)
+                if criteria_weights.ndim == 2:
+                    criteria_weights = np.mean(criteria_weights, axis=1)
+                criteria_weights = criteria_weights / np.sum(criteria_weights)
+
+                seed_sequence = np.random.SeedSequence(seed)
+                args = (method_node.method, method_node.kwargs, matrix_node, criteria_weights, self.method, params)
+
+                results = map_chunks([(calculate_smaa_chunk, (*args, chunk_seed, size, self.locale, None, deadline)) for chunk_seed, size in zip(seed_sequence.spawn(len(sizes)), sizes)])
+                counts = np.sum([result[0] for result in results], axis=0)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    central_weights = np.sum([result[1] for result in results], axis=0) / counts[:, :1]
+
+                if matrix_node.extension == 'fuzzy':
+                    results = map_chunks([(calculate_smaa_chunk, (*args, chunk_seed, size, self.locale, central_weights, deadline)) for chunk_seed, size in zip(seed_sequence.spawn(len(sizes)), sizes)])
+                    confidence = np.sum(results, axis=0) / samples
+                else:
+                    confidence = calculate_smaa_chunk(*args, None, 1, self.locale, central_weights, deadline).astype(float)
+
+                self._add_calculation_data({
+                    "matrix_id": matrix_node.id,
+                    "method": method_node.method,
+                    "weights_method": weights_node.method,
+                    "samples": samples,
+                    "acceptability": (counts / samples).tolist(),
+                    "central_weights": [None if np.isnan(row[0]) else row.tolist() for row in central_weights],
+                    "confidence": confidence.tolist(),
+                    "kwargs": self.kwargs
+                }, weights_node.id)
+
+    def get_response(self, binary=False, precision=RESULTS_PRECISION):
         response = super().get_response()
+        data = round_fields(self.calculation_data, ('acceptability', 'central_weights', 'confidence'), precision)
+
+        if binary:
+            data = encode_fields(data, ('acceptability', 'confidence'))
+            # alternatives which are never the best have NaN central weights in the encoded array
+            for item in data:
+                criteria = max([len(row) for row in item['central_weights'] if row is not None])
+                item['central_weights'] = encode_array([[np.nan] * criteria if row is None else row for row in item['central_weights']])
 
         return response | {
             "method": self.method,
-            "data": self.calculation_data
+            "data": data
         }
 
 class VisualizationNode(Node):
@@ -414,14 +1334,14 @@ class VisualizationNode(Node):
         calculation_data = []
         try:
             for node in nodes:
-                for data in node.calculation_data:
-                    if matrix_node:
-                        if data['matrix_id'] == matrix_node.id:
-                            if isinstance(node, RankingNode):
-                                calculation_data.append([data, data['method']])
-                            else:
-                                calculation_data.append([data, node.method])
-                    else:
+                if matrix_node:
+                    for data in node.get_results(matrix_node.id):
+                        if isinstance(node, RankingNode):
+                            calculation_data.append([data, data['method']])
+                        else:
+                            calculation_data.append([data, node.method])
+                else:
+                    for data in node.calculation_data:
                         if isinstance(node, RankingNode):
                             calculation_data.append([data, f"{data['method']} (ID {node.id})"])
                         else:
@@ -487,7 +1407,7 @@ class VisualizationNode(Node):
             metric = None
             if len(metrics_names) == len(graph_data):
                 metric = metrics_names[idx]
-            self.calculation_data.append(
+            self._add_calculation_data(
                 {
                     "matrix_id": matrix_node.id if matrix_node else 0,
                     "img": generate_graph(data, labels, self.method, self.locale),
@@ -496,7 +1416,7 @@ class VisualizationNode(Node):
             )
         
     
-    def get_response(self):
+    def get_response(self, binary=False, precision=RESULTS_PRECISION):
         response = super().get_response()
 
         return response | {
@@ -4,11 +4,33 @@ import numpy as np
 import pymcdm
 import pyfdm
 from pymcdm.methods import TOPSIS, SPOTIS, COMET
-from pymcdm.methods.comet_tools import MethodExpert, ESPExpert, CompromiseExpert
+from pymcdm.methods.comet_tools import MethodExpert, ESPExpert
 from pymcdm.weights import equal_weights, gini_weights, standard_deviation_weights
 
+# CONST
+from config import COMET_CHUNK_SIZE
+from methods.comet import BatchCompromiseExpert
+from methods.kernels import topsis_kernel
+
 # UTILS
 from utils.errors import get_error_message
+from utils.cache import get_cache_key
+
+def get_compromise_weights(matrix):
+    """
+    Calculates the vectors of criteria weights used by the compromise expert function of the COMET method.
+
+    Parameters
+    ----------
+    matrix : ndarray
+        Decision matrix.
+
+    Returns
+    -------
+    ndarray
+        Equal, Gini and standard deviation weights of the decision matrix (3 x n).
+    """
+    return np.array([equal_weights(matrix), gini_weights(matrix), standard_deviation_weights(matrix)])
 
 # FOR ADDITIONAL PARAMETERS FOR FUZZY MCDA METHODS
 def get_fuzzy_parameters(kwargs, locale):
@@ -56,7 +78,7 @@ def get_fuzzy_parameters(kwargs, locale):
     except Exception as err:
         raise ValueError(get_error_message(locale, "fuzzy-params-not-found"))
 
-def get_crisp_parameters(kwargs, matrix_node, criteria_weights, locale):
+def get_crisp_parameters(kwargs, matrix_node, criteria_weights, locale, deadline=None):
     """
         Retrieves additional parameters for given crisp MCDA method
 
@@ -67,6 +89,9 @@ def get_crisp_parameters(kwargs, matrix_node, criteria_weights, locale):
             
             locale : string
                 User application language
+
+            deadline : float, optional
+                Value of `time.monotonic()` after which the compromise expert function stops the evaluation
         Raises
         -------
             ValueError Exception
@@ -110,14 +135,8 @@ def get_crisp_parameters(kwargs, matrix_node, criteria_weights, locale):
 
 
                 elif value == 'compromise_expert':
-                    topsis = TOPSIS()
-                    evaluation_function = [
-                            lambda co: topsis(co, equal_weights(matrix_node.matrix), matrix_node.criteria_types),
-                            lambda co: topsis(co, gini_weights(matrix_node.matrix), matrix_node.criteria_types),
-                            lambda co: topsis(co, standard_deviation_weights(matrix_node.matrix), matrix_node.criteria_types),
-                            ]
-
-                    expert_function = CompromiseExpert(evaluation_function)
+                    # TOPSIS votes with the equal, Gini and standard deviation weights of the decision matrix
+                    expert_function = BatchCompromiseExpert(topsis_kernel, get_compromise_weights(matrix_node.matrix), matrix_node.criteria_types, COMET_CHUNK_SIZE, deadline=deadline)
                     init_kwargs[key] = expert_function
             # ERVD
             elif key == 'ref_point' and value != '':
@@ -154,7 +173,7 @@ def get_crisp_parameters(kwargs, matrix_node, criteria_weights, locale):
     except Exception as err:
         raise ValueError(get_error_message(locale, "crisp-params-not-found"))
 
-def get_parameters(kwargs, extension, matrix_node, criteria_weights, locale):
+def get_parameters(kwargs, extension, matrix_node, criteria_weights, locale, deadline=None):
     """
     Retrieves additional parameters based on the method extension type (crisp or fuzzy).
 
@@ -170,6 +189,8 @@ def get_parameters(kwargs, extension, matrix_node, criteria_weights, locale):
         List of criteria weights.
     locale : str
         User application language.
+    deadline : float, optional
+        Value of `time.monotonic()` after which the calculation is stopped with TimeoutError (default is None for no time limit).
 
     Returns
     -------
@@ -183,13 +204,51 @@ def get_parameters(kwargs, extension, matrix_node, criteria_weights, locale):
     if len(items) > 0:
 
         if extension == 'crisp':
-            init_kwargs = get_crisp_parameters(items[0], matrix_node, criteria_weights, locale)
+            init_kwargs = get_crisp_parameters(items[0], matrix_node, criteria_weights, locale, deadline)
         elif extension == 'fuzzy':
             init_kwargs = get_fuzzy_parameters(items[0], locale)
 
     return init_kwargs
 
 
+def get_comet_key(kwargs, init_kwargs, matrix_node, criteria_weights):
+    """
+    Creates the key of the fitted COMET model in the models cache.
+
+    The model depends on the characteristic values and on the data used by the expert function to evaluate the characteristic objects.
+
+    Parameters
+    ----------
+    kwargs : list
+        Additional parameters of the method given for each matrix.
+    init_kwargs : dict
+        Parameters of the COMET object retrieved with `get_parameters`.
+    matrix_node : object
+        The matrix node object containing the decision matrix and criteria types.
+    criteria_weights : list
+        List of criteria weights.
+
+    Returns
+    -------
+    str
+        Content hash of the model data, or None if the model is not defined with the characteristic values and expert function.
+    """
+    items = [item for item in kwargs if item['matrix_id'] == matrix_node.id]
+    if len(items) == 0 or 'cvalues' not in init_kwargs or 'expert_function' not in init_kwargs:
+        return None
+
+    expert = items[0]['expert_function']
+    if expert == 'method_expert':
+        data = [np.asarray(criteria_weights, dtype=float), matrix_node.criteria_types]
+    elif expert == 'esp_expert':
+        data = [np.array([items[0]['esp']], dtype=float), SPOTIS.make_bounds(matrix_node.matrix)]
+    elif expert == 'compromise_expert':
+        data = [get_compromise_weights(matrix_node.matrix), matrix_node.criteria_types]
+    else:
+        return None
+
+    return get_cache_key('COMET', np.asarray(init_kwargs['cvalues'], dtype=float), expert, *data)
+
 def get_call_kwargs(method, init_kwargs, extension, locale):
     """
     Retrieves call-specific parameters for a given MCDA method.
@@ -0,0 +1,114 @@
+# Copyright (C) Jakub Więckowski 2024
+
+# CONST
+from config import PLAN_CACHE_SIZE
+from methods import mcda_methods
+
+# HELPERS
+from .parameters import get_parameters, get_call_kwargs
+
+# UTILS
+from utils.cache import LRUCache, get_cache_key
+
+# compiled execution plans of the structures, shared between requests with the same topology
+plans = LRUCache(PLAN_CACHE_SIZE)
+
+# fields of the node data describing the topology, values of matrices, criteria types and weights are not included
+STRUCTURE_KEYS = ['id', 'node_type', 'extension', 'method', 'kwargs', 'connections_from', 'connections_to']
+
+def get_plan_key(data):
+    """
+    Creates the structural hash of the calculation structure.
+
+    Parameters
+    ----------
+    data : list
+        List of node data dictionaries of the structure.
+
+    Returns
+    -------
+    str
+        Content hash of the node types, methods, parameters and connections.
+    """
+    return get_cache_key('plan', [{key: node.get(key) for key in STRUCTURE_KEYS} for node in data])
+
+def is_static_parameters(item):
+    """
+    Checks if the parameters of the crisp method do not depend on the decision matrix and criteria weights.
+
+    Parameters
+    ----------
+    item : dict
+        Additional parameters of the method given for the matrix.
+
+    Returns
+    -------
+    bool
+        False if the COMET expert function or the default characteristic values are used.
+    """
+    return 'expert_function' not in item and item.get('cvalues') != ''
+
+class CalculationPlan:
+    def __init__(self, structure, graph) -> None:
+        """
+        Compiles the validated execution graph into the plan, which can be applied to the structures with the same topology.
+
+        Nodes are referenced by their positions in the structure, as the plan is shared between structures with other node objects.
+        The plan is not changed after compilation.
+
+        Parameters
+        ----------
+        structure : CalculationStructure
+            The structure with valid connections.
+        graph : CalculationGraph
+            The execution graph of the structure.
+        """
+        positions = {id(node): idx for idx, node in enumerate(structure.nodes)}
+        position = lambda node: None if node is None else positions[id(node)]
+
+        self.dependencies = {node_id: tuple(ids) for node_id, ids in graph.dependencies.items()}
+        self.order = tuple([position(node) for node in graph.order])
+        self.matrices = {node_id: tuple([position(matrix_node) for matrix_node in matrix_nodes]) for node_id, matrix_nodes in graph.matrices.items()}
+        self.levels = tuple([tuple([(position(node), position(matrix_node)) for node, matrix_node in level]) for level in graph.levels])
+        self.methods = self._resolve_methods(structure, graph, positions)
+
+    @staticmethod
+    def _resolve_methods(structure, graph, positions):
+        """
+        Creates the method objects with the parameters which do not depend on the decision matrix and criteria weights.
+
+        Method objects which cannot be created are resolved during the calculation, to report the errors in the order of evaluation.
+        Only the crisp method objects are shared, as the fuzzy method objects keep the preferences of their last call used in ranking,
+        so they are created for each calculation.
+
+        Parameters
+        ----------
+        structure : CalculationStructure
+            The structure with valid connections.
+        graph : CalculationGraph
+            The execution graph of the structure.
+        positions : dict
+            Positions of the node objects in the structure.
+
+        Returns
+        -------
+        dict
+            (method_obj, call_kwargs) pairs for the (node position, matrix id) pairs.
+        """
+        methods = {}
+        for node, matrix_node in graph.tasks:
+            if node.node_type != 'method' or node.method == 'INPUT' or matrix_node is None or matrix_node.extension != 'crisp':
+                continue
+
+            items = [item for item in node.kwargs if item['matrix_id'] == matrix_node.id]
+            if len(items) > 0 and not is_static_parameters(items[0]):
+                continue
+
+            try:
+                init_kwargs = get_parameters(node.kwargs, matrix_node.extension, matrix_node, None, structure.locale)
+                call_kwargs = get_call_kwargs(node.method, init_kwargs, node.extension, structure.locale)
+                methods[(positions[id(node)], matrix_node.id)] = (mcda_methods[node.method][matrix_node.extension](**init_kwargs), call_kwargs)
+            except Exception as err:
+                continue
+
+        return methods
@@ -0,0 +1,204 @@
+# Copyright (C) Jakub Więckowski 2024
+
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+
+# CONST
+from config import POOL_WORKERS, POOL_REQUEST_LIMIT
+
+# HELPERS
+from helpers import init_worker
+
+# CALCULATIONS
+from .node import calculate_preferences, calculate_preferences_batch, rank_preferences, calculate_correlation_matrix
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def _ping():
+    return True
+
+def get_pool():
+    """
+    Retrieves the shared pool of worker processes, creating and warming it up on first use.
+
+    Returns
+    -------
+    ProcessPoolExecutor
+        The pool of worker processes with calculation packages already imported.
+    """
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            context = multiprocessing.get_context('spawn')
+            _pool = ProcessPoolExecutor(max_workers=POOL_WORKERS, mp_context=context, initializer=init_worker)
+            # start all workers before the first request is handled
+            wait([_pool.submit(_ping) for _ in range(POOL_WORKERS)])
+
+    return _pool
+
+def shutdown_pool():
+    """
+    Shuts down the shared pool of worker processes.
+    """
+    global _pool
+
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+
+def map_jobs(jobs, limit=POOL_REQUEST_LIMIT):
+    """
+    Evaluates the jobs in the worker processes, with at most `limit` jobs of the request running at the same time.
+
+    Parameters
+    ----------
+    jobs : list
+        List of (function, args) pairs. Function should be defined on the module level to be sent to the worker.
+    limit : int, optional
+        Maximum number of jobs evaluated at the same time (default is POOL_REQUEST_LIMIT).
+
+    Raises
+    ------
+    Exception
+        The first error raised by the jobs, in the order of the jobs.
+
+    Returns
+    -------
+    list
+        Results of the jobs in the order of the given jobs.
+    """
+    if len(jobs) == 0:
+        return []
+
+    pool = get_pool()
+    results = [None] * len(jobs)
+    errors = [None] * len(jobs)
+    running = {}
+    queue = deque(enumerate(jobs))
+
+    try:
+        while len(queue) > 0 or len(running) > 0:
+            while len(queue) > 0 and len(running) < max(1, limit):
+                idx, (function, args) = queue.popleft()
+                running[pool.submit(function, *args)] = idx
+
+            done, _ = wait(running.keys(), return_when=FIRST_COMPLETED)
+            for future in done:
+                idx = running.pop(future)
+                try:
+                    results[idx] = future.result()
+                except BrokenProcessPool:
+                    raise
+                except Exception as err:
+                    errors[idx] = err
+    except BrokenProcessPool as err:
+        shutdown_pool()
+        raise err
+
+    for err in errors:
+        if err is not None:
+            raise err
+
+    return results
+
+def calculate_method_job(method, extension, kwargs, matrix_node, criteria_weights, locale, rank=False, resolved=None, deadline=None):
+    """
+    Calculates the preferences, and optionally the ranking, of alternatives in the worker process.
+
+    Parameters
+    ----------
+    method : str
+        Name of the MCDA method.
+    extension : str
+        Data extension of the method node.
+    kwargs : list
+        Additional parameters of the method given for each matrix.
+    matrix_node : MatrixNode
+        The matrix node with the decision matrix and criteria types.
+    criteria_weights : ndarray
+        Vector of criteria weights.
+    locale : str
+        User application language.
+    rank : bool, optional
+        If True, the ranking of alternatives is calculated as well (default is False).
+    resolved : tuple, optional
+        (method_obj, call_kwargs) resolved in the calculation plan (default is None).
+    deadline : float, optional
+        Value of `time.monotonic()` after which the calculation is stopped with TimeoutError (default is None for no time limit).
+
+    Returns
+    -------
+    tuple
+        (pref, ranking) with the calculated preferences and ranking (None if not requested).
+    """
+    pref = calculate_preferences(method, extension, kwargs, matrix_node, criteria_weights, locale, resolved, deadline)
+    ranking = None
+    if rank:
+        ranking = rank_preferences(method, pref, matrix_node.extension, locale)
+
+    return pref, ranking
+
+def calculate_method_batch_job(method, extension, kwargs, matrix_node, criteria_weights, locale, rank=False, resolved=None, deadline=None):
+    """
+    Calculates the preferences, and optionally the rankings, of alternatives for many vectors of weights in the worker process.
+
+    Parameters
+    ----------
+    method : str
+        Name of the MCDA method with the batch implementation.
+    extension : str
+        Data extension of the method node.
+    kwargs : list
+        Additional parameters of the method given for each matrix.
+    matrix_node : MatrixNode
+        The matrix node with the decision matrix and criteria types.
+    criteria_weights : list
+        Vectors of criteria weights.
+    locale : str
+        User application language.
+    rank : bool, optional
+        If True, the rankings of alternatives are calculated as well (default is False).
+    resolved : tuple, optional
+        (method_obj, call_kwargs) resolved in the calculation plan (default is None).
+    deadline : float, optional
+        Value of `time.monotonic()` after which the calculation is stopped with TimeoutError (default is None for no time limit).
+
+    Returns
+    -------
+    list
+        (pref, ranking) pairs for each vector of weights, with ranking None if not requested.
+    """
+    results = []
+    for pref in calculate_preferences_batch(method, extension, kwargs, matrix_node, criteria_weights, locale, resolved, deadline):
+        ranking = None
+        if rank:
+            ranking = rank_preferences(method, pref, matrix_node.extension, locale)
+        results.append((pref, ranking))
+
+    return results
+
+def calculate_correlation_job(corr_data, method, locale):
+    """
+    Calculates the correlation matrix in the worker process.
+
+    Parameters
+    ----------
+    corr_data : list
+        Rows of data to correlate.
+    method : str
+        Name of the correlation method.
+    locale : str
+        User application language.
+
+    Returns
+    -------
+    ndarray
+        Correlation matrix.
+    """
+    return calculate_correlation_matrix(corr_data, method, locale)
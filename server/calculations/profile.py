@@ -0,0 +1,207 @@
+# Copyright (C) Jakub Więckowski 2024
+
+import json
+import threading
+import time
+import tracemalloc
+
+# tracing of memory allocations and its peak are shared by the whole process,
+# so the measurements of memory are evaluated one at a time
+_tracing_lock = threading.Lock()
+
+def measure(function, *args, memory=False):
+    """
+    Evaluates the function measuring its wall time, CPU time and optionally peak of allocated memory.
+
+    Memory is measured with tracemalloc, which slows down the evaluation and is enabled for the whole process,
+    so the measurements of memory wait for each other and the peak includes allocations of other threads made at the same time.
+
+    Parameters
+    ----------
+    function : callable
+        Function to evaluate.
+    *args
+        Arguments of the function.
+    memory : bool, optional
+        If True, the peak of allocated memory is measured (default is False).
+
+    Returns
+    -------
+    tuple
+        (result, stats) with the result of the function and dictionary with the measurements.
+    """
+    if not memory:
+        wall_start, cpu_start = time.perf_counter(), time.thread_time()
+        result = function(*args)
+
+        return result, {
+            "wall_time": time.perf_counter() - wall_start,
+            "cpu_time": time.thread_time() - cpu_start,
+            "memory_peak": None,
+        }
+
+    with _tracing_lock:
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        try:
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            wall_start, cpu_start = time.perf_counter(), time.thread_time()
+
+            result = function(*args)
+
+            wall_time, cpu_time = time.perf_counter() - wall_start, time.thread_time() - cpu_start
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            if started:
+                tracemalloc.stop()
+
+    return result, {
+        "wall_time": wall_time,
+        "cpu_time": cpu_time,
+        "memory_peak": max(0, peak - current),
+    }
+
+class CalculationProfile:
+    def __init__(self, memory=False) -> None:
+        """
+        Initializes the profile collecting the resources usage of each node evaluated for each matrix.
+
+        Parameters
+        ----------
+        memory : bool, optional
+            If True, the peak of allocated memory is measured for each node (default is False).
+        """
+        self.memory = memory
+        self.items = {} # (node id, matrix id) -> measurements
+
+    def measure(self, node, matrix_node, function, *args):
+        """
+        Evaluates the node for the given matrix measuring its resources usage.
+
+        Parameters
+        ----------
+        node : Node
+            The evaluated node.
+        matrix_node : MatrixNode
+            The matrix node for which the node is evaluated, or None.
+        function : callable
+            Function evaluating the node.
+        *args
+            Arguments of the function.
+
+        Returns
+        -------
+        object
+            Result of the function.
+        """
+        result, stats = measure(function, *args, memory=self.memory)
+        self.add(node, matrix_node, stats)
+
+        return result
+
+    def add(self, node, matrix_node, stats):
+        """
+        Adds the measurements of the node evaluated for the given matrix.
+
+        Measurements of several evaluations for the same matrix (e.g. with different weights) are summed, keeping the highest memory peak.
+
+        Parameters
+        ----------
+        node : Node
+            The evaluated node.
+        matrix_node : MatrixNode
+            The matrix node for which the node is evaluated, or None.
+        stats : dict
+            Measured wall time, CPU time and memory peak.
+        """
+        matrix_id = matrix_node.id if matrix_node else 0
+        item = self.items.get((node.id, matrix_id))
+        if item is None:
+            item = {
+                "node_id": node.id,
+                "node_type": node.node_type,
+                "method": getattr(node, 'method', None),
+                "matrix_id": matrix_id,
+                "wall_time": 0,
+                "cpu_time": 0,
+                "memory_peak": None,
+            }
+            self.items[(node.id, matrix_id)] = item
+
+        item['wall_time'] += stats['wall_time']
+        item['cpu_time'] += stats['cpu_time']
+        if stats['memory_peak'] is not None:
+            item['memory_peak'] = max(item['memory_peak'] or 0, stats['memory_peak'])
+
+    @staticmethod
+    def _get_output_sizes(node):
+        """
+        Calculates the size of the node response data calculated for each matrix, once the node is evaluated.
+
+        Parameters
+        ----------
+        node : Node
+            The evaluated node.
+
+        Returns
+        -------
+        dict
+            Number of bytes of the serialized response data for each matrix identifier, None for the data not related to the matrix.
+        """
+        groups = {}
+        for item in node.get_response().get('data', []):
+            groups.setdefault(item.get('matrix_id'), []).append(item)
+
+        return {matrix_id: len(json.dumps(data, default=str).encode('utf-8')) for matrix_id, data in groups.items()}
+
+    def get_summary(self, graph):
+        """
+        Creates the summary of the profile with the critical path of the calculation.
+
+        The critical path is the chain of dependent nodes with the longest total wall time.
+
+        Parameters
+        ----------
+        graph : CalculationGraph
+            The execution graph of the evaluated structure.
+
+        Returns
+        -------
+        dict
+            Measurements of each node for each matrix, and the nodes and wall time of the critical path.
+        """
+        node_items = {}
+        for (node_id, _), item in self.items.items():
+            node_items.setdefault(node_id, []).append(item)
+        times = {node_id: sum([item['wall_time'] for item in items]) for node_id, items in node_items.items()}
+
+        # sizes of the outputs are calculated once for the evaluated node
+        for node in graph.order:
+            if node.id not in node_items:
+                continue
+            sizes = self._get_output_sizes(node)
+            for item in node_items[node.id]:
+                item['output_size'] = sizes.get(item['matrix_id'], 0) + sizes.get(None, 0)
+
+        finish, previous = {}, {}
+        for node in graph.order:
+            dependency_id = max(graph.dependencies[node.id], key=lambda id: finish[id], default=None)
+            finish[node.id] = times.get(node.id, 0) + (finish[dependency_id] if dependency_id is not None else 0)
+            previous[node.id] = dependency_id
+
+        path = []
+        node_id = max(finish, key=finish.get, default=None)
+        critical_time = finish[node_id] if node_id is not None else 0
+        while node_id is not None:
+            path.insert(0, node_id)
+            node_id = previous[node_id]
+
+        return {
+            "nodes": [item | {"wall_time": round(item['wall_time'], 6), "cpu_time": round(item['cpu_time'], 6)} for item in self.items.values()],
+            "critical_path": {
+                "nodes": path,
+                "wall_time": round(critical_time, 6),
+            }
+        }
@@ -0,0 +1,254 @@
+# Copyright (C) Jakub Więckowski 2024
+
+import copy
+import threading
+import uuid
+
+# CONST
+from config import SESSIONS_LIMIT, SESSIONS_TTL, RESULTS_PRECISION
+
+# CALCULATIONS
+from .structure import CalculationStructure
+
+# UTILS
+from utils.cache import LRUCache
+from utils.errors import get_error_message
+
+# calculation sessions of the users, removed after SESSIONS_TTL seconds without changes
+sessions = LRUCache(SESSIONS_LIMIT, SESSIONS_TTL)
+
+def _get_node_signature(node):
+    """
+    Retrieves the node data affecting the calculation results, without the position in the GUI application.
+
+    Parameters
+    ----------
+    node : dict
+        Node data.
+
+    Returns
+    -------
+    dict
+        Node data without the position.
+    """
+    return {key: value for key, value in node.items() if key not in ['position_x', 'position_y']}
+
+class CalculationSession:
+    def __init__(self, data, locale, parallel=False, precision=RESULTS_PRECISION) -> None:
+        """
+        Initializes the calculation session with the structure evaluated once and updated incrementally later.
+
+        Parameters
+        ----------
+        data : list
+            List of node data dictionaries to create the structure.
+        locale : str
+            User application language.
+        parallel : bool, optional
+            If True, methods and correlations are evaluated in the pool of worker processes (default is False).
+        precision : int or None, optional
+            Number of decimal places of the numeric results in the response, None for the results without rounding (default is RESULTS_PRECISION).
+        """
+        self.id = uuid.uuid4().hex
+        self.lock = threading.Lock() # changes of the session are applied one at a time
+        self.data = copy.deepcopy(data) # node data of the current structure
+        self.precision = precision # number of decimal places of the results in all responses of the session
+        self.structure = CalculationStructure(self.data, locale, parallel, precision=precision) # current structure with calculated results
+
+    def calculate(self):
+        """
+        Evaluates all nodes of the session structure.
+
+        Returns
+        -------
+        list
+            The calculation results of all nodes.
+        """
+        with self.lock:
+            return self.structure.calculate()
+
+    def _find_dirty_nodes(self, data, graph):
+        """
+        Determines the nodes which results are outdated after the structure changes.
+
+        The node is outdated if it is new, its data or dependencies changed, or any of its dependencies is outdated.
+        Rankings sharing input preferences are evaluated together, as the input ranking is assigned to the first of them.
+
+        Parameters
+        ----------
+        data : list
+            Node data of the changed structure.
+        graph : CalculationGraph
+            The execution graph of the changed structure.
+
+        Returns
+        -------
+        set
+            Ids of outdated nodes.
+        """
+        previous_data = {node['id']: _get_node_signature(node) for node in self.data}
+        previous_graph = self.structure.graph
+        signatures = {node['id']: _get_node_signature(node) for node in data}
+
+        def get_matrices_ids(matrices, node_id):
+            return [matrix_node.id if matrix_node else None for matrix_node in matrices.get(node_id, [])]
+
+        dirty = set()
+        changed = True
+        while changed:
+            changed = False
+            for node in graph.order:
+                if node.id in dirty:
+                    continue
+                if node.id not in previous_data \
+                    or previous_data[node.id] != signatures[node.id] \
+                    or previous_graph.dependencies.get(node.id) != graph.dependencies[node.id] \
+                    or get_matrices_ids(previous_graph.matrices, node.id) != get_matrices_ids(graph.matrices, node.id) \
+                    or any([dependency_id in dirty for dependency_id in graph.dependencies[node.id]]):
+                    dirty.add(node.id)
+                    changed = True
+
+            for node in graph.order:
+                if node.node_type != 'ranking' or node.id not in dirty:
+                    continue
+                for dependency_id in graph.dependencies[node.id]:
+                    dependency = graph.structure._find_node_by_id(dependency_id)
+                    if dependency.node_type == 'method' and dependency.method.lower() == 'input' and dependency_id not in dirty:
+                        dirty.add(dependency_id)
+                        changed = True
+
+        return dirty
+
+    def update(self, add, change, remove, locale, parallel=False):
+        """
+        Applies the changes to the session structure and evaluates only the nodes affected by them.
+
+        Parameters
+        ----------
+        add : list
+            Data of nodes added to the structure.
+        change : list
+            Data of nodes changed in the structure.
+        remove : list
+            Ids of nodes removed from the structure.
+        locale : str
+            User application language.
+        parallel : bool, optional
+            If True, methods and correlations are evaluated in the pool of worker processes (default is False).
+
+        Raises
+        ------
+        ValueError
+            If the changed nodes are not found, added nodes already exist or the calculation fails.
+            The session structure is not changed in such case.
+
+        Returns
+        -------
+        list
+            The calculation results of the evaluated nodes.
+        """
+        with self.lock:
+            nodes = {node['id']: node for node in self.data}
+
+            for node_id in remove:
+                if node_id not in nodes:
+                    raise ValueError(f'{get_error_message(locale, "session-node-not-found")} {node_id}')
+                del nodes[node_id]
+
+            for node in change:
+                if node['id'] not in nodes:
+                    raise ValueError(f'{get_error_message(locale, "session-node-not-found")} {node["id"]}')
+                nodes[node['id']] = copy.deepcopy(node)
+
+            for node in add:
+                if node['id'] in nodes:
+                    raise ValueError(f'{get_error_message(locale, "session-node-exists")} {node["id"]}')
+                nodes[node['id']] = copy.deepcopy(node)
+
+            data = list(nodes.values())
+            structure = CalculationStructure(data, locale, parallel, precision=self.precision)
+            dirty = self._find_dirty_nodes(data, structure.build_graph())
+
+            # nodes not affected by the changes keep their results
+            structure.replace_nodes([node for node in self.structure.nodes if node.id in nodes and node.id not in dirty])
+            response = structure.calculate(dirty)
+
+            self.data = data
+            self.structure = structure
+
+            return response
+
+def create_session(data, locale, parallel=False, precision=RESULTS_PRECISION):
+    """
+    Creates the calculation session and evaluates its structure.
+
+    Parameters
+    ----------
+    data : list
+        List of node data dictionaries to create the structure.
+    locale : str
+        User application language.
+    parallel : bool, optional
+        If True, methods and correlations are evaluated in the pool of worker processes (default is False).
+    precision : int or None, optional
+        Number of decimal places of the numeric results in the responses, None for the results without rounding (default is RESULTS_PRECISION).
+
+    Returns
+    -------
+    tuple
+        (session_id, response) with the id of created session and the calculation results of all nodes.
+    """
+    session = CalculationSession(data, locale, parallel, precision)
+    response = session.calculate()
+    sessions.set(session.id, session)
+
+    return session.id, response
+
+def get_session(session_id, locale):
+    """
+    Retrieves the calculation session.
+
+    Parameters
+    ----------
+    session_id : str
+        Id of the session.
+    locale : str
+        User application language.
+
+    Raises
+    ------
+    ValueError
+        If the session is not found or expired.
+
+    Returns
+    -------
+    CalculationSession
+        The calculation session.
+    """
+    session = sessions.get(session_id)
+    if session is None:
+        raise ValueError(f'{get_error_message(locale, "session-not-found")} {session_id}')
+
+    # the time of session expiration is counted from the last use
+    sessions.set(session_id, session)
+
+    return session
+
+def remove_session(session_id, locale):
+    """
+    Removes the calculation session.
+
+    Parameters
+    ----------
+    session_id : str
+        Id of the session.
+    locale : str
+        User application language.
+
+    Raises
+    ------
+    ValueError
+        If the session is not found or expired.
+    """
+    if sessions.remove(session_id) is None:
+        raise ValueError(f'{get_error_message(locale, "session-not-found")} {session_id}')
@@ -1,13 +1,24 @@
 # Copyright (C) Jakub Więckowski 2023 - 2024
 
+from functools import partial
+import numpy as np
+
+# CONST
+from config import RESULTS_PRECISION
+
 from .node import *
+from .graph import CalculationGraph
+from .plan import CalculationPlan, get_plan_key, plans
+from .pool import map_jobs, calculate_method_job, calculate_method_batch_job, calculate_correlation_job
+from .profile import CalculationProfile, measure
 
 # VALIDATOR
 from utils.validator import validate_user_weights
 from utils.errors import get_error_message
+from utils.cache import preferences_cache, weights_cache, comet_cache
 
 class CalculationStructure:
-    def __init__(self, data, locale) -> None:
+    def __init__(self, data, locale, parallel=False, profile=False, precision=RESULTS_PRECISION, profile_memory=False) -> None:
         """
         Initializes the CalculationStructure object.
 
@@ -17,10 +28,25 @@ class CalculationStructure:
             List of node data dictionaries to create the structure.
         locale : str
             User application language.
+        parallel : bool, optional
+            If True, methods and correlations are evaluated in the pool of worker processes (default is False).
+        profile : bool, optional
+            If True, time usage and size of the output of each node is measured (default is False).
+        precision : int or None, optional
+            Number of decimal places of the numeric results in the response, None for the results without rounding (default is RESULTS_PRECISION).
+        profile_memory : bool, optional
+            If True, the profile also measures the peak of allocated memory of each node, which slows down the calculation (default is False).
         """
         self.nodes = CalculationStructure._create_nodes_structure(data, locale) # array of calculationNode
+        self.plan_key = get_plan_key(data) # structural hash of the topology
+        self._index_nodes()
         self.calculation_data = [] # results calculated for each node in the structure
         self.locale = locale # app language
+        self.parallel = parallel # evaluation in worker processes
+        self.graph = None # execution graph of the nodes
+        self.profile = CalculationProfile(profile_memory) if profile else None # resources usage of the nodes
+        self.precision = precision # results are rounded only in the response
+        self.deadline = None # value of time.monotonic() after which the chunks of the calculation are not evaluated
 
     @staticmethod
     def _create_nodes_structure(data, locale):
@@ -59,14 +85,47 @@ class CalculationStructure:
                 nodes.append(CorrelationNode(**node, locale=locale))
             elif node_type == 'visualization':
                 nodes.append(VisualizationNode(**node, locale=locale))
+            elif node_type == 'sensitivity':
+                nodes.append(SensitivityNode(**node, locale=locale))
+            elif node_type == 'smaa':
+                nodes.append(SMAANode(**node, locale=locale))
             else:
                 raise ValueError(f"'{node_type}'{get_error_message(locale, 'block-type-error')} {node['id']}")
         return nodes
 
-    def _create_response(self):
+    def _index_nodes(self):
+        """
+        Builds the indexes of nodes by their id and type.
+        """
+        self.nodes_index = {} # node id -> first node with the id
+        self.types_index = {} # node type -> list of nodes in the structure order
+        for node in self.nodes:
+            self.nodes_index.setdefault(node.id, node)
+            self.types_index.setdefault(node.node_type, []).append(node)
+
+    def replace_nodes(self, nodes):
+        """
+        Replaces the nodes of the structure with the given nodes of the same id, keeping their calculated results.
+
+        Parameters
+        ----------
+        nodes : list
+            Nodes replacing the nodes with the same id.
+        """
+        replacements = {node.id: node for node in nodes}
+        self.nodes = [replacements.get(node.id, node) for node in self.nodes]
+        self._index_nodes()
+        self.graph = None
+
+    def _create_response(self, binary=False):
         """
         Creates a response from the calculated data of each node.
 
+        Parameters
+        ----------
+        binary : bool, optional
+            If True, numeric results are encoded as base64 buffers of little-endian float64 numbers (default is False).
+
         Returns
         -------
         list
@@ -74,9 +133,48 @@ class CalculationStructure:
         """
         response = []
         for node in self.nodes:
-            response.append(node.get_response())
+            response.append(node.get_response(binary, self.precision))
         return response
 
+    def get_profile(self):
+        """
+        Creates the summary of the resources usage of the nodes.
+
+        Returns
+        -------
+        dict
+            Measurements of each node for each matrix and the critical path of the calculation, or None if the profile is disabled.
+        """
+        if self.profile is None or self.graph is None:
+            return None
+
+        return self.profile.get_summary(self.graph)
+
+    def get_debug(self):
+        """
+        Creates the debug information about the calculation process.
+
+        Returns
+        -------
+        dict
+            Number of reused (hits) and calculated (misses) weights of the weights nodes,
+            and the usage statistics of the results cache shared between requests.
+        """
+        weights_nodes = self._find_node_by_type('weights')
+
+        return {
+            "weights_cache": {
+                "hits": sum([node.cache_hits for node in weights_nodes]),
+                "misses": sum([node.cache_misses for node in weights_nodes]),
+            },
+            "results_cache": {
+                "preferences": preferences_cache.get_stats(),
+                "weights": weights_cache.get_stats(),
+                "comet": comet_cache.get_stats(),
+                "plans": plans.get_stats(),
+            }
+        }
+
     def _find_node_by_id(self, id):
         """
         Finds a node by its ID.
@@ -91,8 +189,7 @@ class CalculationStructure:
         object
             The node object with the specified ID, or None if not found.
         """
-        node = [n for n in self.nodes if n.id == id]
-        return node[0] if len(node) > 0 else None    
+        return self.nodes_index.get(id)
 
     def _find_node_by_type(self, node_type, node_method = None):
         """
@@ -110,7 +207,7 @@ class CalculationStructure:
         list
             List of nodes with the specified type and method.
         """
-        node = [n for n in self.nodes if n.node_type == node_type]
+        node = list(self.types_index.get(node_type, []))
         if node_method:
             node = [n for n in node if n.method.lower() == node_method]
         return node if len(node) > 0 else [] 
@@ -160,10 +257,12 @@ class CalculationStructure:
         connections = {
             'matrix': ['weights'],
             'weights': ['method', 'correlation', 'visualization'],
-            'method': ['ranking', 'correlation'],
+            'method': ['ranking', 'correlation', 'sensitivity', 'smaa'],
             'ranking': ['correlation', 'visualization'],
             "correlation": ['visualization'],
-            "visualization": []
+            "visualization": [],
+            "sensitivity": [],
+            "smaa": []
         }
         for node in self.nodes:
             connected_nodes_types = [connected_node.node_type for connected_node in self._get_connected_nodes(node) if connected_node is not None]
@@ -173,10 +272,279 @@ class CalculationStructure:
 
         return True, ''
 
-    def calculate(self):
+    def _calculate_matrix(self, matrix_node):
+        """
+        Verifies that the matrix is connected to existing weights nodes.
+
+        Parameters
+        ----------
+        matrix_node : MatrixNode
+            The matrix node to verify.
+
+        Raises
+        ------
+        ValueError
+            If the matrix has no connections or the connected weights node is not found.
+        """
+        weights_nodes = self._get_connected_nodes(matrix_node)
+
+        if len(weights_nodes) == 0:
+            raise ValueError(f'{get_error_message(self.locale, "matrix-no-connections")} {matrix_node.id}')
+
+        for weights_node in weights_nodes:
+            if weights_node is None:
+                raise ValueError(f'{get_error_message(self.locale, "weights-not-found")} {matrix_node.id}')
+
+    def _calculate_weights(self, weights_node, matrix_node):
+        """
+        Calculates the criteria weights of the weights node for the given matrix.
+
+        Parameters
+        ----------
+        weights_node : WeightsNode
+            The weights node to calculate.
+        matrix_node : MatrixNode
+            The matrix node for which the weights are calculated.
+        """
+        # Validate input weights
+        if weights_node.method == 'INPUT':
+            validate_user_weights(self.locale, weights_node, matrix_node.extension)
+
+        weights_node.calculate(matrix_node)
+
+    def _calculate_method(self, method_node, matrix_node):
+        """
+        Calculates the preferences of the method node for the given matrix with each connected weights node.
+
+        Parameters
+        ----------
+        method_node : MethodNode
+            The method node to calculate.
+        matrix_node : MatrixNode
+            The matrix node for which the preferences are calculated.
+        """
+        weights_nodes = [weights_node for weights_node in self._get_connected_nodes(matrix_node) if method_node in self._get_connected_nodes(weights_node, node_type='method')]
+        method_node.calculate_many(matrix_node, weights_nodes, self.deadline)
+
+    def _calculate_ranking(self, ranking_node, matrix_node=None):
+        """
+        Calculates the rankings of the ranking node for the given matrix.
+
+        Parameters
+        ----------
+        ranking_node : RankingNode
+            The ranking node to calculate.
+        matrix_node : MatrixNode, optional
+            The matrix node for which the rankings are calculated (default is None for the structure with input data only).
+
+        Raises
+        ------
+        ValueError
+            If the calculated rankings have different sizes.
+        """
+        if matrix_node is None:
+            # input preferences
+            for user_pref_node in self._find_node_by_type('method', 'input'):
+                rankings_of_user_prefs = self._get_connected_nodes(user_pref_node, node_type='ranking')
+                if len(rankings_of_user_prefs) > 0 and rankings_of_user_prefs[0] is ranking_node:
+                    ranking_node.calculate(user_pref_node)
+
+            # input rankings
+            if ranking_node.method == 'input':
+                ranking_node.get_input_rank()
+            return
+
+        for weights_node in self._get_connected_nodes(matrix_node):
+            for method_node in self._get_connected_nodes(weights_node, node_type='method'):
+                if ranking_node not in self._get_connected_nodes(method_node, node_type='ranking'):
+                    continue
+
+                ranking_node.calculate(method_node, matrix_node, weights_node)
+                # for input nodes
+                ranking_connected_nodes = [input_node for input_node in self._get_connected_nodes(ranking_node, output=False) if input_node.method.lower() == 'input']
+
+                if len(set([*[len(data['ranking']) for data in ranking_node.calculation_data], *[len(input_pref.kwargs[0]['preference']) for input_pref in ranking_connected_nodes]])) > 1:
+                    raise ValueError(f'{get_error_message(self.locale, "ranking-calculation-size")}')
+
+                for input_ranking_node in ranking_connected_nodes:
+                    if input_ranking_node.id not in self.calculated_input_ranks_id:
+                        self.calculated_input_ranks_id.append(input_ranking_node.id)
+                        RankingNode.calculate_input(input_ranking_node, ranking_node, matrix_node.id)
+
+    def _calculate_node(self, node, matrix_node=None):
+        """
+        Evaluates the node for the given matrix.
+
+        Parameters
+        ----------
+        node : Node
+            The node to evaluate.
+        matrix_node : MatrixNode, optional
+            The matrix node for which the node is evaluated (default is None for the structure with input data only).
+        """
+        if node.node_type == 'matrix':
+            self._calculate_matrix(node)
+        elif node.node_type == 'weights':
+            self._calculate_weights(node, matrix_node)
+        elif node.node_type == 'method':
+            if matrix_node is None:
+                node.calculate(None, None)
+            else:
+                self._calculate_method(node, matrix_node)
+        elif node.node_type == 'ranking':
+            self._calculate_ranking(node, matrix_node)
+        elif node.node_type == 'correlation':
+            connected_nodes = self._get_connected_nodes(node, output=False)
+            node.calculate(connected_nodes, matrix_node)
+        elif node.node_type == 'visualization':
+            connected_nodes = self._get_connected_nodes(node, output=False)
+            node.generate(connected_nodes, matrix_node)
+        elif node.node_type == 'sensitivity':
+            connected_nodes = self._get_connected_nodes(node, node_type='method', output=False)
+            node.calculate(connected_nodes, matrix_node, self.deadline)
+        elif node.node_type == 'smaa':
+            # chunks of samples are evaluated in the worker processes
+            connected_nodes = self._get_connected_nodes(node, node_type='method', output=False)
+            node.calculate(connected_nodes, matrix_node, map_jobs if self.parallel else None, self.deadline)
+
+    def _evaluate_task(self, node, matrix_node=None):
+        """
+        Evaluates the node for the given matrix, measuring its resources usage if the profile is enabled.
+
+        Parameters
+        ----------
+        node : Node
+            The node to evaluate.
+        matrix_node : MatrixNode, optional
+            The matrix node for which the node is evaluated (default is None).
+        """
+        if self.profile is not None:
+            self.profile.measure(node, matrix_node, self._calculate_node, node, matrix_node)
+        else:
+            self._calculate_node(node, matrix_node)
+
+    def _calculate_level_parallel(self, level):
+        """
+        Evaluates the level of independent tasks, sending the methods and correlations to the worker processes.
+
+        The preferences cache is looked up and filled in the server process, as the caches of the worker processes are not shared.
+
+        Parameters
+        ----------
+        level : list
+            List of (node, matrix_node) tasks independent of each other.
+        """
+        jobs, owners, results = [], [], []
+
+        def add_job(node, matrix_node, function, args):
+            jobs.append((function, args))
+            owners.append((node, matrix_node))
+            return len(jobs) - 1
+
+        for node, matrix_node in level:
+            if node.node_type == 'method' and matrix_node is not None and node.method != 'INPUT':
+                rank = len(self._get_connected_nodes(node, node_type='ranking')) > 0
+                weights_nodes = [weights_node for weights_node in self._get_connected_nodes(matrix_node) if node in self._get_connected_nodes(weights_node, node_type='method')]
+                criteria_weights = [weights_node.calculate(matrix_node) for weights_node in weights_nodes]
+                keys = [get_preferences_key(node.method, node.extension, node.kwargs, matrix_node, weights) for weights in criteria_weights]
+                lookup = lambda keys: [preferences_cache.get(key) for key in keys]
+                prefs = lookup(keys) if self.profile is None else self.profile.measure(node, matrix_node, lookup, keys)
+                # (key, job index, position in the batch job results, cached result) for each weights node
+                outputs = [(key, None, None, None if pref is None else (pref.copy(), None)) for key, pref in zip(keys, prefs)]
+                missing = [idx for idx, output in enumerate(outputs) if output[3] is None]
+
+                missing_weights = [criteria_weights[idx] for idx in missing]
+                if len(missing) > 0 and is_batch_evaluation(node.method, matrix_node, missing_weights):
+                    job = add_job(node, matrix_node, calculate_method_batch_job, (node.method, node.extension, node.kwargs, matrix_node, missing_weights, self.locale, rank, node.resolved.get(matrix_node.id), self.deadline))
+                    for position, idx in enumerate(missing):
+                        outputs[idx] = (keys[idx], job, position, None)
+                else:
+                    for idx in missing:
+                        job = add_job(node, matrix_node, calculate_method_job, (node.method, node.extension, node.kwargs, matrix_node, criteria_weights[idx], self.locale, rank, node.resolved.get(matrix_node.id), self.deadline))
+                        outputs[idx] = (keys[idx], job, None, None)
+                results.append((node, matrix_node, weights_nodes, outputs))
+            elif node.node_type == 'correlation':
+                connected_nodes = self._get_connected_nodes(node, output=False)
+                for corr_data, corr_labels in node.prepare(connected_nodes, matrix_node):
+                    job = add_job(node, matrix_node, calculate_correlation_job, (corr_data, node.method, self.locale))
+                    results.append((node, matrix_node, corr_labels, job))
+            else:
+                self._evaluate_task(node, matrix_node)
+
+        if self.profile is not None:
+            jobs = [(partial(measure, memory=self.profile.memory), (function, *args)) for function, args in jobs]
+
+        job_results = map_jobs(jobs)
+        if self.profile is not None:
+            for (node, matrix_node), (result, stats) in zip(owners, job_results):
+                self.profile.add(node, matrix_node, stats)
+            job_results = [result for result, stats in job_results]
+
+        for node, matrix_node, item, output in results:
+            if node.node_type == 'method':
+                for weights_node, (key, job, position, result) in zip(item, output):
+                    if result is None:
+                        # batch job returns the list of results for all missing weights nodes
+                        result = job_results[job] if position is None else job_results[job][position]
+                        # results of the out-of-core evaluation are not kept in memory
+                        if not isinstance(matrix_node.matrix, np.memmap):
+                            preferences_cache.set(key, result[0].copy())
+                    pref, ranking = result
+                    node.add_result(matrix_node, weights_node, pref, ranking)
+            else:
+                node.add_result(matrix_node, job_results[output], item)
+
+    def build_graph(self):
+        """
+        Validates the connections between nodes and builds the execution graph of the structure.
+
+        The graph is compiled into the plan cached by the structural hash of the topology,
+        so the structures with the same topology skip the validation and use the method objects resolved before.
+
+        Raises
+        ------
+        ValueError
+            If the connections are invalid or contain a cycle.
+
+        Returns
+        -------
+        CalculationGraph
+            The execution graph of the structure.
+        """
+        plan = plans.get(self.plan_key)
+        if plan is None:
+            # Validate connections
+            flag, message = self._validate_connections()
+            if not flag:
+                raise ValueError(f'{get_error_message(self.locale, "connection-structure-error")} ({message[0]}, {message[1]})')
+
+            self.graph = CalculationGraph(self)
+            plan = CalculationPlan(self, self.graph)
+            plans.set(self.plan_key, plan)
+        else:
+            self.graph = CalculationGraph(self, plan)
+
+        for node in self._find_node_by_type('method'):
+            node.resolved = {}
+        for (position, matrix_id), resolved in plan.methods.items():
+            self.nodes[position].resolved[matrix_id] = resolved
+
+        return self.graph
+
+    def calculate(self, nodes_ids=None, binary=False):
         """
         Executes the calculation process for the structure.
 
+        The nodes are evaluated in the topological order of their connections,
+        each node once for each matrix it is reachable from.
+
+        Parameters
+        ----------
+        nodes_ids : list, optional
+            Ids of nodes to evaluate, other nodes keep their results (default is None for all nodes).
+        binary : bool, optional
+            If True, numeric results are encoded as base64 buffers of little-endian float64 numbers (default is False).
+
         Raises
         ------
         ValueError
@@ -185,106 +553,66 @@ class CalculationStructure:
         Returns
         -------
         list
-            The calculation results.
-        """
-        # Validate connections
-        flag, message = self._validate_connections()
-        if not flag:
-            raise ValueError(f'{get_error_message(self.locale, "connection-structure-error")} ({message[0]}, {message[1]})')
-
-        # first step - get matrices
-        matrix_nodes = self._find_node_by_type('matrix')
-
-        if len(matrix_nodes) > 0:
-            calculated_input_ranks_id = []
-
-            # second step - get weights for matrices
-            for matrix_node in matrix_nodes:
-                
-                weights_nodes = self._get_connected_nodes(matrix_node)
-
-                if len(weights_nodes) == 0:
-                    raise ValueError(f'{get_error_message(self.locale, "matrix-no-connections")} {matrix_node.id}')
-
-                for weights_node in weights_nodes:
-                    if weights_node is None:
-                        raise ValueError(f'{get_error_message(self.locale, "weights-not-found")} {matrix_node.id}')
-                    
-                    # Validate input weights
-                    if weights_node.method == 'INPUT':
-                        validate_user_weights(self.locale, weights_node, matrix_node.extension)
-                    
-                    methods_nodes = self._get_connected_nodes(weights_node, node_type='method')
-                
-                    # only weights given
-                    if len(methods_nodes) == 0:
-                        weights_node.calculate(matrix_node)
-                    else:
-                        # third step - calculate preferences
-                        for method_node_idx, method_node in enumerate(methods_nodes):
-                            if method_node is None:
-                                raise ValueError(f'{get_error_message(self.locale, "method-not-found")} {weights_node.connections_to[method_node_idx]}')
-                            
-                            method_node.calculate(matrix_node, weights_node)
-
-                            # fourth.one step - calculate ranking
-                            ranking_nodes = self._get_connected_nodes(method_node, node_type='ranking')
-
-                            for ranking_node_idx, ranking_node in enumerate(ranking_nodes):
-                                if ranking_node is None:
-                                    raise ValueError(f'{get_error_message(self.locale, "ranking-not-found")} {matrix_node.connections_to[ranking_node_idx]}')
-                                
-                                ranking_node.calculate(method_node, matrix_node, weights_node)
-                                # for input nodes
-                                ranking_connected_nodes = [input_node for input_node in self._get_connected_nodes(ranking_node, output=False) if input_node.method.lower() == 'input']
-
-                                if len(set([*[len(data['ranking']) for data in ranking_node.calculation_data], *[len(input_pref.kwargs[0]['preference']) for input_pref in ranking_connected_nodes]])) > 1:
-                                    raise ValueError(f'{get_error_message(self.locale, "ranking-calculation-size")}')
-
-                                if len(ranking_connected_nodes) > 0:
-                                    for input_ranking_node in ranking_connected_nodes:
-                                        if input_ranking_node.id not in calculated_input_ranks_id:
-                                            calculated_input_ranks_id.append(input_ranking_node.id)
-                                            RankingNode.calculate_input(input_ranking_node, ranking_node, matrix_node.id)
-
-                            
-                # CORRELATION FROM MATRIX
-                correlation_nodes = self._find_node_by_type('correlation')
-                for correlation_node in correlation_nodes:
-                    connected_nodes = self._get_connected_nodes(correlation_node, output=False)
-                    correlation_node.calculate(connected_nodes, matrix_node)
-
-                # VISUALIZATIONS FROM MATRIX
-                visualization_nodes = self._find_node_by_type('visualization')
-                for visualization_node in visualization_nodes:
-                    connected_nodes = self._get_connected_nodes(visualization_node, output=False)
-
-                    visualization_node.generate(connected_nodes, matrix_node)
+            The calculation results of the evaluated nodes.
+        """
+        graph = self.graph if self.graph is not None else self.build_graph()
+        self.calculated_input_ranks_id = []
+
+        if self.parallel:
+            for level in graph.levels:
+                level = [(node, matrix_node) for node, matrix_node in level if nodes_ids is None or node.id in nodes_ids]
+                self._calculate_level_parallel(level)
         else:
-            # input preferences
-            user_prefs_nodes = self._find_node_by_type('method', 'input')
-            for user_pref_node in user_prefs_nodes:
-                user_pref_node.calculate(None, None)
-                rankings_of_user_prefs = self._get_connected_nodes(user_pref_node, node_type='ranking') 
-                if len(rankings_of_user_prefs) > 0:
-                    rankings_of_user_prefs[0].calculate(user_pref_node)
+            for node, matrix_node in graph.tasks:
+                if nodes_ids is None or node.id in nodes_ids:
+                    self._evaluate_task(node, matrix_node)
 
-            # input rankings
-            user_ranks_nodes = self._find_node_by_type('ranking', 'input')
-            for user_rank_node in user_ranks_nodes:
-                user_rank_node.get_input_rank()
-
-            # CORRELATION
-            correlation_nodes = self._find_node_by_type('correlation')
-            for correlation_node in correlation_nodes:
-                connected_nodes = self._get_connected_nodes(correlation_node, output=False)
-                correlation_node.calculate(connected_nodes)
-
-            # VISUALIZATION
-            visualization_nodes = self._find_node_by_type('visualization')
-            for visualization_node in visualization_nodes:
-                connected_nodes = self._get_connected_nodes(visualization_node, output=False)
-                visualization_node.generate(connected_nodes)
-
-        response = self._create_response()
-        return response
\ No newline at end of file
+        if nodes_ids is not None:
+            return [node.get_response(binary, self.precision) for node in self.nodes if node.id in nodes_ids]
+
+        response = self._create_response(binary)
+        return response
+
+    def calculate_stream(self):
+        """
+        Executes the calculation process for the structure, yielding the response of each node as soon as it is final.
+
+        The node is final when it was evaluated for all matrices it is reachable from.
+        Results of visualization nodes are released after yielding, as no other node depends on them.
+
+        Raises
+        ------
+        ValueError
+            If any validation or calculation error occurs.
+
+        Yields
+        ------
+        dict
+            The calculation results of the node.
+        """
+        graph = self.graph if self.graph is not None else self.build_graph()
+        self.calculated_input_ranks_id = []
+
+        def get_final_response(node):
+            response = node.get_response(precision=self.precision)
+            if node.node_type == 'visualization':
+                node.calculation_data = []
+            return response
+
+        if self.parallel:
+            remaining = {node.id: len(graph.matrices[node.id]) for node in graph.order}
+            for node in graph.order:
+                if remaining[node.id] == 0:
+                    yield get_final_response(node)
+
+            for level in graph.levels:
+                self._calculate_level_parallel(level)
+                for node, _ in level:
+                    remaining[node.id] -= 1
+                    if remaining[node.id] == 0:
+                        yield get_final_response(node)
+        else:
+            for node in graph.order:
+                for matrix_node in graph.matrices[node.id]:
+                    self._evaluate_task(node, matrix_node)
+                yield get_final_response(node)
@@ -1,4 +1,62 @@
 # Copyright (c) 2023 - 2024 Jakub Więckowski
 
+import os
+import tempfile
+
 dir_path = './'
 REQUEST_TIMEOUT = 300 # in seconds
+
+# PARALLEL CALCULATIONS
+POOL_WORKERS = os.cpu_count() or 1 # number of worker processes
+POOL_REQUEST_LIMIT = 4 # maximum number of jobs of a single request evaluated at the same time
+
+# RESULTS CACHE
+CACHE_SIZE = 1024 # maximum number of results stored for each of the MCDA and weighting methods
+CACHE_TTL = 3600 # in seconds
+COMET_CACHE_SIZE = 64 # maximum number of fitted COMET models
+PLAN_CACHE_SIZE = 256 # maximum number of compiled execution plans of the structures
+
+# MATRIX STORE
+MATRIX_STORE_MEMORY = 256 * 1024 * 1024 # maximum size in bytes of the uploaded and generated matrices kept in memory
+MATRIX_STORE_FILES = 1000 # maximum number of matrices spilled to files
+MATRIX_STORE_DIR = os.path.join(tempfile.gettempdir(), 'makedecision-matrices') # directory of the matrices spilled to files
+MATRIX_STORE_MMAP_SIZE = 64 * 1024 * 1024 # size in bytes above which the matrices are kept only in files and opened as read-only memory maps
+
+# OUT-OF-CORE EVALUATION
+OUT_OF_CORE_CHUNK_SIZE = 1000000 # maximum number of values (rows x criteria) of the memory-mapped matrix evaluated at once
+
+# CALCULATION RESULTS
+RESULTS_PRECISION = 3 # default number of decimal places of the numeric results in the response
+RESULTS_PRECISION_LIMIT = 15 # maximum number of decimal places of the numeric results
+
+# CALCULATION SESSIONS
+SESSIONS_LIMIT = 100 # maximum number of stored sessions
+SESSIONS_TTL = 3600 # in seconds, since the last use of the session
+
+# BATCH CALCULATIONS
+BATCH_LIMIT = 500 # maximum number of structures evaluated in a single request
+
+# CALCULATION JOBS
+JOBS_WORKERS = 2 # number of threads evaluating the queued jobs
+JOBS_TIMEOUT_LIMIT = 3600 # maximum time budget of a job in seconds, REQUEST_TIMEOUT is used by default
+JOBS_RETENTION = 600 # time in seconds for which results of finished jobs are kept
+JOBS_LIMIT = 100 # maximum number of queued, running and retained jobs, new jobs are rejected above the limit
+
+# SENSITIVITY ANALYSIS
+SENSITIVITY_SAMPLES = 1000 # default number of sampled vectors of criteria weights
+SENSITIVITY_SAMPLES_LIMIT = 1000000 # maximum number of sampled vectors of criteria weights
+SENSITIVITY_CHUNK_SIZE = 2000000 # maximum number of values (samples x alternatives x criteria) evaluated at once
+
+# SMAA
+SMAA_SAMPLES = 10000 # default number of sampled vectors of criteria weights
+SMAA_SAMPLES_LIMIT = 1000000 # maximum number of sampled vectors of criteria weights
+SMAA_CHUNK_SAMPLES = 2000 # maximum number of samples evaluated in a single chunk
+SMAA_CHUNK_SIZE = 1000000 # maximum number of values (samples x alternatives x criteria) evaluated in a single chunk
+
+# CORRELATIONS
+CORRELATION_CHUNK_SIZE = 1000000 # maximum number of values (pairs of rows x row length) evaluated at once
+
+# COMET MODELS
+COMET_MODELS_LIMIT = 100 # maximum number of stored fitted models
+COMET_MODELS_TTL = 3600 # in seconds, since the last use of the model
+COMET_CHUNK_SIZE = 1000000 # maximum number of values (alternatives x characteristic objects) evaluated at once
@@ -18,3 +18,13 @@ def validate_locale(locale):
     if locale in valid:
         return locale
     return 'en'
+
+def init_worker():
+    """
+    Prepares the worker process for the parallel calculations.
+
+    Only the calculation modules are imported, without the routes of the server,
+    so the calculation packages (pymcdm, pyfdm) are already loaded when the first job arrives.
+    """
+    import methods
+    import calculations
@@ -1,3 +1,8 @@
-from .correlations import correlation_methods
+from .correlations import correlation_methods, correlation_kernels
 from .mcda import mcda_methods
+from .batch import mcda_batch_methods
+from .chunked import mcda_chunked_methods
+from .kernels import mcda_kernels
+from .sensitivity import perturbation_methods
+from .smaa import weights_distributions
 from .weights import weights_methods
\ No newline at end of file
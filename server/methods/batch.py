@@ -0,0 +1,165 @@
+# Copyright (C) Jakub Więckowski 2024
+
+import numpy as np
+from pymcdm import helpers, normalizations
+
+from .kernels import topsis_preferences, vikor_preferences, wpm_preferences, wsm_preferences
+
+# The single normalized matrix is evaluated with the kernels of the stack of matrices, broadcast to all vectors of weights.
+
+def _normalize(method_obj, matrix, types, default_normalization):
+    """
+    Normalizes the decision matrix in the same way as the MCDA method object.
+
+    Parameters
+    ----------
+    method_obj : object
+        The crisp MCDA method object with the normalization function.
+    matrix : ndarray
+        Decision matrix (m x n).
+    types : ndarray
+        Criteria types.
+    default_normalization : callable
+        Normalization used by the method when the normalization function is None.
+
+    Returns
+    -------
+    ndarray
+        Normalized decision matrix (m x n).
+    """
+    normalization = method_obj.normalization if method_obj.normalization is not None else default_normalization
+    return helpers.normalize_matrix(matrix, normalization, types)
+
+def topsis_batch(method_obj, matrix, weights, types):
+    """
+    Calculates the TOPSIS preferences for each vector of criteria weights.
+
+    Parameters
+    ----------
+    method_obj : TOPSIS
+        The TOPSIS object with the normalization function.
+    matrix : ndarray
+        Decision matrix (m x n).
+    weights : ndarray
+        Vectors of criteria weights (k x n).
+    types : ndarray
+        Criteria types.
+
+    Returns
+    -------
+    ndarray
+        Preferences of alternatives for each vector of weights (k x m).
+    """
+    nmatrix = _normalize(method_obj, matrix, types, normalizations.minmax_normalization)
+    return topsis_preferences(nmatrix[np.newaxis], weights)
+
+def wsm_batch(method_obj, matrix, weights, types):
+    """
+    Calculates the WSM preferences for each vector of criteria weights.
+
+    Parameters
+    ----------
+    method_obj : WSM
+        The WSM object with the normalization function.
+    matrix : ndarray
+        Decision matrix (m x n).
+    weights : ndarray
+        Vectors of criteria weights (k x n).
+    types : ndarray
+        Criteria types.
+
+    Returns
+    -------
+    ndarray
+        Preferences of alternatives for each vector of weights (k x m).
+    """
+    nmatrix = _normalize(method_obj, matrix, types, normalizations.sum_normalization)
+    return wsm_preferences(nmatrix[np.newaxis], weights)
+
+def wpm_batch(method_obj, matrix, weights, types):
+    """
+    Calculates the WPM preferences for each vector of criteria weights.
+
+    Parameters
+    ----------
+    method_obj : WPM
+        The WPM object with the normalization function.
+    matrix : ndarray
+        Decision matrix (m x n).
+    weights : ndarray
+        Vectors of criteria weights (k x n).
+    types : ndarray
+        Criteria types.
+
+    Returns
+    -------
+    ndarray
+        Preferences of alternatives for each vector of weights (k x m).
+    """
+    nmatrix = _normalize(method_obj, matrix, types, normalizations.sum_normalization)
+    return wpm_preferences(nmatrix[np.newaxis], weights)
+
+def vikor_batch(method_obj, matrix, weights, types, v=0.5):
+    """
+    Calculates the VIKOR Q preferences for each vector of criteria weights.
+
+    Parameters
+    ----------
+    method_obj : VIKOR
+        The VIKOR object with the normalization function.
+    matrix : ndarray
+        Decision matrix (m x n).
+    weights : ndarray
+        Vectors of criteria weights (k x n).
+    types : ndarray
+        Criteria types.
+    v : float, optional
+        Weight of the strategy (default is 0.5).
+
+    Raises
+    ------
+    ValueError
+        If any criterion contains equal values for all alternatives.
+
+    Returns
+    -------
+    ndarray
+        Q preferences of alternatives for each vector of weights (k x m).
+    """
+    nmatrix = helpers.normalize_matrix(matrix, method_obj.normalization, types)
+    return vikor_preferences(nmatrix[np.newaxis], weights, v)
+
+def mabac_batch(method_obj, matrix, weights, types):
+    """
+    Calculates the MABAC preferences for each vector of criteria weights.
+
+    Parameters
+    ----------
+    method_obj : MABAC
+        The MABAC object with the normalization function.
+    matrix : ndarray
+        Decision matrix (m x n).
+    weights : ndarray
+        Vectors of criteria weights (k x n).
+    types : ndarray
+        Criteria types.
+
+    Returns
+    -------
+    ndarray
+        Preferences of alternatives for each vector of weights (k x m).
+    """
+    nmatrix = _normalize(method_obj, matrix, types, normalizations.minmax_normalization)
+    n = nmatrix.shape[0]
+    weighted_matrix = (nmatrix + 1) * weights[:, np.newaxis, :]
+    G = np.prod(weighted_matrix, axis=1, keepdims=True) ** (1 / n)
+    return np.sum(weighted_matrix - G, axis=2)
+
+# crisp methods evaluated for many vectors of criteria weights at once
+mcda_batch_methods = {
+    'MABAC': mabac_batch,
+    'TOPSIS': topsis_batch,
+    'VIKOR': vikor_batch,
+    'WPM': wpm_batch,
+    'WSM': wsm_batch,
+}
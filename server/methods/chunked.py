@@ -0,0 +1,331 @@
+# Copyright (C) Jakub Więckowski 2024
+
+import numpy as np
+from pymcdm import normalizations
+
+# The chunked methods evaluate decision matrices which are not loaded into memory at once (e.g. memory-mapped files).
+# Statistics of the criteria are accumulated in a single pass over the rows, then the preferences are calculated
+# for each chunk of rows and written to the output array. Preferences are equal to the preferences of the method objects
+# with default parameters, up to the rounding of the sums accumulated chunk by chunk.
+
+def _row_chunks(matrix, chunk_size):
+    """
+    Splits the decision matrix into the chunks of rows.
+
+    Parameters
+    ----------
+    matrix : ndarray
+        Decision matrix (m x n).
+    chunk_size : int
+        Maximum number of values (rows x criteria) in a single chunk.
+
+    Returns
+    -------
+    list
+        Slices of the rows of each chunk.
+    """
+    step = max(1, chunk_size // max(1, matrix.shape[1]))
+    return [slice(start, start + step) for start in range(0, matrix.shape[0], step)]
+
+def column_statistics(matrix, chunk_size):
+    """
+    Calculates the statistics of the criteria in a single pass over the chunks of rows.
+
+    Parameters
+    ----------
+    matrix : ndarray
+        Decision matrix (m x n).
+    chunk_size : int
+        Maximum number of values (rows x criteria) evaluated at once.
+
+    Returns
+    -------
+    dict
+        Minimum, maximum, sum, sum of inverses and sum of squares of the values of each criterion (n).
+    """
+    n = matrix.shape[1]
+    stats = {
+        'min': np.full(n, np.inf),
+        'max': np.full(n, -np.inf),
+        'sum': np.zeros(n),
+        'inverse_sum': np.zeros(n),
+        'square_sum': np.zeros(n),
+    }
+
+    for rows in _row_chunks(matrix, chunk_size):
+        chunk = np.asarray(matrix[rows], dtype=float)
+        stats['min'] = np.minimum(stats['min'], np.min(chunk, axis=0))
+        stats['max'] = np.maximum(stats['max'], np.max(chunk, axis=0))
+        stats['sum'] += np.sum(chunk, axis=0)
+        with np.errstate(divide='ignore'):
+            stats['inverse_sum'] += np.sum(1 / chunk, axis=0)
+        stats['square_sum'] += np.sum(chunk ** 2, axis=0)
+
+    return stats
+
+def _minmax_normalization(chunk, types, stats):
+    """
+    Normalizes the chunk of rows with the min-max method and the statistics of the whole matrix.
+    """
+    xmin, xmax = stats['min'], stats['max']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        nchunk = np.where(types == 1, (chunk - xmin) / (xmax - xmin), (xmax - chunk) / (xmax - xmin))
+    return np.where(xmin == xmax, 1.0, nchunk)
+
+def _sum_normalization(chunk, types, stats):
+    """
+    Normalizes the chunk of rows with the sum method and the statistics of the whole matrix.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(types == 1, chunk / stats['sum'], (1 / chunk) / stats['inverse_sum'])
+
+def topsis_chunked(method_obj, matrix, weights, types, out, chunk_size):
+    """
+    Calculates the TOPSIS preferences for the chunks of rows of the decision matrix.
+
+    Parameters
+    ----------
+    method_obj : TOPSIS
+        The TOPSIS object with the min-max normalization.
+    matrix : ndarray
+        Decision matrix (m x n).
+    weights : ndarray
+        Criteria weights (n).
+    types : ndarray
+        Criteria types (n).
+    out : ndarray
+        Output array for the preferences (m).
+    chunk_size : int
+        Maximum number of values (rows x criteria) evaluated at once.
+
+    Returns
+    -------
+    ndarray
+        Preferences of alternatives written to the output array (m).
+    """
+    stats = column_statistics(matrix, chunk_size)
+
+    # ideal solutions are the normalized extreme values of each criterion
+    extremes = _minmax_normalization(np.stack([stats['min'], stats['max']]), types, stats) * weights
+    pis, nis = np.max(extremes, axis=0), np.min(extremes, axis=0)
+
+    for rows in _row_chunks(matrix, chunk_size):
+        weighted_chunk = _minmax_normalization(np.asarray(matrix[rows], dtype=float), types, stats) * weights
+        Dp = np.sqrt(np.sum((weighted_chunk - pis) ** 2, axis=1))
+        Dm = np.sqrt(np.sum((weighted_chunk - nis) ** 2, axis=1))
+        out[rows] = Dm / (Dm + Dp)
+
+    return out
+
+def wsm_chunked(method_obj, matrix, weights, types, out, chunk_size):
+    """
+    Calculates the WSM preferences for the chunks of rows of the decision matrix.
+
+    Parameters
+    ----------
+    method_obj : WSM
+        The WSM object with the sum normalization.
+    matrix : ndarray
+        Decision matrix (m x n).
+    weights : ndarray
+        Criteria weights (n).
+    types : ndarray
+        Criteria types (n).
+    out : ndarray
+        Output array for the preferences (m).
+    chunk_size : int
+        Maximum number of values (rows x criteria) evaluated at once.
+
+    Returns
+    -------
+    ndarray
+        Preferences of alternatives written to the output array (m).
+    """
+    stats = column_statistics(matrix, chunk_size)
+
+    for rows in _row_chunks(matrix, chunk_size):
+        out[rows] = np.sum(_sum_normalization(np.asarray(matrix[rows], dtype=float), types, stats) * weights, axis=1)
+
+    return out
+
+def wpm_chunked(method_obj, matrix, weights, types, out, chunk_size):
+    """
+    Calculates the WPM preferences for the chunks of rows of the decision matrix.
+
+    Parameters
+    ----------
+    method_obj : WPM
+        The WPM object with the sum normalization.
+    matrix : ndarray
+        Decision matrix (m x n).
+    weights : ndarray
+        Criteria weights (n).
+    types : ndarray
+        Criteria types (n).
+    out : ndarray
+        Output array for the preferences (m).
+    chunk_size : int
+        Maximum number of values (rows x criteria) evaluated at once.
+
+    Returns
+    -------
+    ndarray
+        Preferences of alternatives written to the output array (m).
+    """
+    stats = column_statistics(matrix, chunk_size)
+
+    for rows in _row_chunks(matrix, chunk_size):
+        out[rows] = np.prod(_sum_normalization(np.asarray(matrix[rows], dtype=float), types, stats) ** weights, axis=1)
+
+    return out
+
+def moora_chunked(method_obj, matrix, weights, types, out, chunk_size):
+    """
+    Calculates the MOORA preferences for the chunks of rows of the decision matrix.
+
+    Parameters
+    ----------
+    method_obj : MOORA
+        The MOORA object.
+    matrix : ndarray
+        Decision matrix (m x n).
+    weights : ndarray
+        Criteria weights (n).
+    types : ndarray
+        Criteria types (n).
+    out : ndarray
+        Output array for the preferences (m).
+    chunk_size : int
+        Maximum number of values (rows x criteria) evaluated at once.
+
+    Raises
+    ------
+    ValueError
+        If all criteria are profit criteria.
+
+    Returns
+    -------
+    ndarray
+        Preferences of alternatives written to the output array (m).
+    """
+    if np.all(types == 1.0):
+        raise ValueError('types array contains only profit criteria. MOORA method requires at least one cost '
+                         'criteria.')
+
+    norm = np.sqrt(column_statistics(matrix, chunk_size)['square_sum'])
+
+    for rows in _row_chunks(matrix, chunk_size):
+        weighted_chunk = np.asarray(matrix[rows], dtype=float) / norm * weights
+        out[rows] = np.sum(weighted_chunk[:, types == 1], axis=1) - np.sum(weighted_chunk[:, types == -1], axis=1)
+
+    return out
+
+def spotis_chunked(method_obj, matrix, weights, types, out, chunk_size):
+    """
+    Calculates the SPOTIS preferences for the chunks of rows of the decision matrix.
+
+    The distances to the expected solution point depend only on the bounds of the method, so no statistics are needed.
+
+    Parameters
+    ----------
+    method_obj : SPOTIS
+        The SPOTIS object with the bounds and the optional expected solution point.
+    matrix : ndarray
+        Decision matrix (m x n).
+    weights : ndarray
+        Criteria weights (n).
+    types : ndarray
+        Criteria types (n).
+    out : ndarray
+        Output array for the preferences (m).
+    chunk_size : int
+        Maximum number of values (rows x criteria) evaluated at once.
+
+    Returns
+    -------
+    ndarray
+        Preferences of alternatives written to the output array (m).
+    """
+    bounds = method_obj.bounds
+    esp = method_obj.esp
+    if esp is None:
+        esp = bounds[np.arange(bounds.shape[0]), ((types + 1) // 2).astype('int')]
+
+    for rows in _row_chunks(matrix, chunk_size):
+        out[rows] = np.sum(np.abs((np.asarray(matrix[rows], dtype=float) - esp) / (bounds[:, 0] - bounds[:, 1])) * weights, axis=1)
+
+    return out
+
+def copras_chunked(method_obj, matrix, weights, types, out, chunk_size):
+    """
+    Calculates the COPRAS preferences for the chunks of rows of the decision matrix.
+
+    Sums of the weighted cost criteria are aggregated in the second pass over the rows,
+    and the relative significances are scaled by their maximum in the output array.
+
+    Parameters
+    ----------
+    method_obj : COPRAS
+        The COPRAS object.
+    matrix : ndarray
+        Decision matrix (m x n).
+    weights : ndarray
+        Criteria weights (n).
+    types : ndarray
+        Criteria types (n).
+    out : ndarray
+        Output array for the preferences (m).
+    chunk_size : int
+        Maximum number of values (rows x criteria) evaluated at once.
+
+    Raises
+    ------
+    ValueError
+        If all criteria are profit criteria.
+
+    Returns
+    -------
+    ndarray
+        Preferences of alternatives written to the output array (m).
+    """
+    if np.all(types == 1.0):
+        raise ValueError('types array contains only profit criteria. COPRAS method requires at least one cost '
+                         'criteria.')
+
+    sums = column_statistics(matrix, chunk_size)['sum']
+    chunks = _row_chunks(matrix, chunk_size)
+
+    def weighted_sums(rows):
+        weighted_chunk = np.asarray(matrix[rows], dtype=float) / sums * weights
+        return np.sum(weighted_chunk[:, types == 1], axis=1), np.sum(weighted_chunk[:, types == -1], axis=1)
+
+    Smin, Ssum, Sinverse = np.inf, 0.0, 0.0
+    for rows in chunks:
+        _, Sm = weighted_sums(rows)
+        Smin = min(Smin, np.min(Sm))
+        Ssum += np.sum(Sm)
+        with np.errstate(divide='ignore'):
+            Sinverse += np.sum(1 / Sm)
+
+    Qmax = -np.inf
+    for rows in chunks:
+        Sp, Sm = weighted_sums(rows)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            out[rows] = Sp + ((Smin * Ssum) / (Sm * Smin * Sinverse))
+        Qmax = max(Qmax, np.max(out[rows]))
+
+    for rows in chunks:
+        out[rows] = out[rows] / Qmax
+
+    return out
+
+# crisp methods evaluated for the chunks of rows of the memory-mapped decision matrix,
+# with the normalization function used by the method object with default parameters
+mcda_chunked_methods = {
+    'COPRAS': (copras_chunked, None),
+    'MOORA': (moora_chunked, None),
+    'SPOTIS': (spotis_chunked, None),
+    'TOPSIS': (topsis_chunked, normalizations.minmax_normalization),
+    'WPM': (wpm_chunked, normalizations.sum_normalization),
+    'WSM': (wsm_chunked, normalizations.sum_normalization),
+}
@@ -0,0 +1,135 @@
+# Copyright (C) Jakub Więckowski 2024
+
+import time
+import numpy as np
+
+def comet_memberships(values, cvalues):
+    """
+    Calculates the membership of the values in the Triangular Fuzzy Numbers spanned on the characteristic values.
+
+    Parameters
+    ----------
+    values : ndarray
+        Values of the criterion for each alternative (a).
+    cvalues : ndarray
+        Characteristic values of the criterion in ascending order (k).
+
+    Returns
+    -------
+    ndarray
+        Memberships of the values in the fuzzy numbers of each characteristic value (a x k).
+    """
+    lower = np.concatenate([cvalues[:1], cvalues[:-1]])
+    upper = np.concatenate([cvalues[1:], cvalues[-1:]])
+    x = values[:, np.newaxis]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        left = (x - lower) / (cvalues - lower)
+        right = (upper - x) / (upper - cvalues)
+
+    return np.where(x == cvalues, 1.0, np.where((x > lower) & (x < cvalues), left, np.where((x < upper) & (x > cvalues), right, 0.0)))
+
+def comet_inference(alternatives, cvalues, preferences, chunk_size):
+    """
+    Calculates the preferences of alternatives with the rule base of the fitted COMET model.
+
+    The preferences of characteristic objects are contracted with the memberships of one criterion at a time,
+    for the chunks of alternatives, so the rules are never evaluated one by one.
+
+    Parameters
+    ----------
+    alternatives : ndarray
+        Decision matrix with the evaluated alternatives (a x n).
+    cvalues : list
+        Characteristic values of each criterion (n arrays).
+    preferences : ndarray
+        Preferences of characteristic objects, in the order of the Cartesian product of the characteristic values.
+    chunk_size : int
+        Maximum number of values (alternatives x characteristic objects) evaluated at once.
+
+    Returns
+    -------
+    ndarray
+        Preferences of alternatives (a).
+    """
+    shape = [cv.shape[0] for cv in cvalues]
+    rules = preferences.reshape(shape[0], -1)
+    step = max(1, chunk_size // preferences.shape[0])
+
+    result = np.empty(alternatives.shape[0])
+    for start in range(0, alternatives.shape[0], step):
+        chunk = alternatives[start:start + step]
+        values = comet_memberships(chunk[:, 0], cvalues[0]) @ rules
+        for idx in range(1, len(cvalues)):
+            values = np.einsum('akr,ak->ar', values.reshape(chunk.shape[0], shape[idx], -1), comet_memberships(chunk[:, idx], cvalues[idx]))
+        result[start:start + step] = values[:, 0]
+
+    return result
+
+class BatchCompromiseExpert:
+    def __init__(self, kernel, weights, types, chunk_size, vote_limit=None, deadline=None) -> None:
+        """
+        Initializes the compromise expert function voting with the preferences of the MCDA method for several vectors of weights.
+
+        The expert gives the same judgments as the pymcdm CompromiseExpert with the evaluation functions calling the method for each vector of weights,
+        but all characteristic objects are evaluated with all vectors of weights in a single call of the kernel and the votes are compared for blocks of objects.
+
+        Parameters
+        ----------
+        kernel : callable
+            Kernel of the MCDA method from the `mcda_kernels`, returning the preferences for the stack of matrices and vectors of weights.
+        weights : ndarray
+            Vectors of criteria weights, each giving one vote (f x n).
+        types : ndarray
+            Criteria types (n).
+        chunk_size : int
+            Maximum number of compared values (objects x objects x votes) evaluated at once.
+        vote_limit : float, optional
+            Number of votes above which the object is preferred, half of the votes by default.
+        deadline : float, optional
+            Value of `time.monotonic()` after which the calculation is stopped with TimeoutError (default is None for no time limit).
+        """
+        self.kernel = kernel
+        self.weights = np.asarray(weights, dtype=float)
+        self.types = np.asarray(types, dtype=float)
+        self.chunk_size = chunk_size
+        self.vote_limit = self.weights.shape[0] / 2 if vote_limit is None else vote_limit
+        self.deadline = deadline
+
+    def __call__(self, co):
+        """
+        Evaluates the characteristic objects.
+
+        Parameters
+        ----------
+        co : ndarray
+            Characteristic objects (k x n).
+
+        Raises
+        ------
+        TimeoutError
+            If the deadline passes before all blocks of objects are compared.
+
+        Returns
+        -------
+        tuple
+            (sj, mej) with the summed judgments of the objects (k) and the Matrix of Expert Judgments (k x k).
+        """
+        prefs = self.kernel(co[np.newaxis], self.weights, self.types).T
+        k = prefs.shape[0]
+        step = max(1, self.chunk_size // (k * prefs.shape[1]))
+
+        # judgments of the object in the row, compared with each other object
+        mej = np.empty((k, k))
+        for start in range(0, k, step):
+            if self.deadline is not None and time.monotonic() > self.deadline:
+                raise TimeoutError()
+            votes = np.sum(prefs[start:start + step, np.newaxis, :] > prefs[np.newaxis, :, :], axis=2)
+            mej[start:start + step] = np.where(votes > self.vote_limit, 1.0, np.where(votes == self.vote_limit, 0.5, 0.0))
+
+        # judgment of the later object is the complement of the judgment of the earlier one
+        for idx in range(1, k):
+            mej[idx, :idx] = 1 - mej[:idx, idx]
+        np.fill_diagonal(mej, 1.0)
+
+        return mej.sum(axis=1), mej
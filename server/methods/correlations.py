@@ -1,3 +1,4 @@
+import numpy as np
 import pymcdm.correlations as corr
 
 correlation_methods = {
@@ -10,4 +11,204 @@ correlation_methods = {
     'WS RANK': corr.rank_similarity_coef,
     'WEIGHTS SIMILARITY': corr.wsc,
     'WEIGHTS SIMILARITY 2': corr.wsc2
-}
\ No newline at end of file
+}
+
+# The kernels reproduce the order of floating point operations of the pymcdm coefficients,
+# so the correlation matrices are identical to the matrices calculated for each pair of rows separately.
+
+def _pairwise_matrix(k, evaluate, step, symmetric=True):
+    """
+    Calculates the correlation matrix from the coefficients evaluated for the chunks of pairs of rows.
+
+    Parameters
+    ----------
+    k : int
+        Number of correlated rows.
+    evaluate : callable
+        Function returning the coefficients for the given indexes of the first and the second row of each pair.
+    step : int
+        Number of pairs evaluated at once.
+    symmetric : bool, optional
+        If True, each unordered pair is evaluated once and mirrored, otherwise all ordered pairs are evaluated (default is True).
+
+    Returns
+    -------
+    ndarray
+        Correlation matrix (k x k).
+    """
+    if symmetric:
+        rows, cols = np.triu_indices(k)
+    else:
+        rows, cols = np.indices((k, k)).reshape(2, -1)
+
+    values = np.empty(rows.shape[0])
+    for start in range(0, rows.shape[0], step):
+        values[start:start + step] = evaluate(rows[start:start + step], cols[start:start + step])
+
+    matrix = np.empty((k, k))
+    matrix[rows, cols] = values
+    if symmetric:
+        matrix[cols, rows] = values
+
+    return matrix
+
+def pearson_kernel(data, chunk_size):
+    """
+    Calculates the Pearson correlation matrix, the Spearman correlation matrix for the rows of ranks.
+
+    Parameters
+    ----------
+    data : ndarray
+        Correlated rows (k x n).
+    chunk_size : int
+        Maximum number of values (pairs x n) evaluated at once.
+
+    Returns
+    -------
+    ndarray
+        Correlation matrix (k x k).
+    """
+    k, n = data.shape
+    centered = data - data.mean(axis=1)[:, np.newaxis]
+    std = np.std(data, axis=1)
+
+    def evaluate(rows, cols):
+        # covariance of each pair from the product of its own 2 x n matrix, as in np.cov
+        pairs = np.stack([centered[rows], centered[cols]], axis=1)
+        cov = np.matmul(pairs, np.swapaxes(pairs, 1, 2))[:, 0, 1] * np.true_divide(1, n)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return cov / (std[rows] * std[cols])
+
+    return _pairwise_matrix(k, evaluate, max(1, chunk_size // (2 * n)))
+
+def weighted_spearman_kernel(data, chunk_size):
+    """
+    Calculates the weighted Spearman correlation matrix.
+
+    Parameters
+    ----------
+    data : ndarray
+        Correlated rankings (k x n).
+    chunk_size : int
+        Maximum number of values (pairs x n) evaluated at once.
+
+    Returns
+    -------
+    ndarray
+        Correlation matrix (k x k).
+    """
+    k, N = data.shape
+    d = N**4 + N**3 - N**2 - N
+
+    def evaluate(rows, cols):
+        x, y = data[rows], data[cols]
+        return 1 - (6 * np.sum((x - y)**2 * ((N - x + 1) + (N - y + 1)), axis=1) / d)
+
+    return _pairwise_matrix(k, evaluate, max(1, chunk_size // N))
+
+def rank_similarity_kernel(data, chunk_size):
+    """
+    Calculates the WS rank similarity coefficient matrix, which is not symmetric.
+
+    Parameters
+    ----------
+    data : ndarray
+        Correlated rankings (k x n).
+    chunk_size : int
+        Maximum number of values (pairs x n) evaluated at once.
+
+    Returns
+    -------
+    ndarray
+        Matrix of coefficients of the ranking in the row compared with the ranking in the column (k x k).
+    """
+    k, N = data.shape
+    weights = 2.0**(-1.0 * data)
+    d = np.max((np.fabs(1 - data), np.fabs(N - data)), axis=0)
+
+    def evaluate(rows, cols):
+        return 1 - np.sum(weights[rows] * np.fabs(data[rows] - data[cols]) / d[rows], axis=1)
+
+    return _pairwise_matrix(k, evaluate, max(1, chunk_size // N), symmetric=False)
+
+def _concordance(data, chunk_size):
+    """
+    Calculates the sums of products of the signs of differences between each pair of alternatives in two rows.
+
+    Sums of integers are exact, so the pairs of alternatives are evaluated in chunks in any order.
+
+    Parameters
+    ----------
+    data : ndarray
+        Correlated rows (k x n).
+    chunk_size : int
+        Maximum number of values (k x pairs of alternatives) evaluated at once.
+
+    Returns
+    -------
+    tuple
+        (concordance, untied) with the sums of products of signs and the numbers of pairs without ties in both rows (k x k).
+    """
+    k, n = data.shape
+    first, second = np.triu_indices(n, 1)
+    step = max(1, chunk_size // k)
+
+    concordance, untied = np.zeros((k, k)), np.zeros((k, k))
+    for start in range(0, first.shape[0], step):
+        signs = np.sign(data[:, first[start:start + step]] - data[:, second[start:start + step]])
+        concordance += signs @ signs.T
+        untied += np.abs(signs) @ np.abs(signs).T
+
+    return concordance, untied
+
+def kendall_tau_kernel(data, chunk_size):
+    """
+    Calculates the Kendall tau correlation matrix.
+
+    Parameters
+    ----------
+    data : ndarray
+        Correlated rankings (k x n).
+    chunk_size : int
+        Maximum number of values (k x pairs of alternatives) evaluated at once.
+
+    Returns
+    -------
+    ndarray
+        Correlation matrix (k x k).
+    """
+    n = data.shape[1]
+    concordance, _ = _concordance(data, chunk_size)
+
+    return 2/(n*(n-1)) * concordance
+
+def goodman_kruskal_kernel(data, chunk_size):
+    """
+    Calculates the Goodman and Kruskal gamma correlation matrix.
+
+    Parameters
+    ----------
+    data : ndarray
+        Correlated rankings (k x n).
+    chunk_size : int
+        Maximum number of values (k x pairs of alternatives) evaluated at once.
+
+    Returns
+    -------
+    ndarray
+        Correlation matrix (k x k).
+    """
+    concordance, untied = _concordance(data, chunk_size)
+
+    # both orders of each pair of alternatives are counted, as in the permutations of pymcdm
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (2 * concordance) / (2 * untied)
+
+correlation_kernels = {
+    'GOODMAN-KRUSKALL': goodman_kruskal_kernel,
+    'KENDALL-TAU': kendall_tau_kernel,
+    'PEARSON': pearson_kernel,
+    'SPEARMAN': pearson_kernel,
+    'WEIGHTED SPEARMAN': weighted_spearman_kernel,
+    'WS RANK': rank_similarity_kernel,
+}
@@ -0,0 +1,316 @@
+# Copyright (C) Jakub Więckowski 2024
+
+import numpy as np
+from pymcdm import normalizations
+from pymcdm.methods.vikor import _fake_normalization
+
+# The kernels reproduce the order of floating point operations of the pymcdm methods,
+# so the preferences are identical to the preferences of the method objects with default parameters.
+
+def _column_sums(matrices):
+    """
+    Sums the values of each criterion, in the same order as the sum of the single column in pymcdm normalizations.
+
+    Parameters
+    ----------
+    matrices : ndarray
+        Stack of decision matrices (s x m x n).
+
+    Returns
+    -------
+    ndarray
+        Sums of the criteria values (s x 1 x n).
+    """
+    return np.sum(np.ascontiguousarray(np.swapaxes(matrices, 1, 2)), axis=2)[:, np.newaxis, :]
+
+def minmax_normalization(matrices, types):
+    """
+    Normalizes the stack of decision matrices with the min-max method.
+
+    Parameters
+    ----------
+    matrices : ndarray
+        Stack of decision matrices (s x m x n).
+    types : ndarray
+        Criteria types (n).
+
+    Returns
+    -------
+    ndarray
+        Stack of normalized decision matrices (s x m x n).
+    """
+    xmin = np.min(matrices, axis=1, keepdims=True)
+    xmax = np.max(matrices, axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        nmatrices = np.where(types == 1, (matrices - xmin) / (xmax - xmin), (xmax - matrices) / (xmax - xmin))
+    return np.where(xmin == xmax, 1.0, nmatrices)
+
+def sum_normalization(matrices, types):
+    """
+    Normalizes the stack of decision matrices with the sum method.
+
+    Parameters
+    ----------
+    matrices : ndarray
+        Stack of decision matrices (s x m x n).
+    types : ndarray
+        Criteria types (n).
+
+    Returns
+    -------
+    ndarray
+        Stack of normalized decision matrices (s x m x n).
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inverse = 1 / matrices
+        return np.where(types == 1, matrices / _column_sums(matrices), inverse / _column_sums(inverse))
+
+def vikor_normalization(matrices, types):
+    """
+    Prepares the stack of decision matrices in the same way as the VIKOR method without the normalization function.
+
+    Parameters
+    ----------
+    matrices : ndarray
+        Stack of decision matrices (s x m x n).
+    types : ndarray
+        Criteria types (n).
+
+    Returns
+    -------
+    ndarray
+        Stack of decision matrices with reversed cost criteria (s x m x n).
+    """
+    return np.where(types == 1, matrices, np.max(matrices, axis=1, keepdims=True) - matrices)
+
+def topsis_preferences(nmatrices, weights):
+    """
+    Calculates the TOPSIS preferences from the normalized decision matrices.
+
+    Parameters
+    ----------
+    nmatrices : ndarray
+        Stack of normalized decision matrices (s x m x n), or a single normalized decision matrix (1 x m x n) evaluated with each vector of weights.
+    weights : ndarray
+        Vectors of criteria weights (s x n).
+
+    Returns
+    -------
+    ndarray
+        Preferences of alternatives for each vector of weights (s x m).
+    """
+    weighted_matrices = nmatrices * weights[:, np.newaxis, :]
+    pis = np.max(weighted_matrices, axis=1, keepdims=True)
+    nis = np.min(weighted_matrices, axis=1, keepdims=True)
+    Dp = np.sqrt(np.sum((weighted_matrices - pis) ** 2, axis=2))
+    Dm = np.sqrt(np.sum((weighted_matrices - nis) ** 2, axis=2))
+    return Dm / (Dm + Dp)
+
+def wsm_preferences(nmatrices, weights):
+    """
+    Calculates the WSM preferences from the normalized decision matrices.
+
+    Parameters
+    ----------
+    nmatrices : ndarray
+        Stack of normalized decision matrices (s x m x n), or a single normalized decision matrix (1 x m x n) evaluated with each vector of weights.
+    weights : ndarray
+        Vectors of criteria weights (s x n).
+
+    Returns
+    -------
+    ndarray
+        Preferences of alternatives for each vector of weights (s x m).
+    """
+    return np.sum(nmatrices * weights[:, np.newaxis, :], axis=2)
+
+def wpm_preferences(nmatrices, weights):
+    """
+    Calculates the WPM preferences from the normalized decision matrices.
+
+    Parameters
+    ----------
+    nmatrices : ndarray
+        Stack of normalized decision matrices (s x m x n), or a single normalized decision matrix (1 x m x n) evaluated with each vector of weights.
+    weights : ndarray
+        Vectors of criteria weights (s x n).
+
+    Returns
+    -------
+    ndarray
+        Preferences of alternatives for each vector of weights (s x m).
+    """
+    return np.prod(nmatrices ** weights[:, np.newaxis, :], axis=2)
+
+def vikor_preferences(nmatrices, weights, v=0.5):
+    """
+    Calculates the VIKOR Q preferences from the normalized decision matrices.
+
+    Parameters
+    ----------
+    nmatrices : ndarray
+        Stack of normalized decision matrices (s x m x n), or a single normalized decision matrix (1 x m x n) evaluated with each vector of weights.
+    weights : ndarray
+        Vectors of criteria weights (s x n).
+    v : float, optional
+        Weight of the strategy (default is 0.5).
+
+    Raises
+    ------
+    ValueError
+        If any criterion contains equal values for all alternatives.
+
+    Returns
+    -------
+    ndarray
+        Preferences of alternatives for each vector of weights (s x m).
+    """
+    fstar = np.max(nmatrices, axis=1, keepdims=True)
+    fminus = np.min(nmatrices, axis=1, keepdims=True)
+    if np.any(fstar == fminus):
+        eq = np.arange(fstar.shape[2])[np.any(fstar == fminus, axis=(0, 1))]
+        raise ValueError(
+            f'Criteria with indexes {eq} contains equal values for all alternatives. VIKOR method could not be '
+            f'applied in this case. Consider removing this criteria from the decision matrix or use another '
+            f'MCDA method.'
+        )
+
+    weighted_ff = weights[:, np.newaxis, :] * ((fstar - nmatrices)/(fstar - fminus))
+    S = np.sum(weighted_ff, axis=2)
+    R = np.max(weighted_ff, axis=2)
+    Sstar = np.min(S, axis=1, keepdims=True)
+    Sminus = np.max(S, axis=1, keepdims=True)
+    Rstar = np.min(R, axis=1, keepdims=True)
+    Rminus = np.max(R, axis=1, keepdims=True)
+    return v * (S - Sstar)/(Sminus - Sstar) + (1 - v) * (R - Rstar)/(Rminus - Rstar)
+
+def topsis_kernel(matrices, weights, types):
+    """
+    Calculates the TOPSIS preferences for the stack of decision matrices.
+
+    Parameters
+    ----------
+    matrices : ndarray
+        Stack of decision matrices (s x m x n).
+    weights : ndarray
+        Vectors of criteria weights for each decision matrix (s x n).
+    types : ndarray
+        Criteria types (n).
+
+    Returns
+    -------
+    ndarray
+        Preferences of alternatives for each decision matrix (s x m).
+    """
+    return topsis_preferences(minmax_normalization(matrices, types), weights)
+
+def wsm_kernel(matrices, weights, types):
+    """
+    Calculates the WSM preferences for the stack of decision matrices.
+
+    Parameters
+    ----------
+    matrices : ndarray
+        Stack of decision matrices (s x m x n).
+    weights : ndarray
+        Vectors of criteria weights for each decision matrix (s x n).
+    types : ndarray
+        Criteria types (n).
+
+    Returns
+    -------
+    ndarray
+        Preferences of alternatives for each decision matrix (s x m).
+    """
+    return wsm_preferences(sum_normalization(matrices, types), weights)
+
+def wpm_kernel(matrices, weights, types):
+    """
+    Calculates the WPM preferences for the stack of decision matrices.
+
+    Parameters
+    ----------
+    matrices : ndarray
+        Stack of decision matrices (s x m x n).
+    weights : ndarray
+        Vectors of criteria weights for each decision matrix (s x n).
+    types : ndarray
+        Criteria types (n).
+
+    Returns
+    -------
+    ndarray
+        Preferences of alternatives for each decision matrix (s x m).
+    """
+    return wpm_preferences(sum_normalization(matrices, types), weights)
+
+def copras_kernel(matrices, weights, types):
+    """
+    Calculates the COPRAS preferences for the stack of decision matrices.
+
+    Parameters
+    ----------
+    matrices : ndarray
+        Stack of decision matrices (s x m x n).
+    weights : ndarray
+        Vectors of criteria weights for each decision matrix (s x n).
+    types : ndarray
+        Criteria types (n).
+
+    Raises
+    ------
+    ValueError
+        If all criteria are profit criteria.
+
+    Returns
+    -------
+    ndarray
+        Preferences of alternatives for each decision matrix (s x m).
+    """
+    if np.all(types == 1.0):
+        raise ValueError('types array contains only profit criteria. COPRAS method requires at least one cost '
+                         'criteria.')
+
+    weighted_matrices = matrices / np.sum(matrices, axis=1, keepdims=True) * weights[:, np.newaxis, :]
+    Sp = np.sum(weighted_matrices[:, :, types == 1], axis=2)
+    Sm = np.sum(weighted_matrices[:, :, types == -1], axis=2)
+    Smin = np.min(Sm, axis=1, keepdims=True)
+    Q = Sp + ((Smin * np.sum(Sm, axis=1, keepdims=True)) / (Sm * np.sum(Smin / Sm, axis=1, keepdims=True)))
+    return Q / np.max(Q, axis=1, keepdims=True)
+
+def vikor_kernel(matrices, weights, types, v=0.5):
+    """
+    Calculates the VIKOR Q preferences for the stack of decision matrices.
+
+    Parameters
+    ----------
+    matrices : ndarray
+        Stack of decision matrices (s x m x n).
+    weights : ndarray
+        Vectors of criteria weights for each decision matrix (s x n).
+    types : ndarray
+        Criteria types (n).
+    v : float, optional
+        Weight of the strategy (default is 0.5).
+
+    Raises
+    ------
+    ValueError
+        If any criterion contains equal values for all alternatives.
+
+    Returns
+    -------
+    ndarray
+        Q preferences of alternatives for each decision matrix (s x m).
+    """
+    return vikor_preferences(vikor_normalization(matrices, types), weights, v)
+
+# crisp methods evaluated for the stack of decision matrices at once,
+# with the normalization function used by the method object with default parameters
+mcda_kernels = {
+    'COPRAS': (copras_kernel, None),
+    'TOPSIS': (topsis_kernel, normalizations.minmax_normalization),
+    'VIKOR': (vikor_kernel, _fake_normalization),
+    'WPM': (wpm_kernel, normalizations.sum_normalization),
+    'WSM': (wsm_kernel, normalizations.sum_normalization),
+}
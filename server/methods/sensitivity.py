@@ -0,0 +1,161 @@
+# Copyright (C) Jakub Więckowski 2024
+
+import time
+import numpy as np
+
+def uniform_perturbation(rng, weights, size, spread=0.1):
+    """
+    Samples vectors of criteria weights perturbed uniformly around the given weights.
+
+    Each weight is multiplied by the factor drawn from the range [1 - spread, 1 + spread],
+    and the vectors are normalized to sum up to one.
+
+    Parameters
+    ----------
+    rng : Generator
+        The random numbers generator.
+    weights : ndarray
+        Vector of criteria weights (n).
+    size : int
+        Number of sampled vectors.
+    spread : float, optional
+        Relative range of the perturbation, from 0 to 1 (default is 0.1).
+
+    Raises
+    ------
+    ValueError
+        If the spread is out of range.
+
+    Returns
+    -------
+    ndarray
+        Sampled vectors of criteria weights (size x n).
+    """
+    spread = float(spread)
+    if spread < 0 or spread > 1:
+        raise ValueError(f'Spread of the uniform perturbation should be in range [0, 1], got {spread}')
+
+    samples = weights * rng.uniform(1 - spread, 1 + spread, (size, weights.shape[0]))
+    return samples / np.sum(samples, axis=1, keepdims=True)
+
+def dirichlet_perturbation(rng, weights, size, concentration=100):
+    """
+    Samples vectors of criteria weights from the Dirichlet distribution with the mean in the given weights.
+
+    Parameters
+    ----------
+    rng : Generator
+        The random numbers generator.
+    weights : ndarray
+        Vector of criteria weights (n).
+    size : int
+        Number of sampled vectors.
+    concentration : float, optional
+        Concentration of the distribution, higher values give samples closer to the weights (default is 100).
+
+    Raises
+    ------
+    ValueError
+        If the concentration is not positive.
+
+    Returns
+    -------
+    ndarray
+        Sampled vectors of criteria weights (size x n).
+    """
+    concentration = float(concentration)
+    if concentration <= 0:
+        raise ValueError(f'Concentration of the Dirichlet perturbation should be positive, got {concentration}')
+
+    alpha = np.maximum(concentration * weights / np.sum(weights), np.finfo(float).eps)
+    return rng.dirichlet(alpha, size)
+
+def rank_samples(prefs, reverse):
+    """
+    Ranks the alternatives for each sample of preferences.
+
+    Tied alternatives get the same, lowest position (1 + number of strictly better alternatives).
+
+    Parameters
+    ----------
+    prefs : ndarray
+        Preferences of alternatives for each sample (k x m).
+    reverse : bool
+        If True, higher preferences are better.
+
+    Returns
+    -------
+    ndarray
+        Positions of alternatives for each sample (k x m).
+    """
+    values = -prefs if reverse else prefs
+    order = np.argsort(values, axis=1, kind='stable')
+    sorted_values = np.take_along_axis(values, order, axis=1)
+    positions = np.broadcast_to(np.arange(prefs.shape[1]), prefs.shape)
+    # position of the first alternative with the same preference in the sorted order
+    first = np.maximum.accumulate(np.where(np.diff(sorted_values, axis=1, prepend=np.nan) != 0, positions, 0), axis=1)
+
+    ranks = np.empty(prefs.shape, dtype=np.int64)
+    np.put_along_axis(ranks, order, first + 1, axis=1)
+    return ranks
+
+def weights_sensitivity(evaluate, weights, reverse, perturbation, rng, samples, chunk_size, deadline=None, **params):
+    """
+    Estimates the stability of the ranking of alternatives under perturbations of the criteria weights.
+
+    Sampled vectors of weights are evaluated in chunks, so the memory usage does not depend on the number of samples.
+
+    Parameters
+    ----------
+    evaluate : callable
+        Function calculating the preferences of alternatives (k x m) for the vectors of weights (k x n).
+    weights : ndarray
+        Vector of criteria weights (n).
+    reverse : bool
+        If True, higher preferences are better.
+    perturbation : callable
+        Function sampling the vectors of weights, from the `perturbation_methods`.
+    rng : Generator
+        The random numbers generator.
+    samples : int
+        Number of sampled vectors of weights.
+    chunk_size : int
+        Number of vectors of weights evaluated at once.
+    deadline : float, optional
+        Value of `time.monotonic()` after which the calculation is stopped with TimeoutError (default is None for no time limit).
+    **params
+        Parameters of the perturbation.
+
+    Raises
+    ------
+    TimeoutError
+        If the deadline passes before all chunks are evaluated.
+
+    Returns
+    -------
+    tuple
+        (ranking, distribution, changes) with the positions of alternatives for the given weights (m),
+        the frequencies of each position for each alternative (m x m)
+        and the frequencies of the position different than for the given weights (m).
+    """
+    ranking = rank_samples(evaluate(weights[np.newaxis, :]), reverse)[0]
+    m = ranking.shape[0]
+    counts = np.zeros(m * m, dtype=np.int64)
+    changes = np.zeros(m, dtype=np.int64)
+    offsets = np.arange(m) * m - 1
+
+    for start in range(0, samples, chunk_size):
+        if deadline is not None and time.monotonic() > deadline:
+            raise TimeoutError()
+        size = min(chunk_size, samples - start)
+        ranks = rank_samples(evaluate(perturbation(rng, weights, size, **params)), reverse)
+        counts += np.bincount((ranks + offsets).ravel(), minlength=m * m)
+        changes += np.sum(ranks != ranking, axis=0)
+
+    return ranking, counts.reshape(m, m) / samples, changes / samples
+
+# distributions of the perturbed criteria weights
+perturbation_methods = {
+    'DIRICHLET': dirichlet_perturbation,
+    'UNIFORM': uniform_perturbation,
+}
@@ -0,0 +1,138 @@
+# Copyright (C) Jakub Więckowski 2024
+
+import numpy as np
+
+from .sensitivity import uniform_perturbation, dirichlet_perturbation, rank_samples
+
+def simplex_weights(rng, weights, size):
+    """
+    Samples vectors of criteria weights uniformly from the simplex, without the preference information.
+
+    Parameters
+    ----------
+    rng : Generator
+        The random numbers generator.
+    weights : ndarray
+        Vector of criteria weights (n), only its size is used.
+    size : int
+        Number of sampled vectors.
+
+    Returns
+    -------
+    ndarray
+        Sampled vectors of criteria weights (size x n).
+    """
+    return rng.dirichlet(np.ones(weights.shape[0]), size)
+
+def triangular_matrices(rng, matrix, size):
+    """
+    Samples crisp decision matrices with values drawn from the Triangular Fuzzy Numbers of the fuzzy matrix.
+
+    Parameters
+    ----------
+    rng : Generator
+        The random numbers generator.
+    matrix : ndarray
+        Fuzzy decision matrix (m x n x 3).
+    size : int
+        Number of sampled matrices.
+
+    Returns
+    -------
+    ndarray
+        Sampled crisp decision matrices (size x m x n).
+    """
+    a, c, b = matrix[..., 0], matrix[..., 1], matrix[..., 2]
+    width = b - a
+    u = rng.random((size, *a.shape))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mode = np.where(width > 0, (c - a) / width, 0)
+        left = a + np.sqrt(u * width * (c - a))
+        right = b - np.sqrt((1 - u) * width * (b - c))
+
+    return np.where(u < mode, left, right)
+
+def acceptability_chunk(evaluate, weights, matrices, reverse, evaluate_stack=None):
+    """
+    Counts the positions of alternatives and sums the vectors of weights for which the alternatives are the best.
+
+    Parameters
+    ----------
+    evaluate : callable
+        Function calculating the preferences of alternatives (k x m) for the decision matrix (m x n) and the vectors of weights (k x n).
+    weights : ndarray
+        Sampled vectors of criteria weights (k x n).
+    matrices : ndarray
+        Sampled decision matrices (k x m x n), each evaluated with the corresponding vector of weights,
+        or a single decision matrix (m x n) evaluated with all vectors of weights.
+    reverse : bool
+        If True, higher preferences are better.
+    evaluate_stack : callable, optional
+        Function calculating the preferences of alternatives (k x m) for the stack of decision matrices (k x m x n)
+        and the vectors of weights (k x n), used for the sampled decision matrices (default is None).
+
+    Returns
+    -------
+    tuple
+        (counts, central) with the number of samples with each position of each alternative (m x m)
+        and the sum of the vectors of weights for which each alternative is the best (m x n).
+    """
+    if matrices.ndim == 2:
+        prefs = evaluate(matrices, weights)
+    elif evaluate_stack is not None:
+        prefs = evaluate_stack(matrices, weights)
+    else:
+        prefs = np.concatenate([evaluate(matrix, w[np.newaxis, :]) for matrix, w in zip(matrices, weights)])
+
+    ranks = rank_samples(prefs, reverse)
+    m = ranks.shape[1]
+    counts = np.bincount((ranks + np.arange(m) * m - 1).ravel(), minlength=m * m).reshape(m, m)
+    central = (ranks == 1).T.astype(float) @ weights
+
+    return counts, central
+
+def confidence_chunk(evaluate, central_weights, matrices, reverse, evaluate_stack=None):
+    """
+    Counts the samples of decision matrices for which each alternative is the best with its central vector of weights.
+
+    Parameters
+    ----------
+    evaluate : callable
+        Function calculating the preferences of alternatives (k x m) for the decision matrix (m x n) and the vectors of weights (k x n).
+    central_weights : ndarray
+        Central vectors of weights of the alternatives (m x n), rows of alternatives which are never the best are not used.
+    matrices : ndarray
+        Sampled decision matrices (k x m x n).
+    reverse : bool
+        If True, higher preferences are better.
+    evaluate_stack : callable, optional
+        Function calculating the preferences of alternatives (k x m) for the stack of decision matrices (k x m x n)
+        and the vectors of weights (k x n), used to evaluate all matrices with the central weights of each alternative (default is None).
+
+    Returns
+    -------
+    ndarray
+        Number of samples for which each alternative is the best with its central vector of weights (m).
+    """
+    alternatives = np.flatnonzero(~np.isnan(central_weights[:, 0]))
+    counts = np.zeros(central_weights.shape[0], dtype=np.int64)
+
+    if evaluate_stack is not None:
+        for alternative in alternatives:
+            weights = np.broadcast_to(central_weights[alternative], (matrices.shape[0], central_weights.shape[1]))
+            counts[alternative] = np.sum(rank_samples(evaluate_stack(matrices, weights), reverse)[:, alternative] == 1)
+        return counts
+
+    for matrix in matrices:
+        ranks = rank_samples(evaluate(matrix, central_weights[alternatives]), reverse)
+        counts[alternatives] += ranks[np.arange(alternatives.shape[0]), alternatives] == 1
+
+    return counts
+
+# distributions of the sampled criteria weights
+weights_distributions = {
+    'DIRICHLET': dirichlet_perturbation,
+    'SIMPLEX': simplex_weights,
+    'UNIFORM': uniform_perturbation,
+}
@@ -64,6 +64,7 @@ def get_response_calculation_model(api):
     data_item = api.model('ResponseNodeData', {
         "matrix_id": fields.Integer(description="ID of matrix used to calculate results within the node"),
         'matrix': fields.List(fields.List(fields.Raw()), description='2D matrix with data represented as floats for crisp data and 3D matrix with strings in cells for fuzzy data', skip_none=True),
+        'handle': fields.String(description='Handle of the stored matrix given in the matrix node instead of the matrix data', skip_none=True),
         'criteria_types': fields.List(fields.Integer(), description="1D array of criteria types containing -1 for cost type and 1 for profit criteria", skip_none=True),
         "weights": fields.List(fields.Raw(), description='1D array of crisp criteria weights or 2D array of fuzzy criteria weights', skip_none=True),
         "weights_method": fields.String(description='Method used to calculate criteria weights', skip_none=True),
@@ -18,6 +18,7 @@ def get_matrix_model(api):
         'matrix': fields.List(fields.List(fields.Raw()), description='2D Matrix with data represented as floats for crisp data and 3D matrix with strings in cells for fuzzy data'),
         'criteria_types': fields.List(fields.Integer(description="1D array of criteria types containing -1 for cost type and 1 for profit criteria")),
         'extension': fields.String(description="Type of data for calculations"),
+        'handle': fields.String(description="Handle of the matrix stored on the server, which can be given in the matrix node instead of the matrix data"),
     })
 
     response_item = api.model('ResponseMatrix', {
@@ -1,4 +1,5 @@
 from .locale import get_locale_parser
 from .matrix import get_upload_matrix_parser, get_generate_matrix_parser
-from .calculation import get_request_calculation_parser, get_kwargs_items_parser
-from .surveys import get_survey_usage_parser, get_survey_rating_parser
\ No newline at end of file
+from .calculation import get_request_calculation_parser, get_request_job_parser, get_request_batch_parser, get_session_update_parser, get_kwargs_items_parser
+from .surveys import get_survey_usage_parser, get_survey_rating_parser
+from .comet import get_comet_fit_parser, get_comet_predict_parser, get_comet_stream_parser
\ No newline at end of file
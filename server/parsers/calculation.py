@@ -1,7 +1,57 @@
-from flask_restx import reqparse
+from flask_restx import reqparse, inputs
 
+from config import RESULTS_PRECISION, RESULTS_PRECISION_LIMIT
 from models.calculations import get_request_calculation_model
 
+def _validate_nodes(data):
+    '''Validate the keys of nodes'''
+
+    required_keys = ['id', 'node_type', 'extension', 'connections_from', 'connections_to', 'position_x', 'position_y']
+    optional_keys = ['matrix', 'criteria_types', 'handle', 'method', 'weights', 'kwargs']
+
+    for node_idx, node in enumerate(data):
+        required_set = set(required_keys)
+        keys_set = set(node.keys())
+
+        if not required_set.issubset(keys_set):
+            missing_keys = [key for key in required_set if key not in keys_set]
+            raise ValueError(f"Not all required keys are given. Missing keys: '{missing_keys}'. Check the element at index {node_idx}")
+
+        optional_set = set(optional_keys)
+        difference_set = keys_set.difference(required_set)
+        union_set = optional_set.union(difference_set)
+
+        if len(union_set) > len(optional_set):
+
+            bad_keys = union_set.difference(optional_keys)
+            raise ValueError(f'Not allowed keys used: {list(bad_keys)}. Check the element at index {node_idx}')
+
+    return data
+
+def nodes_type(data):
+    '''Parse nodes of the structure'''
+
+    if len(data) == 0:
+        raise ValueError('Empty data object given')
+
+    return _validate_nodes(data)
+
+def nodes_changes_type(data):
+    '''Parse nodes added to or changed in the structure'''
+
+    return _validate_nodes(data)
+
+def precision_type(value):
+    '''Parse the number of decimal places of the results, null for the results without rounding'''
+
+    if value is None:
+        return None
+
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0 or value > RESULTS_PRECISION_LIMIT:
+        raise ValueError(f'Number of decimal places should be an integer from 0 to {RESULTS_PRECISION_LIMIT}, or null for the results without rounding')
+
+    return value
+
 def get_request_calculation_parser():
     """
     Creates and returns a parser for request data related to calculations.
@@ -11,37 +61,62 @@ def get_request_calculation_parser():
     flask_restx.reqparse.RequestParser
         The configured request parser.
     """
-    def my_type(data):
-        '''Parse my type'''
+    parser = reqparse.RequestParser()
+    parser.add_argument('locale', location='headers', required=True)
+    parser.add_argument('data', required=True, type=nodes_type, location='json')
+    parser.add_argument('parallel', type=inputs.boolean, location='json', default=False)
+    parser.add_argument('debug', type=inputs.boolean, location='json', default=False)
+    parser.add_argument('profile', type=inputs.boolean, location='json', default=False)
+    parser.add_argument('profile_memory', type=inputs.boolean, location='json', default=False)
+    parser.add_argument('precision', type=precision_type, location='json', default=RESULTS_PRECISION)
 
-        required_keys = ['id', 'node_type', 'extension', 'connections_from', 'connections_to', 'position_x', 'position_y']
-        optional_keys = ['matrix', 'criteria_types', 'method', 'weights', 'kwargs']
+    return parser
 
-        if len(data) == 0:
-            raise ValueError('Empty data object given')
+def get_request_job_parser():
+    """
+    Creates and returns a parser for request data related to calculation jobs.
 
-        for node_idx, node in enumerate(data):
-            required_set = set(required_keys)
-            keys_set = set(node.keys())
+    Returns
+    -------
+    flask_restx.reqparse.RequestParser
+        The configured request parser.
+    """
+    parser = get_request_calculation_parser().copy()
+    parser.add_argument('timeout', type=float, location='json', default=None)
 
-            if not required_set.issubset(keys_set):
-                missing_keys = [key for key in required_set if key not in keys_set]
-                raise ValueError(f"Not all required keys are given. Missing keys: '{missing_keys}'. Check the element at index {node_idx}")
+    return parser
 
-            optional_set = set(optional_keys)
-            difference_set = keys_set.difference(required_set)
-            union_set = optional_set.union(difference_set)
+def get_request_batch_parser():
+    """
+    Creates and returns a parser for request data related to batch calculations.
 
-            if len(union_set) > len(optional_set):
+    Returns
+    -------
+    flask_restx.reqparse.RequestParser
+        The configured request parser.
+    """
+    parser = reqparse.RequestParser()
+    parser.add_argument('locale', location='headers', required=True)
+    parser.add_argument('structures', required=True, type=list, location='json')
+    parser.add_argument('parallel', type=inputs.boolean, location='json', default=False)
 
-                bad_keys = union_set.difference(optional_keys)
-                raise ValueError(f'Not allowed keys used: {list(bad_keys)}. Check the element at index {node_idx}')
-            
-        return data
+    return parser
+
+def get_session_update_parser():
+    """
+    Creates and returns a parser for request data related to changes of the calculation session structure.
 
+    Returns
+    -------
+    flask_restx.reqparse.RequestParser
+        The configured request parser.
+    """
     parser = reqparse.RequestParser()
     parser.add_argument('locale', location='headers', required=True)
-    parser.add_argument('data', required=True, type=my_type, location='json')
+    parser.add_argument('add', type=nodes_changes_type, location='json', default=[])
+    parser.add_argument('change', type=nodes_changes_type, location='json', default=[])
+    parser.add_argument('remove', type=list, location='json', default=[])
+    parser.add_argument('parallel', type=inputs.boolean, location='json', default=False)
 
     return parser
 
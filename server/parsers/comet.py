@@ -0,0 +1,63 @@
+from flask_restx import reqparse
+
+from config import RESULTS_PRECISION
+from .calculation import precision_type
+
+def precision_query_type(value):
+    '''Parse the number of decimal places given in the query string, null for the results without rounding'''
+
+    if value == 'null':
+        return None
+
+    return precision_type(int(value))
+
+def get_comet_fit_parser():
+    """
+    Creates and returns a parser for request data related to fitting of the COMET model.
+
+    Returns
+    -------
+    flask_restx.reqparse.RequestParser
+        The configured request parser.
+    """
+    parser = reqparse.RequestParser()
+    parser.add_argument('locale', location='headers', required=True)
+    parser.add_argument('matrix', type=list, location='json', required=True)
+    parser.add_argument('criteria_types', type=list, location='json', required=True)
+    parser.add_argument('weights', type=list, location='json', default=None)
+    parser.add_argument('kwargs', type=dict, location='json', required=True)
+
+    return parser
+
+def get_comet_predict_parser():
+    """
+    Creates and returns a parser for request data related to the evaluation of alternatives with the fitted COMET model.
+
+    Returns
+    -------
+    flask_restx.reqparse.RequestParser
+        The configured request parser.
+    """
+    parser = reqparse.RequestParser()
+    parser.add_argument('locale', location='headers', required=True)
+    parser.add_argument('model_id', type=str, location='json', required=True)
+    parser.add_argument('alternatives', type=list, location='json', required=True)
+    parser.add_argument('precision', type=precision_type, location='json', default=RESULTS_PRECISION)
+
+    return parser
+
+def get_comet_stream_parser():
+    """
+    Creates and returns a parser for the query string of the evaluation of alternatives streamed as NDJSON lines.
+
+    Returns
+    -------
+    flask_restx.reqparse.RequestParser
+        The configured request parser.
+    """
+    parser = reqparse.RequestParser()
+    parser.add_argument('locale', location='headers', required=True)
+    parser.add_argument('model_id', type=str, location='args')
+    parser.add_argument('precision', type=precision_query_type, location='args', default=RESULTS_PRECISION)
+
+    return parser
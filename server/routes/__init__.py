@@ -7,6 +7,7 @@ from .calculations import api as calculationsApi
 from .graphs import api as graphsApi
 from .statistics import api as statsApi
 from .surveys import api as surveysApi
+from .comet import api as cometApi
 
 api = Api( 
     version='1.1.0',
@@ -24,3 +25,4 @@ api.add_namespace(calculationsApi)
 api.add_namespace(graphsApi)
 api.add_namespace(statsApi)
 api.add_namespace(surveysApi)
+api.add_namespace(cometApi)
@@ -1,23 +1,30 @@
 # Copyright (c) 2023 - 2024 Jakub Więckowski
 
+from flask import Response, request, stream_with_context
 from flask_restx import Resource
 from werkzeug.exceptions import BadRequest
 import json
 
 # CONST
-from config import dir_path
+from config import dir_path, BATCH_LIMIT
 
 # PARSERS
-from parsers import get_request_calculation_parser, get_kwargs_items_parser
+from parsers import get_locale_parser, get_request_calculation_parser, get_request_job_parser, get_request_batch_parser, get_session_update_parser, get_kwargs_items_parser
+from parsers.calculation import nodes_type
 
 # MODELS
 from models import get_response_calculation_model
 
 # CALCULATIONS
 from calculations.structure import CalculationStructure
+from calculations.session import create_session, get_session, remove_session
+from calculations.batch import calculate_batch
+from calculations.jobs import submit_job, get_job
 
 # UTILS
+from utils.cache import get_cache_key, calculations_flight
 from utils.generator import generate_method_items
+from utils.errors import get_error_message
 
 # HELPERS
 from helpers import validate_locale
@@ -30,8 +37,47 @@ response_calculation_model = get_response_calculation_model(api)
 
 # ARGUMENTS PARSERS
 calculation_parser = get_request_calculation_parser()
+batch_parser = get_request_batch_parser()
+job_parser = get_request_job_parser()
+session_update_parser = get_session_update_parser()
+locale_parser = get_locale_parser()
 items_parser = get_kwargs_items_parser()
 
+STREAM_MIMETYPES = ['application/x-ndjson', 'text/event-stream']
+# JSON response with numeric results encoded as base64 buffers of little-endian float64 numbers
+BINARY_MIMETYPE = 'application/vnd.makedecision.binary+json'
+
+def stream_calculation(calculation, mimetype):
+    """
+    Streams the calculation results of each node as soon as the node is final.
+
+    Parameters
+    ----------
+    calculation : CalculationStructure
+        The structure with the execution graph already built.
+    mimetype : str
+        Type of the stream, either 'application/x-ndjson' (a JSON object in each line) or 'text/event-stream' (server-sent events).
+
+    Returns
+    -------
+    Response
+        The streamed response. Error raised during the calculation is sent as the last message with the 'message' key.
+    """
+    def format_message(data, event):
+        if mimetype == 'text/event-stream':
+            return f'event: {event}\ndata: {json.dumps(data)}\n\n'
+        return f'{json.dumps(data)}\n'
+
+    def generate():
+        try:
+            for node_response in calculation.calculate_stream():
+                yield format_message(node_response, 'node')
+        except Exception as err:
+            api.logger.info(str(err))
+            yield format_message({"message": str(err)}, 'error')
+
+    return Response(stream_with_context(generate()), mimetype=mimetype)
+
 @api.route('/calculations/calculate')
 class CalculationResults(Resource):
     def post(self):
@@ -40,13 +86,163 @@ class CalculationResults(Resource):
         locale = validate_locale(args['locale'])
 
         data = args['data']
+        parallel = args['parallel']
+        mimetype = request.accept_mimetypes.best_match(['application/json', BINARY_MIMETYPE, *STREAM_MIMETYPES], default='application/json')
+
+        def calculate():
+            calculation = CalculationStructure(data, locale, parallel, args['profile'], args['precision'], args['profile_memory'])
+            response = calculation.calculate(binary=mimetype == BINARY_MIMETYPE)
+
+            result = {
+                "response": response
+            }
+            if args['debug']:
+                result['debug'] = calculation.get_debug()
+            if args['profile']:
+                result['profile'] = calculation.get_profile()
+
+            return json.dumps(result) if mimetype == BINARY_MIMETYPE else result
+
+        try:
+            if mimetype in STREAM_MIMETYPES:
+                # CALCULATE
+                calculation = CalculationStructure(data, locale, parallel, args['profile'], args['precision'], args['profile_memory'])
+                # connections are validated before the stream starts to respond with the error status
+                calculation.build_graph()
+                return stream_calculation(calculation, mimetype)
+
+            # CALCULATE, identical requests received during the calculation wait for its result
+            key = get_cache_key('calculate', locale, mimetype, data, parallel, args['debug'], args['profile'], args['profile_memory'], args['precision'])
+            result = calculations_flight.do(key, calculate)
+
+            if mimetype == BINARY_MIMETYPE:
+                return Response(result, mimetype=BINARY_MIMETYPE)
+
+            return result
+
+        except Exception as err:
+            api.logger.info(str(err))
+            e = BadRequest(str(err))
+            raise e
+
+@api.route('/calculations/calculate-batch')
+class CalculationBatchResults(Resource):
+    def post(self):
+        args = batch_parser.parse_args()
+        # ARGUMENTS
+        locale = validate_locale(args['locale'])
+
+        structures = args['structures']
+        parallel = args['parallel']
+
+        try:
+            if len(structures) > BATCH_LIMIT:
+                raise ValueError(f'{get_error_message(locale, "batch-size-error")} ({BATCH_LIMIT})')
+
+            # VALIDATE STRUCTURES
+            response = [None] * len(structures)
+            valid_structures = []
+            for idx, structure in enumerate(structures):
+                try:
+                    if not isinstance(structure, dict) or not isinstance(structure.get('data'), list):
+                        raise ValueError(get_error_message(locale, "batch-structure-error"))
+                    valid_structures.append((idx, nodes_type(structure['data'])))
+                except Exception as err:
+                    response[idx] = {
+                        "error": str(err)
+                    }
+
+            # CALCULATE
+            results = calculate_batch([data for _, data in valid_structures], locale, parallel)
+            for (idx, _), result in zip(valid_structures, results):
+                response[idx] = result
+
+            return {
+                "response": response
+            }
+
+        except Exception as err:
+            api.logger.info(str(err))
+            e = BadRequest(str(err))
+            raise e
+
+@api.route('/calculations/jobs')
+class CalculationJobs(Resource):
+    def post(self):
+        args = job_parser.parse_args()
+        # ARGUMENTS
+        locale = validate_locale(args['locale'])
+
+        data = args['data']
+        parallel = args['parallel']
+        timeout = args['timeout']
+
+        try:
+            # QUEUE CALCULATION
+            job = submit_job(data, locale, parallel, timeout, args['precision'])
+
+            return {
+                "response": job.get_status()
+            }
+
+        except Exception as err:
+            api.logger.info(str(err))
+            e = BadRequest(str(err))
+            raise e
+
+@api.route('/calculations/jobs/<string:job_id>')
+class CalculationJob(Resource):
+    def get(self, job_id):
+        args = locale_parser.parse_args()
+        # ARGUMENTS
+        locale = validate_locale(args['locale'])
+
+        try:
+            job = get_job(job_id, locale)
+
+            return {
+                "response": job.get_status()
+            }
+
+        except Exception as err:
+            api.logger.info(str(err))
+            e = BadRequest(str(err))
+            raise e
+
+    def delete(self, job_id):
+        args = locale_parser.parse_args()
+        # ARGUMENTS
+        locale = validate_locale(args['locale'])
+
+        try:
+            job = get_job(job_id, locale)
+            job.cancel()
+
+            return {
+                "response": job.get_status()
+            }
+
+        except Exception as err:
+            api.logger.info(str(err))
+            e = BadRequest(str(err))
+            raise e
+
+@api.route('/calculations/sessions')
+class CalculationSessions(Resource):
+    def post(self):
+        args = calculation_parser.parse_args()
+        # ARGUMENTS
+        locale = validate_locale(args['locale'])
+
+        data = args['data']
+        parallel = args['parallel']
 
         try:
             # CALCULATE
-            calculation = CalculationStructure(data, locale)
-            response = calculation.calculate()
+            session_id, response = create_session(data, locale, parallel, args['precision'])
 
             return {
+                "session_id": session_id,
                 "response": response
             }
 
@@ -55,6 +251,46 @@ class CalculationResults(Resource):
             e = BadRequest(str(err))
             raise e
 
+@api.route('/calculations/sessions/<string:session_id>')
+class CalculationSession(Resource):
+    def patch(self, session_id):
+        args = session_update_parser.parse_args()
+        # ARGUMENTS
+        locale = validate_locale(args['locale'])
+
+        try:
+            # CALCULATE CHANGED NODES
+            session = get_session(session_id, locale)
+            response = session.update(args['add'], args['change'], args['remove'], locale, args['parallel'])
+
+            return {
+                "session_id": session_id,
+                "response": response,
+                "removed": args['remove']
+            }
+
+        except Exception as err:
+            api.logger.info(str(err))
+            e = BadRequest(str(err))
+            raise e
+
+    def delete(self, session_id):
+        args = locale_parser.parse_args()
+        # ARGUMENTS
+        locale = validate_locale(args['locale'])
+
+        try:
+            remove_session(session_id, locale)
+
+            return {
+                "response": session_id
+            }
+
+        except Exception as err:
+            api.logger.info(str(err))
+            e = BadRequest(str(err))
+            raise e
+
 @api.route('/calculations/items')
 class CalculationResults(Resource):
     @api.expect(calculation_parser)
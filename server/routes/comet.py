@@ -0,0 +1,132 @@
+# Copyright (c) 2024 Jakub Więckowski
+
+from flask import Response, request, stream_with_context
+from flask_restx import Resource
+from werkzeug.exceptions import BadRequest
+import json
+
+# PARSERS
+from parsers import get_comet_fit_parser, get_comet_predict_parser, get_comet_stream_parser
+
+# CALCULATIONS
+from calculations.comet import fit_model, get_model
+
+# HELPERS
+from helpers import validate_locale
+
+# UTILS
+from utils.encoding import round_values
+
+# NAMESPACE
+from .namespaces import v1 as api
+
+# ARGUMENTS PARSERS
+fit_parser = get_comet_fit_parser()
+predict_parser = get_comet_predict_parser()
+stream_parser = get_comet_stream_parser()
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+def get_preferences(preferences, precision):
+    """
+    Rounds the preferences calculated in full precision for the response.
+
+    Parameters
+    ----------
+    preferences : ndarray
+        Preferences of the alternatives.
+    precision : int or None
+        Number of decimal places, None for the preferences without rounding.
+
+    Returns
+    -------
+    list
+        Preferences of the alternatives.
+    """
+    return preferences.tolist() if precision is None else round_values(preferences, precision)
+
+def stream_predictions(model, lines, locale, precision):
+    """
+    Streams the preferences of the alternatives given in the NDJSON request, as soon as each chunk is evaluated.
+
+    Parameters
+    ----------
+    model : CometModel
+        The fitted COMET model.
+    lines : iterable
+        Lines of the request body, each with the values of criteria of a single alternative.
+    locale : str
+        User application language.
+    precision : int or None
+        Number of decimal places of the preferences, None for the preferences without rounding.
+
+    Returns
+    -------
+    Response
+        The streamed response with the preference of each alternative in a separate line.
+        Error raised during the evaluation is sent as the last line with the 'message' key.
+    """
+    def generate():
+        try:
+            for preferences in model.predict_lines(lines, locale):
+                yield ''.join([f'{json.dumps(preference)}\n' for preference in get_preferences(preferences, precision)])
+        except Exception as err:
+            api.logger.info(str(err))
+            yield f'{json.dumps({"message": str(err)})}\n'
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
+
+@api.route('/comet/fit')
+class CometFit(Resource):
+    def post(self):
+        args = fit_parser.parse_args()
+        # ARGUMENTS
+        locale = validate_locale(args['locale'])
+
+        try:
+            model = fit_model(args['matrix'], args['criteria_types'], args['weights'], args['kwargs'], locale)
+
+            return {
+                "response": model.get_response()
+            }
+
+        except Exception as err:
+            api.logger.info(str(err))
+            e = BadRequest(str(err))
+            raise e
+
+@api.route('/comet/predict')
+class CometPredict(Resource):
+    def post(self):
+        if request.mimetype == NDJSON_MIMETYPE:
+            # alternatives are read from the request body line by line, the model is given in the query string
+            args = stream_parser.parse_args()
+            locale = validate_locale(args['locale'])
+
+            try:
+                model = get_model(args['model_id'], locale)
+                return stream_predictions(model, (line.decode('utf-8') for line in request.stream), locale, args['precision'])
+            except Exception as err:
+                api.logger.info(str(err))
+                e = BadRequest(str(err))
+                raise e
+
+        args = predict_parser.parse_args()
+        # ARGUMENTS
+        locale = validate_locale(args['locale'])
+
+        try:
+            model = get_model(args['model_id'], locale)
+            preferences = model.predict(args['alternatives'], locale)
+
+            return {
+                "response": {
+                    "model_id": model.id,
+                    "preference": get_preferences(preferences, args['precision']),
+                }
+            }
+
+        except Exception as err:
+            api.logger.info(str(err))
+            e = BadRequest(str(err))
+            raise e
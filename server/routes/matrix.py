@@ -14,6 +14,9 @@ from models import get_matrix_model
 from utils.files import Files
 from utils.generator import generate_random_criteria_types, generate_random_matrix
 
+# CALCULATIONS
+from calculations.matrices import store_matrix
+
 # HELPERS
 from helpers import validate_locale
 
@@ -42,12 +45,14 @@ class MatrixConverter(Resource):
         items = filename.split('.')
         try:
             m, ct = Files.read_matrix_from_file(locale, matrix, items[-1], extension)
+            handle = store_matrix(m, ct)
 
             return {
                 "response": {
                     "matrix": m.tolist(),
                     "criteria_types": ct.tolist(),
                     "extension": extension,
+                    "handle": handle,
                 }
             }
         except Exception as err:
@@ -75,12 +80,14 @@ class MatrixGenerator(Resource):
         try:
             matrix = generate_random_matrix(locale, alternatives, criteria, extension, lower_bound, upper_bound, precision)
             criteria_types = generate_random_criteria_types(locale, criteria)
+            handle = store_matrix(matrix, criteria_types)
             
             return {
                 "response": {
                     "matrix": matrix.tolist(),
                     "criteria_types": criteria_types.tolist(),
                     "extension": extension,
+                    "handle": handle,
                 }
             }
         except Exception as err:
@@ -8,6 +8,13 @@ from os.path import isfile, join
 import numpy as np
 import pandas as pd
 
+# CALCULATIONS
+from calculations.plan import plans
+from calculations.matrices import matrices
+
+# UTILS
+from utils.cache import preferences_cache, weights_cache, comet_cache, calculations_flight
+
 # NAMESPACE
 from .namespaces import v1 as api
 path = '../logs'
@@ -58,4 +65,18 @@ class StatisticsLogs(Resource):
         except Exception as err:
             api.logger.info(str(err))
             e = BadRequest(str(err))
-            raise e
\ No newline at end of file
+            raise e
+
+@api.route('/stats/cache')
+class StatisticsCache(Resource):
+    def get(self):
+        return {
+            "response": {
+                "preferences": preferences_cache.get_stats(),
+                "weights": weights_cache.get_stats(),
+                "comet": comet_cache.get_stats(),
+                "plans": plans.get_stats(),
+                "matrices": matrices.get_stats(),
+                "coalescing": calculations_flight.get_stats(),
+            }
+        }
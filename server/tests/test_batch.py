@@ -0,0 +1,110 @@
+# Copyright (c) 2024 Jakub Więckowski
+
+from server import app
+import json
+import pytest
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import calculations.pool
+from config import POOL_REQUEST_LIMIT
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+def get_structure(matrix, method):
+    return [
+        {
+            "id": 1,
+            "node_type": "matrix",
+            "extension": "crisp",
+            "matrix": matrix,
+            "criteria_types": [1, -1, 1],
+            "method": "input",
+            "connections_from": [],
+            "connections_to": [2],
+            "position_x": 10,
+            "position_y": 10,
+        },
+        {
+            "id": 2,
+            "node_type": "weights",
+            "extension": "crisp",
+            "weights": [],
+            "method": "ENTROPY",
+            "connections_from": [1],
+            "connections_to": [3],
+            "position_x": 20,
+            "position_y": 20,
+        },
+        {
+            "id": 3,
+            "node_type": "method",
+            "extension": "crisp",
+            "method": method,
+            "connections_from": [2],
+            "connections_to": [],
+            "kwargs": [],
+            "position_x": 30,
+            "position_y": 30,
+        }
+    ]
+
+@pytest.mark.parametrize('parallel', [False, True])
+def test_batch_calculation(client, parallel):
+    """
+        Test verifying that each structure of the batch is evaluated independently of errors in other structures
+    """
+    structures = [
+        {"data": get_structure([[6, 2, 3], [3, 7, 2], [2, 3, 8]], 'TOPSIS')},
+        {"data": get_structure([[6, 2, 3], [3, 7, 2], [2, 3, 8]], 'UNKNOWN')},
+        {"data": [{"id": 1}]},
+        {"data": get_structure([[1, 2, 3], [3, 1, 2], [2, 3, 1]], 'WSM')},
+    ]
+
+    response = client.post('/api/v1/calculations/calculate-batch', headers={'locale': 'en'}, json={'structures': structures, 'parallel': parallel}, content_type='application/json')
+    payload = json.loads(response.data.decode('utf-8'))
+
+    single_response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en'}, json={'data': structures[3]['data']}, content_type='application/json')
+    single_payload = json.loads(single_response.data.decode('utf-8'))
+
+    assert response.status_code == 200
+    assert len(payload['response']) == 4
+    assert len(payload['response'][0]['response']) == 3
+    assert 'error' in payload['response'][1]
+    assert 'Missing keys' in payload['response'][2]['error']
+    assert payload['response'][3]['response'] == single_payload['response']
+
+def test_batch_calculation_request_limit(client, monkeypatch):
+    """
+        Test verifying that the parallel batch does not evaluate more structures at the same time than the limit of a single request
+    """
+    executor = ThreadPoolExecutor(POOL_REQUEST_LIMIT * 2)
+    running = []
+    submitted = []
+
+    def delayed(function, *args):
+        time.sleep(0.05)
+        return function(*args)
+
+    class Pool:
+        def submit(self, function, *args):
+            submitted.append(len([item for item in running if not item.done()]) + 1)
+            future = executor.submit(delayed, function, *args)
+            running.append(future)
+            return future
+
+    monkeypatch.setattr(calculations.pool, 'get_pool', lambda: Pool())
+
+    structures = [{"data": get_structure([[6, 2, 3], [3, 7, 2], [2, 3, idx + 1]], 'TOPSIS')} for idx in range(POOL_REQUEST_LIMIT * 2 + 1)]
+    response = client.post('/api/v1/calculations/calculate-batch', headers={'locale': 'en'}, json={'structures': structures, 'parallel': True}, content_type='application/json')
+    payload = json.loads(response.data.decode('utf-8'))
+    executor.shutdown()
+
+    assert response.status_code == 200
+    assert all(['response' in item for item in payload['response']])
+    assert len(submitted) == len(structures)
+    assert max(submitted) <= POOL_REQUEST_LIMIT
@@ -0,0 +1,162 @@
+# Copyright (c) 2024 Jakub Więckowski
+
+from server import app
+from utils.encoding import decode_array
+import json
+import numpy as np
+import pytest
+
+BINARY_MIMETYPE = 'application/vnd.makedecision.binary+json'
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+def get_structure(extension, matrix, weights_method):
+    return [
+        {
+            "id": 1,
+            "node_type": "matrix",
+            "extension": extension,
+            "matrix": matrix,
+            "criteria_types": [1, -1, 1],
+            "method": "input",
+            "connections_from": [],
+            "connections_to": [2],
+            "position_x": 10,
+            "position_y": 10,
+        },
+        {
+            "id": 2,
+            "node_type": "weights",
+            "extension": extension,
+            "weights": [],
+            "method": weights_method,
+            "connections_from": [1],
+            "connections_to": [3, 4],
+            "position_x": 20,
+            "position_y": 20,
+        },
+        {
+            "id": 3,
+            "node_type": "method",
+            "extension": extension,
+            "method": "TOPSIS",
+            "connections_from": [2],
+            "connections_to": [5, 6],
+            "kwargs": [],
+            "position_x": 30,
+            "position_y": 30,
+        },
+        {
+            "id": 4,
+            "node_type": "method",
+            "extension": extension,
+            "method": "MABAC",
+            "connections_from": [2],
+            "connections_to": [5, 6],
+            "kwargs": [],
+            "position_x": 30,
+            "position_y": 40,
+        },
+        {
+            "id": 5,
+            "node_type": "ranking",
+            "extension": extension,
+            "method": "rank",
+            "connections_from": [3, 4],
+            "connections_to": [],
+            "position_x": 40,
+            "position_y": 40,
+        },
+        {
+            "id": 6,
+            "node_type": "correlation",
+            "extension": extension,
+            "method": "PEARSON",
+            "connections_from": [3, 4],
+            "connections_to": [],
+            "position_x": 50,
+            "position_y": 50,
+        }
+    ]
+
+@pytest.mark.parametrize('extension, matrix, weights_method', [
+    ('crisp', [[6, 2, 3], [3, 7, 2], [2, 3, 8], [4, 1, 5]], 'CRITIC'),
+    ('fuzzy', [["5, 6, 7", "1, 2, 3", "3, 3, 4"], ["2, 3, 4", "6, 7, 8", "1, 2, 3"], ["1, 2, 3", "2, 3, 4", "7, 8, 9"], ["4, 5, 6", "4, 5, 6", "3, 4, 5"]], 'EQUAL'),
+])
+def test_results_calculation_binary(client, extension, matrix, weights_method):
+    """
+        Test verifying that the numeric results encoded as binary buffers are the same as the results in JSON lists
+    """
+    data = get_structure(extension, matrix, weights_method)
+
+    response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en'}, json={'data': data}, content_type='application/json')
+    payload = json.loads(response.data.decode('utf-8'))
+
+    binary_response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en', 'Accept': BINARY_MIMETYPE}, json={'data': data}, content_type='application/json')
+    binary_payload = json.loads(binary_response.data.decode('utf-8'))
+
+    assert response.status_code == 200
+    assert binary_response.status_code == 200
+    assert binary_response.mimetype == BINARY_MIMETYPE
+
+    fields = {
+        'matrix': ['criteria_types'],
+        'weights': ['weights'],
+        'method': ['preference'],
+        'ranking': ['ranking'],
+        'correlation': ['correlation'],
+    }
+    for node, binary_node in zip(payload['response'], binary_payload['response']):
+        assert len(node['data']) == len(binary_node['data'])
+        for item, binary_item in zip(node['data'], binary_node['data']):
+            for key in fields[node['node_type']]:
+                assert binary_item[key]['dtype'] == '<f8'
+                assert np.array_equal(decode_array(binary_item[key]), np.array(item[key], dtype=float))
+
+    matrix = decode_array(binary_payload['response'][0]['data'][0]['matrix'])
+    if extension == 'fuzzy':
+        assert matrix.shape == (4, 3, 3)
+        assert [[', '.join(map(str, cell)) for cell in row] for row in matrix.tolist()] == payload['response'][0]['data'][0]['matrix']
+    else:
+        assert matrix.shape == (4, 3)
+        assert np.array_equal(matrix, np.array(payload['response'][0]['data'][0]['matrix'], dtype=float))
+
+def test_results_calculation_binary_smaa(client):
+    """
+        Test verifying that the central weights of alternatives which are never the best are encoded as NaN values
+    """
+    data = get_structure('crisp', [[6, 2, 3], [3, 7, 2], [2, 3, 8], [1, 9, 1]], 'EQUAL')[:3]
+    data[2]['connections_to'] = [4]
+    data[1]['connections_to'] = [3]
+    data.append({
+        "id": 4,
+        "node_type": "smaa",
+        "extension": "crisp",
+        "method": "simplex",
+        "connections_from": [3],
+        "connections_to": [],
+        "kwargs": [{"samples": 2000, "seed": 3}],
+        "position_x": 40,
+        "position_y": 40,
+    })
+
+    response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en'}, json={'data': data}, content_type='application/json')
+    result = json.loads(response.data.decode('utf-8'))['response'][3]['data'][0]
+
+    binary_response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en', 'Accept': BINARY_MIMETYPE}, json={'data': data}, content_type='application/json')
+    binary_result = json.loads(binary_response.data.decode('utf-8'))['response'][3]['data'][0]
+
+    assert response.status_code == 200
+    assert binary_response.status_code == 200
+    assert np.array_equal(decode_array(binary_result['acceptability']), np.array(result['acceptability']))
+    assert None in result['central_weights']
+    central_weights = decode_array(binary_result['central_weights'])
+    for row, binary_row in zip(result['central_weights'], central_weights):
+        if row is None:
+            assert np.all(np.isnan(binary_row))
+        else:
+            assert np.array_equal(binary_row, row)
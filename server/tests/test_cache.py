@@ -0,0 +1,414 @@
+# Copyright (c) 2024 Jakub Więckowski
+
+from server import app
+import json
+import threading
+import time
+import pytest
+import numpy as np
+from pyfdm.helpers import rank
+
+from calculations.plan import plans
+from utils.cache import LRUCache, SingleFlight
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+def test_cache_repeated_calculation(client):
+    """
+        Test verifying that the repeated calculation reuses results stored in the cache shared between requests
+    """
+    data = [
+        {
+            "id": 1,
+            "node_type": "matrix",
+            "extension": "crisp",
+            "matrix": [
+                [11, 2, 3],
+                [3, 17, 2],
+                [2, 3, 18],
+            ],
+            "criteria_types": [1, -1, 1],
+            "method": "input",
+            "connections_from": [],
+            "connections_to": [2],
+            "position_x": 10,
+            "position_y": 10,
+        },
+        {
+            "id": 2,
+            "node_type": "weights",
+            "extension": "crisp",
+            "weights": [],
+            "method": "ENTROPY",
+            "connections_from": [1],
+            "connections_to": [3],
+            "position_x": 20,
+            "position_y": 20,
+        },
+        {
+            "id": 3,
+            "node_type": "method",
+            "extension": "crisp",
+            "method": "TOPSIS",
+            "connections_from": [2],
+            "connections_to": [],
+            "kwargs": [],
+            "position_x": 30,
+            "position_y": 30,
+        }
+    ]
+
+    stats = json.loads(client.get('/api/v1/stats/cache').data.decode('utf-8'))['response']
+
+    response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en'}, json={'data': data}, content_type='application/json')
+    payload = json.loads(response.data.decode('utf-8'))
+
+    repeated_response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en'}, json={'data': data}, content_type='application/json')
+    repeated_payload = json.loads(repeated_response.data.decode('utf-8'))
+
+    new_stats = json.loads(client.get('/api/v1/stats/cache').data.decode('utf-8'))['response']
+
+    assert repeated_response.status_code == 200
+    assert repeated_payload == payload
+    assert new_stats['preferences']['hits'] - stats['preferences']['hits'] >= 1
+    assert new_stats['weights']['hits'] - stats['weights']['hits'] >= 1
+
+def test_cache_eviction():
+    """
+        Test verifying that the least recently used and expired items are evicted from the cache
+    """
+    cache = LRUCache(size=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get_stats() == {'size': 2, 'hits': 2, 'misses': 1, 'evictions': 1}
+
+    expired_cache = LRUCache(size=2, ttl=-1)
+    expired_cache.set('a', 1)
+
+    assert expired_cache.get('a') is None
+    assert expired_cache.get_stats()['evictions'] == 1
+
+@pytest.mark.parametrize('kwargs', [
+    {"expert_function": "method_expert"},
+    {"expert_function": "esp_expert", "esp": [5, 1, 5]},
+])
+def test_cache_comet_model(client, kwargs):
+    """
+        Test verifying that the fitted COMET model is reused for other matrix with the same characteristic values
+    """
+    def get_structure(matrix):
+        return [
+            {
+                "id": 1,
+                "node_type": "matrix",
+                "extension": "crisp",
+                "matrix": matrix,
+                "criteria_types": [1, -1, 1],
+                "method": "input",
+                "connections_from": [],
+                "connections_to": [2],
+                "position_x": 10,
+                "position_y": 10,
+            },
+            {
+                "id": 2,
+                "node_type": "weights",
+                "extension": "crisp",
+                "weights": [0.4, 0.35, 0.25],
+                "method": "INPUT",
+                "connections_from": [1],
+                "connections_to": [3],
+                "position_x": 20,
+                "position_y": 20,
+            },
+            {
+                "id": 3,
+                "node_type": "method",
+                "extension": "crisp",
+                "method": "COMET",
+                "connections_from": [2],
+                "connections_to": [],
+                "kwargs": [{"matrix_id": 1, **kwargs}],
+                "position_x": 30,
+                "position_y": 30,
+            }
+        ]
+
+    # the same minimum and maximum of each criterion give the same characteristic values
+    matrices = [
+        [[1, 2, 9], [9, 7, 2], [4, 3, 1], [7, 9, 8]],
+        [[9, 2, 1], [1, 9, 9], [5, 6, 4], [3, 4, 5]],
+    ]
+
+    stats = json.loads(client.get('/api/v1/stats/cache').data.decode('utf-8'))['response']
+
+    responses = [client.post('/api/v1/calculations/calculate', headers={'locale': 'en'}, json={'data': get_structure(matrix)}, content_type='application/json') for matrix in matrices]
+
+    new_stats = json.loads(client.get('/api/v1/stats/cache').data.decode('utf-8'))['response']
+
+    assert all([response.status_code == 200 for response in responses])
+    assert new_stats['comet']['hits'] - stats['comet']['hits'] >= 1
+
+    preferences = [json.loads(response.data.decode('utf-8'))['response'][2]['data'][0]['preference'] for response in responses]
+    assert preferences[0] != preferences[1]
+
+def test_cache_plan(client):
+    """
+        Test verifying that the structures with the same topology reuse the compiled plan and give the same results as the structure compiled from scratch
+    """
+    def get_structure(matrix, kwargs):
+        return [
+            {
+                "id": 1,
+                "node_type": "matrix",
+                "extension": "crisp",
+                "matrix": matrix,
+                "criteria_types": [1, -1, 1],
+                "method": "input",
+                "connections_from": [],
+                "connections_to": [2],
+                "position_x": 10,
+                "position_y": 10,
+            },
+            {
+                "id": 2,
+                "node_type": "weights",
+                "extension": "crisp",
+                "weights": [],
+                "method": "CRITIC",
+                "connections_from": [1],
+                "connections_to": [3, 4],
+                "position_x": 20,
+                "position_y": 20,
+            },
+            {
+                "id": 3,
+                "node_type": "method",
+                "extension": "crisp",
+                "method": "VIKOR",
+                "connections_from": [2],
+                "connections_to": [5],
+                "kwargs": [{"matrix_id": 1, **kwargs}],
+                "position_x": 30,
+                "position_y": 30,
+            },
+            {
+                "id": 4,
+                "node_type": "method",
+                "extension": "crisp",
+                "method": "TOPSIS",
+                "connections_from": [2],
+                "connections_to": [5],
+                "kwargs": [],
+                "position_x": 30,
+                "position_y": 40,
+            },
+            {
+                "id": 5,
+                "node_type": "ranking",
+                "extension": "crisp",
+                "method": "rank",
+                "connections_from": [3, 4],
+                "connections_to": [],
+                "position_x": 40,
+                "position_y": 40,
+            }
+        ]
+
+    matrices = [
+        [[1, 2, 9], [9, 7, 2], [4, 3, 1], [7, 9, 8]],
+        [[9, 2, 1], [1, 9, 9], [5, 6, 4], [3, 4, 5]],
+    ]
+    kwargs = {"v": 0.3, "normalization_function": "max_normalization"}
+
+    responses = []
+    for matrix in matrices:
+        plans.clear()
+        response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en'}, json={'data': get_structure(matrix, kwargs)}, content_type='application/json')
+        responses.append(json.loads(response.data.decode('utf-8'))['response'])
+
+    stats = json.loads(client.get('/api/v1/stats/cache').data.decode('utf-8'))['response']
+    # the same topology with other decision matrix
+    response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en'}, json={'data': get_structure(matrices[0], kwargs)}, content_type='application/json')
+    new_stats = json.loads(client.get('/api/v1/stats/cache').data.decode('utf-8'))['response']
+
+    assert response.status_code == 200
+    assert new_stats['plans']['hits'] - stats['plans']['hits'] == 1
+    assert json.loads(response.data.decode('utf-8'))['response'] == responses[0]
+
+    # other parameters of the method give other plan
+    response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en'}, json={'data': get_structure(matrices[1], kwargs | {"v": 0.7})}, content_type='application/json')
+    final_stats = json.loads(client.get('/api/v1/stats/cache').data.decode('utf-8'))['response']
+
+    assert response.status_code == 200
+    assert final_stats['plans']['misses'] - new_stats['plans']['misses'] == 1
+    assert json.loads(response.data.decode('utf-8'))['response'][2]['data'][0]['preference'] != responses[1][2]['data'][0]['preference']
+
+def test_cache_plan_fuzzy_rankings(client):
+    """
+        Test verifying that the fuzzy method connected with many weights nodes ranks the preferences calculated with each vector of weights, also with the compiled plan
+    """
+    matrix = [[[1, 2, 3], [4, 5, 6], [7, 8, 9]], [[5, 7, 8], [7, 8, 9], [3, 4, 5]], [[2, 3, 4], [5, 7, 9], [6, 8, 9]], [[1, 3, 5], [2, 4, 6], [3, 5, 7]]]
+    data = [
+        {"id": 1, "node_type": "matrix", "extension": "fuzzy", "matrix": matrix, "criteria_types": [1, -1, 1], "method": "input", "connections_from": [], "connections_to": [2, 3], "position_x": 10, "position_y": 10},
+        {"id": 2, "node_type": "weights", "extension": "fuzzy", "weights": [[0.1, 0.2, 0.3], [0.2, 0.3, 0.4], [0.5, 0.6, 0.7]], "method": "INPUT", "connections_from": [1], "connections_to": [4], "position_x": 20, "position_y": 20},
+        {"id": 3, "node_type": "weights", "extension": "fuzzy", "weights": [[0.5, 0.6, 0.7], [0.2, 0.3, 0.4], [0.1, 0.2, 0.3]], "method": "INPUT", "connections_from": [1], "connections_to": [4], "position_x": 20, "position_y": 30},
+        {"id": 4, "node_type": "method", "extension": "fuzzy", "method": "TOPSIS", "connections_from": [2, 3], "connections_to": [5], "kwargs": [], "position_x": 30, "position_y": 30},
+        {"id": 5, "node_type": "ranking", "extension": "fuzzy", "method": "rank", "connections_from": [4], "connections_to": [], "position_x": 40, "position_y": 40},
+    ]
+
+    plans.clear()
+    for _ in range(2):
+        response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en'}, json={'data': data, 'precision': None}, content_type='application/json')
+        payload = json.loads(response.data.decode('utf-8'))['response']
+
+        assert response.status_code == 200
+        preferences = [item['preference'] for item in payload[3]['data']]
+        rankings = [item['ranking'] for item in payload[4]['data']]
+        assert preferences[0] != preferences[1]
+        assert rankings == [rank(np.array(preference)).tolist() for preference in preferences]
+
+def test_cache_fuzzy_ranking(client):
+    """
+        Test verifying that the fuzzy preferences taken from the cache are ranked as by the method object which calculated them
+    """
+    from pyfdm.methods import fVIKOR
+
+    matrix = [[[1, 2, 3], [4, 5, 6], [7, 8, 9]], [[5, 7, 8], [7, 8, 9], [3, 4, 5]], [[2, 3, 4], [5, 7, 9], [6, 8, 9]], [[1, 3, 5], [2, 4, 6], [3, 5, 7]]]
+    weights = [
+        [[0.1, 0.2, 0.3], [0.2, 0.3, 0.4], [0.5, 0.6, 0.7]],
+        [[0.5, 0.6, 0.7], [0.2, 0.3, 0.4], [0.1, 0.2, 0.3]],
+    ]
+
+    def get_structure(weights):
+        return [
+            {"id": 1, "node_type": "matrix", "extension": "fuzzy", "matrix": matrix, "criteria_types": [1, -1, 1], "method": "input", "connections_from": [], "connections_to": [2], "position_x": 10, "position_y": 10},
+            {"id": 2, "node_type": "weights", "extension": "fuzzy", "weights": weights, "method": "INPUT", "connections_from": [1], "connections_to": [3], "position_x": 20, "position_y": 20},
+            {"id": 3, "node_type": "method", "extension": "fuzzy", "method": "VIKOR", "connections_from": [2], "connections_to": [4], "kwargs": [{"matrix_id": 1, "v": 0.3}], "position_x": 30, "position_y": 30},
+            {"id": 4, "node_type": "ranking", "extension": "fuzzy", "method": "rank", "connections_from": [3], "connections_to": [], "position_x": 40, "position_y": 40},
+        ]
+
+    expected = []
+    for w in weights:
+        method_obj = fVIKOR()
+        method_obj(np.array(matrix, dtype=float), np.array(w), np.array([1, -1, 1]), v=0.3)
+        expected.append(method_obj.rank()[2].tolist())
+
+    # the second round takes the preferences from the cache
+    for _ in range(2):
+        for w, ranking in zip(weights, expected):
+            response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en'}, json={'data': get_structure(w)}, content_type='application/json')
+
+            assert response.status_code == 200
+            assert json.loads(response.data.decode('utf-8'))['response'][3]['data'][0]['ranking'] == ranking
+
+def test_cache_method_object(client, monkeypatch):
+    """
+        Test verifying that the preferences taken from the cache do not require the method object to be created
+    """
+    import calculations.node as node
+
+    calls = []
+    create_method_object = node.create_method_object
+    def counted(*args, **kwargs):
+        calls.append(args[0])
+        return create_method_object(*args, **kwargs)
+    monkeypatch.setattr(node, 'create_method_object', counted)
+
+    matrix = [[[2, 3, 4], [4, 5, 6], [7, 8, 9]], [[5, 7, 8], [7, 8, 9], [3, 4, 5]], [[2, 3, 4], [5, 7, 9], [6, 8, 9]], [[1, 3, 5], [2, 4, 6], [3, 5, 7]]]
+    data = [
+        {"id": 1, "node_type": "matrix", "extension": "fuzzy", "matrix": matrix, "criteria_types": [1, -1, 1], "method": "input", "connections_from": [], "connections_to": [2], "position_x": 10, "position_y": 10},
+        {"id": 2, "node_type": "weights", "extension": "fuzzy", "weights": [[0.3, 0.4, 0.5], [0.1, 0.2, 0.3], [0.2, 0.3, 0.4]], "method": "INPUT", "connections_from": [1], "connections_to": [3], "position_x": 20, "position_y": 20},
+        {"id": 3, "node_type": "method", "extension": "fuzzy", "method": "VIKOR", "connections_from": [2], "connections_to": [4], "kwargs": [{"matrix_id": 1, "v": 0.4}], "position_x": 30, "position_y": 30},
+        {"id": 4, "node_type": "ranking", "extension": "fuzzy", "method": "rank", "connections_from": [3], "connections_to": [], "position_x": 40, "position_y": 40},
+    ]
+
+    payloads = []
+    for _ in range(2):
+        response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en'}, json={'data': data}, content_type='application/json')
+        assert response.status_code == 200
+        payloads.append(json.loads(response.data.decode('utf-8'))['response'])
+
+    assert payloads[0] == payloads[1]
+    assert calls == ['VIKOR']
+
+def test_cache_parallel_calculation(client, monkeypatch):
+    """
+        Test verifying that the preferences calculated in the worker processes are cached in the server process and reused without sending the jobs again
+    """
+    import calculations.structure as structure
+
+    sent = []
+    map_jobs = structure.map_jobs
+    def spy(jobs, *args, **kwargs):
+        sent.extend([function.__name__ for function, _ in jobs])
+        return map_jobs(jobs, *args, **kwargs)
+    monkeypatch.setattr(structure, 'map_jobs', spy)
+
+    data = [
+        {"id": 1, "node_type": "matrix", "extension": "crisp", "matrix": [[4, 2, 9], [9, 7, 2], [4, 3, 1], [7, 9, 8]], "criteria_types": [1, -1, 1], "method": "input", "connections_from": [], "connections_to": [2, 3], "position_x": 10, "position_y": 10},
+        {"id": 2, "node_type": "weights", "extension": "crisp", "weights": [0.2, 0.5, 0.3], "method": "INPUT", "connections_from": [1], "connections_to": [4], "position_x": 20, "position_y": 20},
+        {"id": 3, "node_type": "weights", "extension": "crisp", "weights": [], "method": "EQUAL", "connections_from": [1], "connections_to": [4], "position_x": 20, "position_y": 30},
+        {"id": 4, "node_type": "method", "extension": "crisp", "method": "MABAC", "connections_from": [2, 3], "connections_to": [5], "kwargs": [], "position_x": 30, "position_y": 30},
+        {"id": 5, "node_type": "ranking", "extension": "crisp", "method": "rank", "connections_from": [4], "connections_to": [], "position_x": 40, "position_y": 40},
+    ]
+
+    payloads = []
+    for _ in range(2):
+        response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en'}, json={'data': data, 'parallel': True}, content_type='application/json')
+        assert response.status_code == 200
+        payloads.append(json.loads(response.data.decode('utf-8'))['response'])
+
+    assert payloads[0] == payloads[1]
+    assert len(payloads[1][3]['data']) == 2
+    # the second calculation takes both preferences from the cache of the server process
+    assert sent == ['calculate_method_batch_job']
+
+def test_cache_coalescing():
+    """
+        Test verifying that the identical calls made during the evaluation wait for its result instead of evaluating the function again
+    """
+    flight = SingleFlight()
+    release = threading.Event()
+    evaluations = []
+
+    def evaluate():
+        evaluations.append(1)
+        release.wait(5)
+        return {"response": [1, 2, 3]}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do('key', evaluate))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+
+    deadline = time.monotonic() + 5
+    while flight.get_stats()['coalesced'] < 4 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert flight.get_stats() == {'in_flight': 1, 'executed': 1, 'coalesced': 4}
+
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(evaluations) == 1
+    assert results == [{"response": [1, 2, 3]}] * 5
+    assert flight.get_stats()['in_flight'] == 0
+
+    def fail():
+        raise ValueError('error')
+
+    # the next call is evaluated again, also after the error
+    with pytest.raises(ValueError):
+        flight.do('key', fail)
+    assert flight.do('key', lambda: 4) == 4
+    assert flight.get_stats() == {'in_flight': 0, 'executed': 3, 'coalesced': 4}
@@ -0,0 +1,173 @@
+# Copyright (c) 2024 Jakub Więckowski
+
+from server import app
+import json
+import numpy as np
+import pytest
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+matrix = [
+    [6, 2, 3, 4],
+    [3, 7, 2, 5],
+    [2, 3, 8, 1],
+    [5, 5, 4, 4],
+    [4, 1, 6, 7],
+]
+criteria_types = [1, -1, 1, 1]
+weights = [0.3, 0.2, 0.25, 0.25]
+
+def fit(client, kwargs):
+    response = client.post('/api/v1/comet/fit', headers={'locale': 'en'}, json={'matrix': matrix, 'criteria_types': criteria_types, 'weights': weights, 'kwargs': kwargs}, content_type='application/json')
+    return response, json.loads(response.data.decode('utf-8'))
+
+@pytest.mark.parametrize('kwargs', [
+    {"expert_function": "method_expert"},
+    {"expert_function": "esp_expert", "esp": [6, 1, 8, 7]},
+    {"expert_function": "compromise_expert"},
+])
+def test_comet_fit_predict(client, kwargs):
+    """
+        Test verifying that the alternatives evaluated with the stored model get the same preferences as in the calculation of the COMET method
+    """
+    response, payload = fit(client, kwargs)
+
+    assert response.status_code == 200
+    assert payload['response']['characteristic_objects'] == 3 ** 4
+    model_id = payload['response']['model_id']
+
+    data = [
+        {
+            "id": 1,
+            "node_type": "matrix",
+            "extension": "crisp",
+            "matrix": matrix,
+            "criteria_types": criteria_types,
+            "method": "input",
+            "connections_from": [],
+            "connections_to": [2],
+            "position_x": 10,
+            "position_y": 10,
+        },
+        {
+            "id": 2,
+            "node_type": "weights",
+            "extension": "crisp",
+            "weights": weights,
+            "method": "INPUT",
+            "connections_from": [1],
+            "connections_to": [3],
+            "position_x": 20,
+            "position_y": 20,
+        },
+        {
+            "id": 3,
+            "node_type": "method",
+            "extension": "crisp",
+            "method": "COMET",
+            "connections_from": [2],
+            "connections_to": [],
+            "kwargs": [{"matrix_id": 1, **kwargs}],
+            "position_x": 30,
+            "position_y": 30,
+        }
+    ]
+    calculation = client.post('/api/v1/calculations/calculate', headers={'locale': 'en'}, json={'data': data}, content_type='application/json')
+    expected = json.loads(calculation.data.decode('utf-8'))['response'][2]['data'][0]['preference']
+
+    response = client.post('/api/v1/comet/predict', headers={'locale': 'en'}, json={'model_id': model_id, 'alternatives': matrix}, content_type='application/json')
+    payload = json.loads(response.data.decode('utf-8'))
+
+    assert response.status_code == 200
+    assert np.allclose(payload['response']['preference'], expected, atol=1e-3)
+
+def test_comet_predict_stream(client):
+    """
+        Test verifying that the alternatives streamed as NDJSON lines get the same preferences as the alternatives given in JSON
+    """
+    _, payload = fit(client, {"expert_function": "method_expert"})
+    model_id = payload['response']['model_id']
+
+    rng = np.random.default_rng(4)
+    alternatives = np.round(rng.uniform(1, 8, (200, 4)), 2).tolist()
+
+    response = client.post('/api/v1/comet/predict', headers={'locale': 'en'}, json={'model_id': model_id, 'alternatives': alternatives}, content_type='application/json')
+    expected = json.loads(response.data.decode('utf-8'))['response']['preference']
+
+    body = ''.join([f'{json.dumps(alternative)}\n' for alternative in alternatives])
+    stream_response = client.post(f'/api/v1/comet/predict?model_id={model_id}', headers={'locale': 'en'}, data=body, content_type='application/x-ndjson')
+    lines = stream_response.data.decode('utf-8').strip().split('\n')
+
+    assert stream_response.status_code == 200
+    assert stream_response.mimetype == 'application/x-ndjson'
+    assert [json.loads(line) for line in lines] == expected
+
+@pytest.mark.parametrize('model_id, alternatives', [('unknown', [[1, 2, 3, 4]]), (None, [[1, 2, 3]]), (None, [[1, 2, 'a', 4]])])
+def test_comet_predict_error(client, model_id, alternatives):
+    """
+        Test verifying that the evaluation with the unknown model or with the alternatives of other number of criteria is rejected
+    """
+    _, payload = fit(client, {"expert_function": "method_expert"})
+
+    response = client.post('/api/v1/comet/predict', headers={'locale': 'en'}, json={'model_id': model_id or payload['response']['model_id'], 'alternatives': alternatives}, content_type='application/json')
+
+    assert response.status_code == 400
+
+def test_comet_fit_error(client):
+    """
+        Test verifying that the model with the unknown expert function is rejected
+    """
+    response, payload = fit(client, {"expert_function": "manual_expert"})
+
+    assert response.status_code == 400
+    assert 'Expert function' in payload['message']
+
+def test_comet_compromise_expert_cvalues(client):
+    """
+        Test verifying that the model with the compromise expert is fitted for five characteristic values of each criterion
+    """
+    cvalues = [np.linspace(np.min(column), np.max(column), 5).tolist() for column in np.array(matrix, dtype=float).T]
+    response, payload = fit(client, {"expert_function": "compromise_expert", "cvalues": cvalues})
+
+    assert response.status_code == 200
+    assert payload['response']['characteristic_objects'] == 5 ** 4
+
+    response = client.post('/api/v1/comet/predict', headers={'locale': 'en'}, json={'model_id': payload['response']['model_id'], 'alternatives': matrix}, content_type='application/json')
+    preference = json.loads(response.data.decode('utf-8'))['response']['preference']
+
+    assert response.status_code == 200
+    assert np.all((np.array(preference) >= 0) & (np.array(preference) <= 1))
+
+@pytest.mark.parametrize('precision', [0, 3, 6])
+def test_comet_predict_precision(client, precision):
+    """
+        Test verifying that the preferences are calculated in full precision and rounded only in the response to the requested number of decimal places
+    """
+    _, payload = fit(client, {"expert_function": "method_expert"})
+    model_id = payload['response']['model_id']
+
+    rng = np.random.default_rng(5)
+    alternatives = np.round(rng.uniform(1, 8, (20, 4)), 3).tolist()
+    body = ''.join([f'{json.dumps(alternative)}\n' for alternative in alternatives])
+
+    def predict(precision):
+        response = client.post('/api/v1/comet/predict', headers={'locale': 'en'}, json={'model_id': model_id, 'alternatives': alternatives, 'precision': precision}, content_type='application/json')
+        stream_response = client.post(f'/api/v1/comet/predict?model_id={model_id}&precision={json.dumps(precision)}', headers={'locale': 'en'}, data=body, content_type='application/x-ndjson')
+        lines = stream_response.data.decode('utf-8').strip().split('\n')
+
+        assert response.status_code == 200
+        assert stream_response.status_code == 200
+        preference = json.loads(response.data.decode('utf-8'))['response']['preference']
+        assert [json.loads(line) for line in lines] == preference
+
+        return preference
+
+    full = predict(None)
+    preference = predict(precision)
+
+    assert any([value != round(value, 6) for value in full])
+    assert preference == np.round(full, precision).tolist()
@@ -2,7 +2,11 @@
 
 from server import app
 import json
+import numpy as np
 import pytest
+from pymcdm.helpers import correlation_matrix, rrankdata
+
+from methods import correlation_methods, correlation_kernels
 
 @pytest.fixture
 def client():
@@ -520,4 +524,24 @@ def test_results_calculation_crisp_wrong_correlation(client):
     payload = json.loads(response.data.decode('utf-8'))
 
     assert response.status_code == 400
-    assert 'message' in list(payload.keys())
\ No newline at end of file
+    assert 'message' in list(payload.keys())
+
+@pytest.mark.parametrize('method', list(correlation_kernels.keys()))
+@pytest.mark.parametrize('rows, alternatives', [(2, 2), (5, 7), (12, 30), (30, 17)])
+def test_correlation_kernels_parity(method, rows, alternatives):
+    """
+        Test verifying that the kernel gives the correlation matrix identical to the correlation method evaluated for each pair of rows
+    """
+    rng = np.random.default_rng(5)
+
+    data = rng.random((rows, alternatives))
+    if method not in ['PEARSON']:
+        data = np.array([rrankdata(row) for row in data], dtype=float)
+    # identical rows and tied values
+    data[-1] = data[0]
+    data[1, :2] = data[1, 0]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        expected = correlation_matrix(data, correlation_methods[method])
+
+    assert np.array_equal(correlation_kernels[method](data, 64), expected, equal_nan=True)
@@ -0,0 +1,149 @@
+# Copyright (c) 2024 Jakub Więckowski
+
+from server import app
+import json
+import time
+import pytest
+
+import calculations.jobs
+from calculations.structure import CalculationStructure
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+def get_structure():
+    return [
+        {
+            "id": 1,
+            "node_type": "matrix",
+            "extension": "crisp",
+            "matrix": [
+                [6, 2, 3],
+                [3, 7, 2],
+                [2, 3, 8],
+            ],
+            "criteria_types": [1, -1, 1],
+            "method": "input",
+            "connections_from": [],
+            "connections_to": [2],
+            "position_x": 10,
+            "position_y": 10,
+        },
+        {
+            "id": 2,
+            "node_type": "weights",
+            "extension": "crisp",
+            "weights": [],
+            "method": "EQUAL",
+            "connections_from": [1],
+            "connections_to": [3],
+            "position_x": 20,
+            "position_y": 20,
+        },
+        {
+            "id": 3,
+            "node_type": "method",
+            "extension": "crisp",
+            "method": "TOPSIS",
+            "connections_from": [2],
+            "connections_to": [],
+            "kwargs": [],
+            "position_x": 30,
+            "position_y": 30,
+        }
+    ]
+
+def wait_for_job(client, job_id):
+    for _ in range(100):
+        payload = json.loads(client.get(f'/api/v1/calculations/jobs/{job_id}', headers={'locale': 'en'}).data.decode('utf-8'))
+        if payload['response']['status'] not in ['queued', 'running']:
+            return payload
+        time.sleep(0.05)
+    return payload
+
+def test_jobs_calculation(client):
+    """
+        Test verifying that the queued calculation job gives the same results as the synchronous calculation
+    """
+    data = get_structure()
+
+    response = client.post('/api/v1/calculations/jobs', headers={'locale': 'en'}, json={'data': data}, content_type='application/json')
+    payload = json.loads(response.data.decode('utf-8'))
+
+    assert response.status_code == 200
+    assert payload['response']['progress']['total'] == 3
+
+    job_payload = wait_for_job(client, payload['response']['job_id'])
+
+    sync_response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en'}, json={'data': data}, content_type='application/json')
+    sync_payload = json.loads(sync_response.data.decode('utf-8'))
+
+    assert job_payload['response']['status'] == 'finished'
+    assert job_payload['response']['progress'] == {'done': 3, 'total': 3}
+    assert job_payload['response']['response'] == sync_payload['response']
+
+def test_jobs_timeout(client):
+    """
+        Test verifying that the calculation job is stopped after exceeding the time limit
+    """
+    response = client.post('/api/v1/calculations/jobs', headers={'locale': 'en'}, json={'data': get_structure(), 'timeout': 1e-9}, content_type='application/json')
+    payload = json.loads(response.data.decode('utf-8'))
+
+    job_payload = wait_for_job(client, payload['response']['job_id'])
+
+    assert job_payload['response']['status'] == 'failed'
+    assert 'time limit' in job_payload['response']['error']
+    assert 'response' not in job_payload['response']
+
+def test_jobs_errors(client):
+    """
+        Test verifying that the invalid time limit and unknown jobs are rejected
+    """
+    response = client.post('/api/v1/calculations/jobs', headers={'locale': 'en'}, json={'data': get_structure(), 'timeout': -1}, content_type='application/json')
+    assert response.status_code == 400
+
+    response = client.get('/api/v1/calculations/jobs/unknown', headers={'locale': 'en'})
+    assert response.status_code == 400
+
+    response = client.delete('/api/v1/calculations/jobs/unknown', headers={'locale': 'en'})
+    assert response.status_code == 400
+
+def test_jobs_limit(client, monkeypatch):
+    """
+        Test verifying that the new jobs are rejected when the limit of jobs is reached
+    """
+    monkeypatch.setattr(calculations.jobs, 'JOBS_LIMIT', 0)
+
+    response = client.post('/api/v1/calculations/jobs', headers={'locale': 'en'}, json={'data': get_structure()}, content_type='application/json')
+    payload = json.loads(response.data.decode('utf-8'))
+
+    assert response.status_code == 400
+    assert 'Maximum number of jobs' in payload['message']
+
+@pytest.mark.parametrize('parallel', [False, True])
+@pytest.mark.parametrize('node_type, method, kwargs', [
+    ('smaa', 'uniform', [{"samples": 2000, "seed": 3}]),
+    ('sensitivity', 'uniform', [{"samples": 2000, "seed": 3}]),
+    ('method', 'COMET', [{"matrix_id": 1, "expert_function": "compromise_expert"}]),
+])
+def test_jobs_timeout_chunks(node_type, method, kwargs, parallel):
+    """
+        Test verifying that the chunks of the SMAA, sensitivity analysis and COMET model are not evaluated after the deadline
+    """
+    data = get_structure()
+    # matrix not used in other tests, so the COMET model is not taken from the cache
+    data[0]['matrix'] = [[6, 2, 3], [3, 7, 2], [2, 3, 8], [4, 5, 1], [7, 1, 4]]
+    if node_type == 'method':
+        data[2] |= {"method": method, "kwargs": kwargs}
+    else:
+        data[2]['connections_to'] = [4]
+        data.append({"id": 4, "node_type": node_type, "extension": "crisp", "method": method, "connections_from": [3], "connections_to": [], "kwargs": kwargs, "position_x": 40, "position_y": 40})
+
+    calculation = CalculationStructure(data, 'en', parallel)
+    calculation.deadline = time.monotonic() - 1
+
+    with pytest.raises(TimeoutError):
+        calculation.calculate()
@@ -1,6 +1,7 @@
 # Copyright (c) 2023 - 2024 Jakub Więckowski
 
 from server import app
+import io
 import json
 import pytest
 
@@ -126,4 +127,128 @@ def test_matrix_upload_invalid_extension(client):
 
     assert response.status_code == 400
     assert 'message' in list(payload.keys())
-    
\ No newline at end of file
+    
+@pytest.mark.parametrize('filename', ['fuzzy_data CSV.csv', 'fuzzy_data XLSX.xlsx', 'fuzzy_data JSON.json'])
+def test_matrix_upload_fuzzy_dense(client, filename):
+    """
+        Test verifying that the fuzzy matrix from each file type is converted to the same array of Triangular Fuzzy Numbers
+    """
+
+    data = {
+            'matrix': (open(f'./examples/matrix_files/{filename}', 'rb'), filename),
+            'extension': 'fuzzy'
+        }
+
+    response = client.post('/api/v1/matrix/upload', 
+                        headers={'locale': 'en'}, 
+                        data=data,
+                        content_type='multipart/form-data',
+                        follow_redirects=True)
+    payload = json.loads(response.data.decode('utf-8'))
+
+    assert response.status_code == 200
+    assert payload['response']['matrix'][0] == [[1.0, 2.0, 3.0], [3.0, 4.0, 5.0], [2.0, 3.0, 4.0]]
+    assert all([len(row) == 3 and all([len(col) == 3 for col in row]) for row in payload['response']['matrix']])
+
+@pytest.mark.parametrize('filename', ['fuzzy_data CSV bad1.csv', 'fuzzy_data CSV bad2.csv', 'fuzzy_data CSV bad3.csv', 'fuzzy_data JSON bad1.json', 'fuzzy_data JSON bad2.json', 'fuzzy_data JSON bad4.json'])
+def test_matrix_upload_fuzzy_invalid(client, filename):
+    """
+        Test verifying that the fuzzy matrix with badly formatted Triangular Fuzzy Numbers or rows of different lengths is rejected
+    """
+
+    data = {
+            'matrix': (open(f'./examples/matrix_files/{filename}', 'rb'), filename),
+            'extension': 'fuzzy'
+        }
+
+    response = client.post('/api/v1/matrix/upload', 
+                        headers={'locale': 'en'}, 
+                        data=data,
+                        content_type='multipart/form-data',
+                        follow_redirects=True)
+
+    assert response.status_code == 400
+
+def test_matrix_upload_fuzzy_unordered(client):
+    """
+        Test verifying that the fuzzy matrix with values of Triangular Fuzzy Numbers not in ascending order is rejected
+    """
+
+    file = io.BytesIO(json.dumps({'matrix': [[[1, 2, 3], [5, 4, 3]], [[2, 3, 4], [1, 2, 3]]], 'criteriaTypes': [1, -1]}).encode('utf-8'))
+    data = {
+            'matrix': (file, 'fuzzy_data.json'),
+            'extension': 'fuzzy'
+        }
+
+    response = client.post('/api/v1/matrix/upload', 
+                        headers={'locale': 'en'}, 
+                        data=data,
+                        content_type='multipart/form-data',
+                        follow_redirects=True)
+    payload = json.loads(response.data.decode('utf-8'))
+
+    assert response.status_code == 400
+    assert 'ordered from the lowest to the highest' in payload['message']
+
+def _calculate_with_matrix(client, matrix_data, extension='crisp'):
+    data = [
+        {"id": 1, "node_type": "matrix", "extension": extension, "method": "input", "connections_from": [], "connections_to": [2], "position_x": 10, "position_y": 10} | matrix_data,
+        {"id": 2, "node_type": "weights", "extension": extension, "weights": [], "method": "EQUAL", "connections_from": [1], "connections_to": [3], "position_x": 20, "position_y": 20},
+        {"id": 3, "node_type": "method", "extension": extension, "method": "TOPSIS", "connections_from": [2], "connections_to": [], "kwargs": [], "position_x": 30, "position_y": 30},
+    ]
+    response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en'}, json={'data': data, 'precision': None}, content_type='application/json')
+    return response, json.loads(response.data.decode('utf-8'))
+
+@pytest.mark.parametrize('extension', ['crisp', 'fuzzy'])
+def test_matrix_handle_calculation(client, extension):
+    """
+        Test verifying that the handle of the generated matrix gives the same results as the matrix data given in the node
+    """
+
+    response = client.post('/api/v1/matrix/generate', headers={'locale': 'en'}, json={'extension': extension, 'alternatives': 5, 'criteria': 4, 'lower_bound': 0.2, 'upper_bound': 1, 'precision': 3})
+    payload = json.loads(response.data.decode('utf-8'))['response']
+
+    assert response.status_code == 200
+    assert type(payload['handle']) is str
+
+    response_inline, inline = _calculate_with_matrix(client, {'matrix': payload['matrix'], 'criteria_types': payload['criteria_types']}, extension)
+    response_handle, handle = _calculate_with_matrix(client, {'handle': payload['handle']}, extension)
+
+    assert response_inline.status_code == 200
+    assert response_handle.status_code == 200
+    assert handle['response'][0]['data'][0]['handle'] == payload['handle']
+    assert 'matrix' not in handle['response'][0]['data'][0]
+    assert handle['response'][2]['data'][0]['preference'] == inline['response'][2]['data'][0]['preference']
+
+def test_matrix_handle_not_found(client):
+    """
+        Test verifying that the calculation with the unknown matrix handle is rejected
+    """
+
+    response, payload = _calculate_with_matrix(client, {'handle': '0' * 64})
+
+    assert response.status_code == 400
+    assert 'message' in list(payload.keys())
+
+def test_matrix_store_spill(tmp_path):
+    """
+        Test verifying that the matrices above the memory limit are spilled to files and loaded back
+    """
+    from calculations.matrices import MatrixStore
+    import numpy as np
+
+    matrix = np.arange(12, dtype=float).reshape(4, 3)
+    store = MatrixStore(memory=matrix.nbytes + 24, files=2, directory=str(tmp_path))
+    handles = [store.put(matrix + idx, np.ones(3)) for idx in range(3)]
+
+    assert store.get_stats()['size'] == 1
+    assert store.get_stats()['files'] == 2
+
+    loaded, criteria_types = store.get(handles[1])
+    assert np.array_equal(loaded, matrix + 1)
+    assert not loaded.flags.writeable
+    assert np.array_equal(criteria_types, np.ones(3))
+
+    # files left by the previous store are reused
+    assert np.array_equal(MatrixStore(directory=str(tmp_path)).get(handles[1])[0], matrix + 1)
+    assert store.get('0' * 64) is None
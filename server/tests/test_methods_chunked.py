@@ -0,0 +1,130 @@
+# Copyright (c) 2024 Jakub Więckowski
+
+from server import app
+import json
+import numpy as np
+import pytest
+import pymcdm.methods as crisp_methods
+
+import calculations.node
+from calculations.matrices import matrices
+from utils.encoding import decode_array
+from methods import mcda_chunked_methods
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+def _get_method_object(method, matrix):
+    if method == 'SPOTIS':
+        return crisp_methods.SPOTIS(crisp_methods.SPOTIS.make_bounds(matrix))
+    return getattr(crisp_methods, method)()
+
+@pytest.mark.parametrize('method', list(mcda_chunked_methods.keys()))
+@pytest.mark.parametrize('alternatives, criteria, chunk_size', [(2, 2, 2), (7, 5, 10), (40, 9, 50), (1003, 4, 1000000)])
+def test_methods_chunked_parity(tmp_path, method, alternatives, criteria, chunk_size):
+    """
+        Test verifying that the chunked evaluation of the memory-mapped matrix gives the results of the method object with default parameters
+    """
+    rng = np.random.default_rng(7)
+
+    matrix = rng.random((alternatives, criteria)) * 10 + 0.1
+    types = rng.choice([1.0, -1.0], criteria)
+    types[0] = -1
+    weights = rng.random(criteria)
+    weights = weights / np.sum(weights)
+
+    method_obj = _get_method_object(method, matrix)
+    expected = method_obj(matrix, weights, types)
+
+    np.save(tmp_path / 'matrix.npy', matrix)
+    mapped = np.load(tmp_path / 'matrix.npy', mmap_mode='r')
+    out = np.empty(alternatives)
+
+    function, normalization = mcda_chunked_methods[method]
+    assert getattr(method_obj, 'normalization', None) is normalization
+    assert function(method_obj, mapped, weights, types, out, chunk_size) is out
+    assert np.allclose(out, expected, rtol=1e-12, atol=0)
+
+@pytest.mark.parametrize('method, kwargs', [('TOPSIS', []), ('WSM', []), ('WPM', []), ('COPRAS', []), ('MOORA', []), ('SPOTIS', [{"matrix_id": 1, "bounds": [[0, 0, 0], [10, 10, 10]]}])])
+def test_methods_chunked_calculation(client, monkeypatch, method, kwargs):
+    """
+        Test verifying that the stored matrix opened as the memory map is evaluated in chunks with the results of the matrix given in the node
+    """
+    monkeypatch.setattr(matrices, 'mmap_size', 0)
+    monkeypatch.setattr(calculations.node, 'OUT_OF_CORE_CHUNK_SIZE', 6)
+
+    matrix = [[6, 2, 3], [3, 7, 2], [2, 3, 8], [5, 4, 4], [1, 9, 7]]
+    criteria_types = [1, -1, 1]
+    handle = matrices.put(np.array(matrix, dtype=float), np.array(criteria_types, dtype=float))
+    mapped = matrices.get_stats()['mapped']
+
+    def calculate(matrix_data):
+        data = [
+            {"id": 1, "node_type": "matrix", "extension": "crisp", "method": "input", "connections_from": [], "connections_to": [2], "position_x": 10, "position_y": 10} | matrix_data,
+            {"id": 2, "node_type": "weights", "extension": "crisp", "weights": [0.2, 0.5, 0.3], "method": "INPUT", "connections_from": [1], "connections_to": [3], "position_x": 20, "position_y": 20},
+            {"id": 3, "node_type": "method", "extension": "crisp", "method": method, "connections_from": [2], "connections_to": [], "kwargs": kwargs, "position_x": 30, "position_y": 30},
+        ]
+        response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en'}, json={'data': data, 'precision': None}, content_type='application/json')
+        return response, json.loads(response.data.decode('utf-8'))
+
+    response_inline, inline = calculate({'matrix': matrix, 'criteria_types': criteria_types})
+    response_mapped, payload = calculate({'handle': handle})
+
+    assert response_inline.status_code == 200
+    assert response_mapped.status_code == 200
+    assert matrices.get_stats()['mapped'] > mapped
+    assert np.allclose(payload['response'][2]['data'][0]['preference'], inline['response'][2]['data'][0]['preference'], rtol=1e-12, atol=0)
+
+def test_methods_chunked_result(client, monkeypatch):
+    """
+        Test verifying that the results of the chunked evaluation are kept as the memory-mapped array in the node and encoded from it in the binary response
+    """
+    monkeypatch.setattr(matrices, 'mmap_size', 0)
+    monkeypatch.setattr(calculations.node, 'OUT_OF_CORE_CHUNK_SIZE', 2)
+
+    results = []
+    add_result = calculations.node.MethodNode.add_result
+    def spy(self, matrix_node, weights_node, pref, ranking=None):
+        add_result(self, matrix_node, weights_node, pref, ranking)
+        results.append(self.calculation_data[-1]['preference'])
+    monkeypatch.setattr(calculations.node.MethodNode, 'add_result', spy)
+
+    handle = matrices.put(np.array([[5, 2, 3], [3, 7, 2], [2, 3, 8], [5, 4, 4], [1, 9, 7]], dtype=float), np.array([1, -1, 1], dtype=float))
+    data = [
+        {"id": 1, "node_type": "matrix", "extension": "crisp", "handle": handle, "method": "input", "connections_from": [], "connections_to": [2], "position_x": 10, "position_y": 10},
+        {"id": 2, "node_type": "weights", "extension": "crisp", "weights": [0.3, 0.3, 0.4], "method": "INPUT", "connections_from": [1], "connections_to": [3], "position_x": 20, "position_y": 20},
+        {"id": 3, "node_type": "method", "extension": "crisp", "method": "WSM", "connections_from": [2], "connections_to": [], "kwargs": [], "position_x": 30, "position_y": 30},
+    ]
+    response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en', 'Accept': 'application/vnd.makedecision.binary+json'}, json={'data': data, 'precision': None}, content_type='application/json')
+    payload = json.loads(response.data.decode('utf-8'))
+
+    assert response.status_code == 200
+    assert len(results) == 1 and isinstance(results[0], np.memmap)
+    assert np.array_equal(decode_array(payload['response'][2]['data'][0]['preference']), results[0])
+
+def test_methods_chunked_weights_key(client, monkeypatch):
+    """
+        Test verifying that the cache keys of the weights and preferences of the stored matrix use its handle instead of reading the memory-mapped matrix
+    """
+    monkeypatch.setattr(matrices, 'mmap_size', 0)
+
+    hashed = []
+    get_cache_key = calculations.node.get_cache_key
+    def spy(*items):
+        hashed.extend([item for item in items if isinstance(item, np.memmap)])
+        return get_cache_key(*items)
+    monkeypatch.setattr(calculations.node, 'get_cache_key', spy)
+
+    handle = matrices.put(np.array([[7, 2, 3], [3, 7, 2], [2, 3, 8], [5, 4, 4]], dtype=float), np.array([1, -1, 1], dtype=float))
+    data = [
+        {"id": 1, "node_type": "matrix", "extension": "crisp", "handle": handle, "method": "input", "connections_from": [], "connections_to": [2], "position_x": 10, "position_y": 10},
+        {"id": 2, "node_type": "weights", "extension": "crisp", "weights": [], "method": "ENTROPY", "connections_from": [1], "connections_to": [3], "position_x": 20, "position_y": 20},
+        {"id": 3, "node_type": "method", "extension": "crisp", "method": "TOPSIS", "connections_from": [2], "connections_to": [], "kwargs": [], "position_x": 30, "position_y": 30},
+    ]
+    response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en'}, json={'data': data}, content_type='application/json')
+
+    assert response.status_code == 200
+    assert hashed == []
@@ -0,0 +1,124 @@
+# Copyright (c) 2024 Jakub Więckowski
+
+from server import app
+import json
+import numpy as np
+import pytest
+import pymcdm.methods as crisp_methods
+from pymcdm import normalizations
+
+from methods import mcda_batch_methods, mcda_kernels
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+@pytest.mark.parametrize('method', list(mcda_kernels.keys()))
+@pytest.mark.parametrize('alternatives, criteria', [(2, 2), (3, 2), (7, 5), (12, 17), (40, 9)])
+def test_methods_kernels_parity(method, alternatives, criteria):
+    """
+        Test verifying that the kernel gives results identical to the method object with default parameters for each matrix of the stack
+    """
+    rng = np.random.default_rng(7)
+    call_kwargs = {'v': 0.3} if method == 'VIKOR' else {}
+
+    matrices = rng.random((5, alternatives, criteria)) * 10 + 0.1
+    matrices[1] = np.round(matrices[1])
+    types = rng.choice([1.0, -1.0], criteria)
+    types[0] = -1
+    weights = rng.random((5, criteria))
+    weights = weights / np.sum(weights, axis=1, keepdims=True)
+
+    method_obj = getattr(crisp_methods, method)()
+    expected = np.array([method_obj(matrix, w, types, **call_kwargs) for matrix, w in zip(matrices, weights)])
+
+    kernel, normalization = mcda_kernels[method]
+    assert getattr(method_obj, 'normalization', None) is normalization
+    assert np.array_equal(kernel(matrices, weights, types, **call_kwargs), expected, equal_nan=True)
+    # single matrix evaluated with many vectors of weights
+    expected = np.array([method_obj(matrices[0], w, types, **call_kwargs) for w in weights])
+    assert np.array_equal(kernel(matrices[:1], weights, types, **call_kwargs), expected, equal_nan=True)
+
+@pytest.mark.parametrize('method', list(mcda_batch_methods.keys()))
+@pytest.mark.parametrize('normalization', [None, 'minmax_normalization', 'sum_normalization', 'max_normalization', 'vector_normalization', 'linear_normalization'])
+def test_methods_batch_parity(method, normalization):
+    """
+        Test verifying that the batch evaluation gives results identical to the evaluation for each vector of weights
+    """
+    rng = np.random.default_rng(42)
+    kwargs = {} if normalization is None else {'normalization_function': getattr(normalizations, normalization)}
+    call_kwargs = {'v': 0.3} if method == 'VIKOR' else {}
+
+    for alternatives, criteria in [(3, 2), (7, 5), (12, 17)]:
+        matrix = rng.random((alternatives, criteria)) * 10 + 0.1
+        types = rng.choice([1, -1], criteria)
+        weights = rng.random((6, criteria))
+        weights = weights / np.sum(weights, axis=1, keepdims=True)
+
+        method_obj = getattr(crisp_methods, method)(**kwargs)
+        expected = np.array([method_obj(matrix, w, types, **call_kwargs) for w in weights])
+
+        assert np.array_equal(mcda_batch_methods[method](method_obj, matrix, weights, types, **call_kwargs), expected)
+
+@pytest.mark.parametrize('method', ['TOPSIS', 'WSM', 'WPM'])
+def test_methods_kernels_equal_criterion(method):
+    """
+        Test verifying that the kernel normalizes the criterion with equal values in the same way as the method object
+    """
+    matrix = np.array([[1, 2, 3], [1, 5, 4], [1, 3, 8]], dtype=float)
+    types = np.array([1, -1, 1], dtype=float)
+    weights = np.array([0.2, 0.5, 0.3])
+
+    expected = getattr(crisp_methods, method)()(matrix, weights, types)
+
+    assert np.array_equal(mcda_kernels[method][0](matrix[np.newaxis], weights[np.newaxis], types)[0], expected)
+
+@pytest.mark.parametrize('method, types', [('COPRAS', [1, 1, 1]), ('VIKOR', [1, -1, 1])])
+def test_methods_kernels_errors(method, types):
+    """
+        Test verifying that the kernel and the batch evaluation raise the same errors as the method object
+    """
+    matrix = np.array([[1, 2, 3], [1, 5, 4], [1, 3, 8]], dtype=float)
+    types = np.array(types, dtype=float)
+    weights = np.array([0.2, 0.5, 0.3])
+    method_obj = getattr(crisp_methods, method)()
+
+    with pytest.raises(ValueError) as expected:
+        method_obj(matrix, weights, types)
+
+    with pytest.raises(ValueError) as error:
+        mcda_kernels[method][0](matrix[np.newaxis], weights[np.newaxis], types)
+
+    assert str(error.value) == str(expected.value)
+
+    if method in mcda_batch_methods:
+        with pytest.raises(ValueError) as error:
+            mcda_batch_methods[method](method_obj, matrix, weights[np.newaxis], types)
+
+        assert str(error.value) == str(expected.value)
+
+@pytest.mark.parametrize('method, kwargs', [('TOPSIS', []), ('TOPSIS', [{"matrix_id": 1, "normalization_function": "max_normalization"}]), ('COPRAS', []), ('VIKOR', [{"matrix_id": 1, "v": 0.7}])])
+def test_methods_kernels_calculation(client, method, kwargs):
+    """
+        Test verifying that the preferences calculated in the structure are identical to the preferences of the method object
+    """
+    matrix = [[6, 2, 3], [3, 7, 2], [2, 3, 8], [5, 4, 4]]
+    data = [
+        {"id": 1, "node_type": "matrix", "extension": "crisp", "matrix": matrix, "criteria_types": [1, -1, 1], "method": "input", "connections_from": [], "connections_to": [2], "position_x": 10, "position_y": 10},
+        {"id": 2, "node_type": "weights", "extension": "crisp", "weights": [0.2, 0.5, 0.3], "method": "INPUT", "connections_from": [1], "connections_to": [3], "position_x": 20, "position_y": 20},
+        {"id": 3, "node_type": "method", "extension": "crisp", "method": method, "connections_from": [2], "connections_to": [], "kwargs": kwargs, "position_x": 30, "position_y": 30},
+    ]
+
+    response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en'}, json={'data': data}, content_type='application/json')
+    payload = json.loads(response.data.decode('utf-8'))
+
+    init_kwargs = {k: v for item in kwargs for k, v in item.items() if k in ['normalization_function']}
+    if 'normalization_function' in init_kwargs:
+        init_kwargs['normalization_function'] = getattr(normalizations, init_kwargs['normalization_function'])
+    call_kwargs = {'v': 0.7} if method == 'VIKOR' else {}
+    expected = getattr(crisp_methods, method)(**init_kwargs)(np.array(matrix, dtype=float), np.array([0.2, 0.5, 0.3]), np.array([1, -1, 1], dtype=float), **call_kwargs)
+
+    assert response.status_code == 200
+    assert payload['response'][2]['data'][0]['preference'] == np.round(expected, 3).tolist()
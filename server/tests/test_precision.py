@@ -0,0 +1,93 @@
+# Copyright (c) 2024 Jakub Więckowski
+
+from server import app
+import json
+import numpy as np
+import pytest
+from pymcdm.methods import TOPSIS
+from pymcdm.weights import entropy_weights
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+matrix = [
+    [11, 2, 3],
+    [3, 17, 2],
+    [2, 3, 18],
+    [7, 5, 9],
+]
+criteria_types = [1, -1, 1]
+
+data = [
+    {
+        "id": 1,
+        "node_type": "matrix",
+        "extension": "crisp",
+        "matrix": matrix,
+        "criteria_types": criteria_types,
+        "method": "input",
+        "connections_from": [],
+        "connections_to": [2],
+        "position_x": 10,
+        "position_y": 10,
+    },
+    {
+        "id": 2,
+        "node_type": "weights",
+        "extension": "crisp",
+        "weights": [],
+        "method": "ENTROPY",
+        "connections_from": [1],
+        "connections_to": [3],
+        "position_x": 20,
+        "position_y": 20,
+    },
+    {
+        "id": 3,
+        "node_type": "method",
+        "extension": "crisp",
+        "method": "TOPSIS",
+        "connections_from": [2],
+        "connections_to": [],
+        "kwargs": [],
+        "position_x": 30,
+        "position_y": 30,
+    }
+]
+
+def calculate(client, body):
+    response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en'}, json={'data': data} | body, content_type='application/json')
+    return response, json.loads(response.data.decode('utf-8'))
+
+def test_results_full_precision(client):
+    """
+        Test verifying that the preferences are calculated with the weights in full precision and rounded only in the response
+    """
+    weights = entropy_weights(np.array(matrix, dtype=float))
+    expected = TOPSIS()(np.array(matrix, dtype=float), weights, np.array(criteria_types, dtype=float))
+
+    response, payload = calculate(client, {})
+    assert response.status_code == 200
+    assert payload['response'][1]['data'][0]['weights'] == np.round(weights, 3).tolist()
+    assert payload['response'][2]['data'][0]['preference'] == np.round(expected, 3).tolist()
+
+    response, payload = calculate(client, {'precision': 6})
+    assert response.status_code == 200
+    assert payload['response'][2]['data'][0]['preference'] == np.round(expected, 6).tolist()
+
+    response, payload = calculate(client, {'precision': None})
+    assert response.status_code == 200
+    assert np.allclose(payload['response'][1]['data'][0]['weights'], weights, rtol=0, atol=1e-15)
+    assert np.allclose(payload['response'][2]['data'][0]['preference'], expected, rtol=0, atol=1e-15)
+
+@pytest.mark.parametrize('precision', [-1, 16, 2.5, 'raw', True])
+def test_results_precision_error(client, precision):
+    """
+        Test verifying that the invalid number of decimal places is rejected
+    """
+    response, _ = calculate(client, {'precision': precision})
+
+    assert response.status_code == 400
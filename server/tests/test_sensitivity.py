@@ -0,0 +1,141 @@
+# Copyright (c) 2024 Jakub Więckowski
+
+from server import app
+import json
+import numpy as np
+import pytest
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+def get_structure(method, distribution, kwargs, method_kwargs=[]):
+    return [
+        {
+            "id": 1,
+            "node_type": "matrix",
+            "extension": "crisp",
+            "matrix": [
+                [6, 2, 3, 4],
+                [3, 7, 2, 5],
+                [2, 3, 8, 1],
+                [5, 5, 4, 4],
+                [4, 1, 6, 7],
+            ],
+            "criteria_types": [1, -1, 1, 1],
+            "method": "input",
+            "connections_from": [],
+            "connections_to": [2],
+            "position_x": 10,
+            "position_y": 10,
+        },
+        {
+            "id": 2,
+            "node_type": "weights",
+            "extension": "crisp",
+            "weights": [],
+            "method": "CRITIC",
+            "connections_from": [1],
+            "connections_to": [3],
+            "position_x": 20,
+            "position_y": 20,
+        },
+        {
+            "id": 3,
+            "node_type": "method",
+            "extension": "crisp",
+            "method": method,
+            "connections_from": [2],
+            "connections_to": [4, 5],
+            "kwargs": method_kwargs,
+            "position_x": 30,
+            "position_y": 30,
+        },
+        {
+            "id": 4,
+            "node_type": "ranking",
+            "extension": "crisp",
+            "method": "rank",
+            "connections_from": [3],
+            "connections_to": [],
+            "position_x": 40,
+            "position_y": 40,
+        },
+        {
+            "id": 5,
+            "node_type": "sensitivity",
+            "extension": "crisp",
+            "method": distribution,
+            "connections_from": [3],
+            "connections_to": [],
+            "kwargs": kwargs,
+            "position_x": 40,
+            "position_y": 50,
+        }
+    ]
+
+def test_sensitivity_without_perturbation(client):
+    """
+        Test verifying that the ranking does not change when the weights are not perturbed
+    """
+    data = get_structure('TOPSIS', 'uniform', [{"samples": 100, "spread": 0}])
+
+    response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en'}, json={'data': data}, content_type='application/json')
+    payload = json.loads(response.data.decode('utf-8'))
+
+    assert response.status_code == 200
+    result = payload['response'][4]['data'][0]
+    assert result['method'] == 'TOPSIS'
+    assert result['weights_method'] == 'CRITIC'
+    assert result['samples'] == 100
+    assert result['ranking'] == payload['response'][3]['data'][0]['ranking']
+    assert result['rank_change'] == [0] * 5
+    assert np.array_equal(np.array(result['rank_distribution'])[np.arange(5), np.array(result['ranking']) - 1], np.ones(5))
+
+@pytest.mark.parametrize('method, method_kwargs', [('TOPSIS', []), ('WSM', []), ('WPM', []), ('MABAC', []), ('COPRAS', []), ('VIKOR', [{"matrix_id": 1, "v": 0.5}])])
+@pytest.mark.parametrize('distribution, params', [('uniform', {"spread": 0.5}), ('dirichlet', {"concentration": 10})])
+def test_sensitivity_seeded(client, method, method_kwargs, distribution, params):
+    """
+        Test verifying that the seeded sensitivity analysis gives reproducible distributions of positions
+    """
+    data = get_structure(method, distribution, [{"samples": 5000, "seed": 7, **params}], method_kwargs)
+
+    results = []
+    for _ in range(2):
+        response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en'}, json={'data': data}, content_type='application/json')
+        payload = json.loads(response.data.decode('utf-8'))
+
+        assert response.status_code == 200
+        results.append(payload['response'][4]['data'][0])
+
+    assert results[0] == results[1]
+    distribution = np.array(results[0]['rank_distribution'])
+    assert distribution.shape == (5, 5)
+    assert np.allclose(np.sum(distribution, axis=0), 1, atol=0.01)
+    assert np.allclose(np.sum(distribution, axis=1), 1, atol=0.01)
+    assert all([0 <= value <= 1 for value in results[0]['rank_change']])
+
+def test_sensitivity_method_error(client):
+    """
+        Test verifying that the sensitivity analysis of the method without the batch implementation is rejected
+    """
+    data = get_structure('ARAS', 'uniform', [{"samples": 100}])
+
+    response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en'}, json={'data': data}, content_type='application/json')
+    payload = json.loads(response.data.decode('utf-8'))
+
+    assert response.status_code == 400
+    assert 'Sensitivity analysis is available' in payload['message']
+
+@pytest.mark.parametrize('distribution, kwargs', [('uniform', [{"samples": 0}]), ('uniform', [{"samples": 10000000}]), ('uniform', [{"spread": 2}]), ('dirichlet', [{"spread": 0.1}])])
+def test_sensitivity_params_error(client, distribution, kwargs):
+    """
+        Test verifying that the invalid parameters of the sensitivity analysis are rejected
+    """
+    data = get_structure('TOPSIS', distribution, kwargs)
+
+    response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en'}, json={'data': data}, content_type='application/json')
+
+    assert response.status_code == 400
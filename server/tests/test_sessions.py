@@ -0,0 +1,178 @@
+# Copyright (c) 2024 Jakub Więckowski
+
+from server import app
+import copy
+import json
+import pytest
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+def get_structure():
+    return [
+        {
+            "id": 1,
+            "node_type": "matrix",
+            "extension": "crisp",
+            "matrix": [
+                [6, 2, 3],
+                [3, 7, 2],
+                [2, 3, 8],
+                [4, 1, 5],
+            ],
+            "criteria_types": [1, -1, 1],
+            "method": "input",
+            "connections_from": [],
+            "connections_to": [2, 3],
+            "position_x": 10,
+            "position_y": 10,
+        },
+        {
+            "id": 2,
+            "node_type": "weights",
+            "extension": "crisp",
+            "weights": [],
+            "method": "EQUAL",
+            "connections_from": [1],
+            "connections_to": [4],
+            "position_x": 20,
+            "position_y": 20,
+        },
+        {
+            "id": 3,
+            "node_type": "weights",
+            "extension": "crisp",
+            "weights": [],
+            "method": "ENTROPY",
+            "connections_from": [1],
+            "connections_to": [5],
+            "position_x": 20,
+            "position_y": 30,
+        },
+        {
+            "id": 4,
+            "node_type": "method",
+            "extension": "crisp",
+            "method": "TOPSIS",
+            "connections_from": [2],
+            "connections_to": [6],
+            "kwargs": [],
+            "position_x": 30,
+            "position_y": 30,
+        },
+        {
+            "id": 5,
+            "node_type": "method",
+            "extension": "crisp",
+            "method": "COPRAS",
+            "connections_from": [3],
+            "connections_to": [6],
+            "kwargs": [],
+            "position_x": 30,
+            "position_y": 40,
+        },
+        {
+            "id": 6,
+            "node_type": "ranking",
+            "extension": "crisp",
+            "method": "rank",
+            "connections_from": [4, 5],
+            "connections_to": [7],
+            "position_x": 40,
+            "position_y": 40,
+        },
+        {
+            "id": 7,
+            "node_type": "correlation",
+            "extension": "crisp",
+            "method": "WEIGHTED SPEARMAN",
+            "connections_from": [6],
+            "connections_to": [],
+            "position_x": 50,
+            "position_y": 50,
+        }
+    ]
+
+def test_sessions_incremental_calculation(client):
+    """
+        Test verifying that only the changed nodes and nodes dependent on them are recalculated in the session
+    """
+    data = get_structure()
+
+    response = client.post('/api/v1/calculations/sessions', headers={'locale': 'en'}, json={'data': data}, content_type='application/json')
+    payload = json.loads(response.data.decode('utf-8'))
+
+    assert response.status_code == 200
+    assert len(payload['response']) == 7
+
+    session_id = payload['session_id']
+
+    # moving the node does not change the results
+    moved_node = copy.deepcopy(data[3])
+    moved_node['position_x'] = 100
+
+    response = client.patch(f'/api/v1/calculations/sessions/{session_id}', headers={'locale': 'en'}, json={'change': [moved_node]}, content_type='application/json')
+    payload = json.loads(response.data.decode('utf-8'))
+
+    assert response.status_code == 200
+    assert payload['response'] == []
+
+    # changing the weights method recalculates only the dependent branch
+    changed_node = copy.deepcopy(data[2])
+    changed_node['method'] = 'CRITIC'
+
+    response = client.patch(f'/api/v1/calculations/sessions/{session_id}', headers={'locale': 'en'}, json={'change': [changed_node]}, content_type='application/json')
+    payload = json.loads(response.data.decode('utf-8'))
+
+    data[2] = changed_node
+    full_response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en'}, json={'data': data}, content_type='application/json')
+    full_payload = json.loads(full_response.data.decode('utf-8'))
+
+    assert response.status_code == 200
+    assert [node['id'] for node in payload['response']] == [3, 5, 6, 7]
+    assert payload['response'] == [node for node in full_payload['response'] if node['id'] in [3, 5, 6, 7]]
+
+def test_sessions_add_remove_nodes(client):
+    """
+        Test verifying that the nodes can be added to and removed from the session structure
+    """
+    data = get_structure()
+
+    response = client.post('/api/v1/calculations/sessions', headers={'locale': 'en'}, json={'data': data}, content_type='application/json')
+    session_id = json.loads(response.data.decode('utf-8'))['session_id']
+
+    weights_node = copy.deepcopy(data[1])
+    weights_node['connections_to'] = [4, 8]
+    method_node = {
+        "id": 8,
+        "node_type": "method",
+        "extension": "crisp",
+        "method": "WSM",
+        "connections_from": [2],
+        "connections_to": [],
+        "kwargs": [],
+        "position_x": 30,
+        "position_y": 50,
+    }
+
+    response = client.patch(f'/api/v1/calculations/sessions/{session_id}', headers={'locale': 'en'}, json={'add': [method_node], 'change': [weights_node], 'remove': [7]}, content_type='application/json')
+    payload = json.loads(response.data.decode('utf-8'))
+
+    assert response.status_code == 200
+    assert payload['removed'] == [7]
+    assert [node['id'] for node in payload['response']] == [2, 4, 6, 8]
+
+    response = client.patch(f'/api/v1/calculations/sessions/{session_id}', headers={'locale': 'en'}, json={'remove': [7]}, content_type='application/json')
+    payload = json.loads(response.data.decode('utf-8'))
+
+    assert response.status_code == 400
+    assert 'not found' in payload['message']
+
+    response = client.delete(f'/api/v1/calculations/sessions/{session_id}', headers={'locale': 'en'})
+    assert response.status_code == 200
+
+    response = client.patch(f'/api/v1/calculations/sessions/{session_id}', headers={'locale': 'en'}, json={'change': [weights_node]}, content_type='application/json')
+    assert response.status_code == 400
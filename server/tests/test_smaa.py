@@ -0,0 +1,142 @@
+# Copyright (c) 2024 Jakub Więckowski
+
+from server import app
+import json
+import numpy as np
+import pytest
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+crisp_matrix = [
+    [6, 2, 3, 4],
+    [3, 7, 2, 5],
+    [2, 3, 8, 1],
+    [5, 5, 4, 4],
+    [4, 1, 6, 7],
+]
+
+fuzzy_matrix = [
+    [[5, 6, 7], [1, 2, 3], [3, 3, 4], [3, 4, 5]],
+    [[2, 3, 4], [6, 7, 8], [1, 2, 3], [4, 5, 6]],
+    [[1, 2, 3], [2, 3, 4], [7, 8, 9], [1, 1, 2]],
+    [[4, 5, 6], [4, 5, 6], [3, 4, 5], [3, 4, 5]],
+    [[3, 4, 5], [1, 1, 2], [5, 6, 7], [6, 7, 8]],
+]
+
+def get_structure(extension, matrix, method, distribution, kwargs):
+    return [
+        {
+            "id": 1,
+            "node_type": "matrix",
+            "extension": extension,
+            "matrix": matrix,
+            "criteria_types": [1, -1, 1, 1],
+            "method": "input",
+            "connections_from": [],
+            "connections_to": [2],
+            "position_x": 10,
+            "position_y": 10,
+        },
+        {
+            "id": 2,
+            "node_type": "weights",
+            "extension": extension,
+            "weights": [],
+            "method": "EQUAL",
+            "connections_from": [1],
+            "connections_to": [3],
+            "position_x": 20,
+            "position_y": 20,
+        },
+        {
+            "id": 3,
+            "node_type": "method",
+            "extension": extension,
+            "method": method,
+            "connections_from": [2],
+            "connections_to": [4],
+            "kwargs": [],
+            "position_x": 30,
+            "position_y": 30,
+        },
+        {
+            "id": 4,
+            "node_type": "smaa",
+            "extension": extension,
+            "method": distribution,
+            "connections_from": [3],
+            "connections_to": [],
+            "kwargs": kwargs,
+            "position_x": 40,
+            "position_y": 40,
+        }
+    ]
+
+@pytest.mark.parametrize('method', ['TOPSIS', 'COPRAS'])
+def test_smaa_crisp(client, method):
+    """
+        Test verifying the rank acceptability indices, central weights and confidence factors for the crisp matrix
+    """
+    data = get_structure('crisp', crisp_matrix, method, 'simplex', [{"samples": 3000, "seed": 5}])
+
+    response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en'}, json={'data': data}, content_type='application/json')
+    payload = json.loads(response.data.decode('utf-8'))
+
+    assert response.status_code == 200
+    result = payload['response'][3]['data'][0]
+    acceptability = np.array(result['acceptability'])
+    assert result['samples'] == 3000
+    assert acceptability.shape == (5, 5)
+    assert np.allclose(np.sum(acceptability, axis=0), 1, atol=0.01)
+    assert np.allclose(np.sum(acceptability, axis=1), 1, atol=0.01)
+    for first, central_weights, confidence in zip(acceptability[:, 0], result['central_weights'], result['confidence']):
+        if central_weights is None:
+            assert first == 0 and confidence == 0
+        else:
+            assert np.isclose(np.sum(central_weights), 1, atol=0.01)
+            assert confidence in [0, 1]
+
+def test_smaa_parallel(client):
+    """
+        Test verifying that the chunks evaluated in the worker processes give the same results as in the serial evaluation
+    """
+    data = get_structure('crisp', crisp_matrix, 'WSM', 'dirichlet', [{"samples": 5000, "seed": 11, "concentration": 20}])
+
+    results = []
+    for parallel in [False, True]:
+        response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en'}, json={'data': data, 'parallel': parallel}, content_type='application/json')
+        payload = json.loads(response.data.decode('utf-8'))
+
+        assert response.status_code == 200
+        results.append(payload['response'][3]['data'][0])
+
+    assert results[0] == results[1]
+
+def test_smaa_fuzzy(client):
+    """
+        Test verifying that the crisp matrices are sampled within the bounds of the fuzzy matrix
+    """
+    data = get_structure('fuzzy', fuzzy_matrix, 'TOPSIS', 'simplex', [{"samples": 300, "seed": 2}])
+
+    response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en'}, json={'data': data}, content_type='application/json')
+    payload = json.loads(response.data.decode('utf-8'))
+
+    assert response.status_code == 200
+    result = payload['response'][3]['data'][0]
+    assert np.array(result['acceptability']).shape == (5, 5)
+    assert all([0 <= confidence <= 1 for confidence in result['confidence']])
+
+@pytest.mark.parametrize('distribution, kwargs', [('simplex', [{"samples": -1}]), ('simplex', [{"concentration": 10}]), ('normal', [])])
+def test_smaa_params_error(client, distribution, kwargs):
+    """
+        Test verifying that the invalid parameters of SMAA are rejected
+    """
+    data = get_structure('crisp', crisp_matrix, 'TOPSIS', distribution, kwargs)
+
+    response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en'}, json={'data': data}, content_type='application/json')
+
+    assert response.status_code == 400
@@ -0,0 +1,585 @@
+# Copyright (c) 2024 Jakub Więckowski
+
+from server import app
+import json
+import os
+import subprocess
+import sys
+import pytest
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+def test_results_calculation_multiple_matrices_evaluated_once(client):
+    """
+        Test verifying that each node is evaluated once for each matrix it is connected to
+    """
+    data = [
+        {
+            "id": 1,
+            "node_type": "matrix",
+            "extension": "crisp",
+            "matrix": [
+                [6, 2, 3],
+                [3, 7, 2],
+                [2, 3, 8],
+            ],
+            "criteria_types": [1, -1, 1],
+            "method": "input",
+            "connections_from": [],
+            "connections_to": [3, 4],
+            "position_x": 10,
+            "position_y": 10,
+        },
+        {
+            "id": 2,
+            "node_type": "matrix",
+            "extension": "crisp",
+            "matrix": [
+                [1, 2, 3],
+                [3, 1, 2],
+                [2, 3, 1],
+            ],
+            "criteria_types": [1, 1, -1],
+            "method": "input",
+            "connections_from": [],
+            "connections_to": [3],
+            "position_x": 10,
+            "position_y": 20,
+        },
+        {
+            "id": 3,
+            "node_type": "weights",
+            "extension": "crisp",
+            "weights": [],
+            "method": "EQUAL",
+            "connections_from": [1, 2],
+            "connections_to": [5],
+            "position_x": 20,
+            "position_y": 20,
+        },
+        {
+            "id": 4,
+            "node_type": "weights",
+            "extension": "crisp",
+            "weights": [0.2, 0.3, 0.5],
+            "method": "INPUT",
+            "connections_from": [1],
+            "connections_to": [5, 6],
+            "position_x": 20,
+            "position_y": 30,
+        },
+        {
+            "id": 5,
+            "node_type": "method",
+            "extension": "crisp",
+            "method": "TOPSIS",
+            "connections_from": [3, 4],
+            "connections_to": [],
+            "kwargs": [],
+            "position_x": 30,
+            "position_y": 30,
+        },
+        {
+            "id": 6,
+            "node_type": "visualization",
+            "extension": "crisp",
+            "method": "Weights distribution",
+            "connections_from": [4],
+            "connections_to": [],
+            "position_x": 40,
+            "position_y": 40,
+        }
+    ]
+
+    response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en'}, json={'data': data}, content_type='application/json')
+    payload = json.loads(response.data.decode('utf-8'))
+
+    assert response.status_code == 200
+    assert len(payload['response']) == 6
+    assert payload['response'][2]['node_type'] == 'weights'
+    assert [item['matrix_id'] for item in payload['response'][2]['data']] == [1, 2]
+    assert payload['response'][3]['node_type'] == 'weights'
+    assert [item['matrix_id'] for item in payload['response'][3]['data']] == [1]
+    assert payload['response'][4]['node_type'] == 'method'
+    assert [(item['matrix_id'], item['weights_method']) for item in payload['response'][4]['data']] == [(1, 'EQUAL'), (1, 'INPUT'), (2, 'EQUAL')]
+    assert payload['response'][5]['node_type'] == 'visualization'
+    assert [item['matrix_id'] for item in payload['response'][5]['data']] == [1]
+
+def test_results_calculation_connections_cycle(client):
+    """
+        Test verifying that the structure with cyclic connections is rejected
+    """
+    data = [
+        {
+            "id": 1,
+            "node_type": "matrix",
+            "extension": "crisp",
+            "matrix": [
+                [6, 2, 3],
+                [3, 7, 2],
+                [2, 3, 8],
+            ],
+            "criteria_types": [1, -1, 1],
+            "method": "input",
+            "connections_from": [],
+            "connections_to": [2],
+            "position_x": 10,
+            "position_y": 10,
+        },
+        {
+            "id": 2,
+            "node_type": "weights",
+            "extension": "crisp",
+            "weights": [],
+            "method": "EQUAL",
+            "connections_from": [1],
+            "connections_to": [3],
+            "position_x": 20,
+            "position_y": 20,
+        },
+        {
+            "id": 3,
+            "node_type": "method",
+            "extension": "crisp",
+            "method": "TOPSIS",
+            "connections_from": [2],
+            "connections_to": [],
+            "kwargs": [],
+            "position_x": 30,
+            "position_y": 30,
+        },
+        {
+            "id": 4,
+            "node_type": "correlation",
+            "extension": "crisp",
+            "method": "PEARSON",
+            "connections_from": [3, 5],
+            "connections_to": [],
+            "position_x": 40,
+            "position_y": 40,
+        },
+        {
+            "id": 5,
+            "node_type": "correlation",
+            "extension": "crisp",
+            "method": "PEARSON",
+            "connections_from": [4],
+            "connections_to": [],
+            "position_x": 50,
+            "position_y": 50,
+        }
+    ]
+
+    response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en'}, json={'data': data}, content_type='application/json')
+    payload = json.loads(response.data.decode('utf-8'))
+
+    assert response.status_code == 400
+    assert 'cycle' in payload['message']
+
+def test_results_calculation_parallel(client):
+    """
+        Test verifying that the calculations evaluated in worker processes give the same results as the sequential calculations
+    """
+    data = [
+        {
+            "id": 1,
+            "node_type": "matrix",
+            "extension": "crisp",
+            "matrix": [
+                [6, 2, 3],
+                [3, 7, 2],
+                [2, 3, 8],
+                [4, 1, 5],
+            ],
+            "criteria_types": [1, -1, 1],
+            "method": "input",
+            "connections_from": [],
+            "connections_to": [2, 3],
+            "position_x": 10,
+            "position_y": 10,
+        },
+        {
+            "id": 2,
+            "node_type": "weights",
+            "extension": "crisp",
+            "weights": [],
+            "method": "CRITIC",
+            "connections_from": [1],
+            "connections_to": [4, 5],
+            "position_x": 20,
+            "position_y": 20,
+        },
+        {
+            "id": 3,
+            "node_type": "weights",
+            "extension": "crisp",
+            "weights": [],
+            "method": "ENTROPY",
+            "connections_from": [1],
+            "connections_to": [4, 5],
+            "position_x": 20,
+            "position_y": 30,
+        },
+        {
+            "id": 4,
+            "node_type": "method",
+            "extension": "crisp",
+            "method": "TOPSIS",
+            "connections_from": [2, 3],
+            "connections_to": [6, 7],
+            "kwargs": [],
+            "position_x": 30,
+            "position_y": 30,
+        },
+        {
+            "id": 5,
+            "node_type": "method",
+            "extension": "crisp",
+            "method": "VIKOR",
+            "connections_from": [2, 3],
+            "connections_to": [6, 7],
+            "kwargs": [{"matrix_id": 1, "v": 0.3}],
+            "position_x": 30,
+            "position_y": 40,
+        },
+        {
+            "id": 6,
+            "node_type": "ranking",
+            "extension": "crisp",
+            "method": "rank",
+            "connections_from": [4, 5],
+            "connections_to": [8],
+            "position_x": 40,
+            "position_y": 40,
+        },
+        {
+            "id": 7,
+            "node_type": "correlation",
+            "extension": "crisp",
+            "method": "PEARSON",
+            "connections_from": [4, 5],
+            "connections_to": [],
+            "position_x": 50,
+            "position_y": 50,
+        },
+        {
+            "id": 8,
+            "node_type": "correlation",
+            "extension": "crisp",
+            "method": "WEIGHTED SPEARMAN",
+            "connections_from": [6],
+            "connections_to": [],
+            "position_x": 50,
+            "position_y": 60,
+        }
+    ]
+
+    response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en'}, json={'data': data}, content_type='application/json')
+    payload = json.loads(response.data.decode('utf-8'))
+
+    parallel_response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en'}, json={'data': data, 'parallel': True}, content_type='application/json')
+    parallel_payload = json.loads(parallel_response.data.decode('utf-8'))
+
+    assert response.status_code == 200
+    assert parallel_response.status_code == 200
+    assert parallel_payload == payload
+    assert len(parallel_payload['response'][5]['data']) == 4
+    assert len(parallel_payload['response'][6]['data']) == 1
+
+def test_results_calculation_parallel_worker_imports():
+    """
+        Test verifying that the worker processes import the calculation modules without the routes of the server
+    """
+    code = "import sys; from helpers import init_worker; init_worker(); print('routes' in sys.modules)"
+    result = subprocess.run([sys.executable, '-c', code], cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), capture_output=True, text=True)
+
+    assert result.returncode == 0
+    assert result.stdout.strip() == 'False'
+
+def test_results_calculation_weights_cache_debug(client):
+    """
+        Test verifying that the weights are calculated once for each matrix and reused by all connected methods
+    """
+    data = [
+        {
+            "id": 1,
+            "node_type": "matrix",
+            "extension": "crisp",
+            "matrix": [
+                [6, 2, 3],
+                [3, 7, 2],
+                [2, 3, 8],
+            ],
+            "criteria_types": [1, -1, 1],
+            "method": "input",
+            "connections_from": [],
+            "connections_to": [2],
+            "position_x": 10,
+            "position_y": 10,
+        },
+        {
+            "id": 2,
+            "node_type": "weights",
+            "extension": "crisp",
+            "weights": [],
+            "method": "CRITIC",
+            "connections_from": [1],
+            "connections_to": [3, 4, 5],
+            "position_x": 20,
+            "position_y": 20,
+        },
+        {
+            "id": 3,
+            "node_type": "method",
+            "extension": "crisp",
+            "method": "TOPSIS",
+            "connections_from": [2],
+            "connections_to": [],
+            "kwargs": [],
+            "position_x": 30,
+            "position_y": 30,
+        },
+        {
+            "id": 4,
+            "node_type": "method",
+            "extension": "crisp",
+            "method": "WSM",
+            "connections_from": [2],
+            "connections_to": [],
+            "kwargs": [],
+            "position_x": 30,
+            "position_y": 40,
+        },
+        {
+            "id": 5,
+            "node_type": "method",
+            "extension": "crisp",
+            "method": "WPM",
+            "connections_from": [2],
+            "connections_to": [],
+            "kwargs": [],
+            "position_x": 30,
+            "position_y": 50,
+        }
+    ]
+
+    response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en'}, json={'data': data, 'debug': True}, content_type='application/json')
+    payload = json.loads(response.data.decode('utf-8'))
+
+    assert response.status_code == 200
+    assert payload['debug']['weights_cache'] == {'hits': 3, 'misses': 1}
+    assert len(payload['response'][1]['data']) == 1
+
+    response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en'}, json={'data': data}, content_type='application/json')
+    payload = json.loads(response.data.decode('utf-8'))
+
+    assert 'debug' not in payload
+
+@pytest.mark.parametrize('mimetype', ['application/x-ndjson', 'text/event-stream'])
+def test_results_calculation_stream(client, mimetype):
+    """
+        Test verifying that the results of each node are streamed when the stream response is accepted
+    """
+    data = [
+        {
+            "id": 1,
+            "node_type": "matrix",
+            "extension": "crisp",
+            "matrix": [
+                [6, 2, 3],
+                [3, 7, 2],
+                [2, 3, 8],
+            ],
+            "criteria_types": [1, -1, 1],
+            "method": "input",
+            "connections_from": [],
+            "connections_to": [2],
+            "position_x": 10,
+            "position_y": 10,
+        },
+        {
+            "id": 2,
+            "node_type": "weights",
+            "extension": "crisp",
+            "weights": [],
+            "method": "EQUAL",
+            "connections_from": [1],
+            "connections_to": [3],
+            "position_x": 20,
+            "position_y": 20,
+        },
+        {
+            "id": 3,
+            "node_type": "method",
+            "extension": "crisp",
+            "method": "TOPSIS",
+            "connections_from": [2],
+            "connections_to": [4],
+            "kwargs": [],
+            "position_x": 30,
+            "position_y": 30,
+        },
+        {
+            "id": 4,
+            "node_type": "ranking",
+            "extension": "crisp",
+            "method": "rank",
+            "connections_from": [3],
+            "connections_to": [],
+            "position_x": 40,
+            "position_y": 40,
+        }
+    ]
+
+    response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en'}, json={'data': data}, content_type='application/json')
+    payload = json.loads(response.data.decode('utf-8'))
+
+    stream_response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en', 'Accept': mimetype}, json={'data': data}, content_type='application/json')
+    stream_data = stream_response.data.decode('utf-8')
+
+    if mimetype == 'text/event-stream':
+        messages = [json.loads(message.split('data: ')[1]) for message in stream_data.strip().split('\n\n')]
+    else:
+        messages = [json.loads(line) for line in stream_data.strip().split('\n')]
+
+    assert stream_response.status_code == 200
+    assert stream_response.mimetype == mimetype
+    assert sorted(messages, key=lambda node: node['id']) == payload['response']
+
+    data[2]['method'] = 'UNKNOWN'
+    stream_response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en', 'Accept': mimetype}, json={'data': data}, content_type='application/json')
+
+    assert stream_response.status_code == 400
+
+@pytest.mark.parametrize('parallel', [False, True])
+def test_results_calculation_profile(client, parallel):
+    """
+        Test verifying that the time usage of each node is reported with the critical path when the profile is requested, and the memory usage only when it is requested separately
+    """
+    data = [
+        {
+            "id": 1,
+            "node_type": "matrix",
+            "extension": "crisp",
+            "matrix": [
+                [6, 2, 3],
+                [3, 7, 2],
+                [2, 3, 8],
+            ],
+            "criteria_types": [1, -1, 1],
+            "method": "input",
+            "connections_from": [],
+            "connections_to": [2],
+            "position_x": 10,
+            "position_y": 10,
+        },
+        {
+            "id": 2,
+            "node_type": "weights",
+            "extension": "crisp",
+            "weights": [],
+            "method": "CRITIC",
+            "connections_from": [1],
+            "connections_to": [3, 4],
+            "position_x": 20,
+            "position_y": 20,
+        },
+        {
+            "id": 3,
+            "node_type": "method",
+            "extension": "crisp",
+            "method": "TOPSIS",
+            "connections_from": [2],
+            "connections_to": [5],
+            "kwargs": [],
+            "position_x": 30,
+            "position_y": 30,
+        },
+        {
+            "id": 4,
+            "node_type": "method",
+            "extension": "crisp",
+            "method": "WSM",
+            "connections_from": [2],
+            "connections_to": [5],
+            "kwargs": [],
+            "position_x": 30,
+            "position_y": 40,
+        },
+        {
+            "id": 5,
+            "node_type": "ranking",
+            "extension": "crisp",
+            "method": "rank",
+            "connections_from": [3, 4],
+            "connections_to": [],
+            "position_x": 40,
+            "position_y": 40,
+        }
+    ]
+
+    response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en'}, json={'data': data, 'profile': True, 'parallel': parallel}, content_type='application/json')
+    payload = json.loads(response.data.decode('utf-8'))
+
+    assert response.status_code == 200
+    assert [(item['node_id'], item['matrix_id']) for item in payload['profile']['nodes']] == [(1, 1), (2, 1), (3, 1), (4, 1), (5, 1)]
+    assert all([item['wall_time'] >= 0 and item['cpu_time'] >= 0 and item['memory_peak'] is None for item in payload['profile']['nodes']])
+    assert payload['profile']['nodes'][2]['output_size'] > 0
+    assert payload['profile']['critical_path']['nodes'][:2] == [1, 2]
+    assert payload['profile']['critical_path']['nodes'][-1] == 5
+
+    response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en'}, json={'data': data, 'profile': True, 'profile_memory': True, 'parallel': parallel}, content_type='application/json')
+    payload = json.loads(response.data.decode('utf-8'))
+
+    assert response.status_code == 200
+    assert all([item['memory_peak'] >= 0 for item in payload['profile']['nodes']])
+
+    response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en'}, json={'data': data}, content_type='application/json')
+    payload = json.loads(response.data.decode('utf-8'))
+
+    assert 'profile' not in payload
+
+@pytest.mark.parametrize('matrix, message', [
+    ([["1, 2, 3", "3, 4, 5"], ["2, 3, 4", "5, 4, 3"]], 'ordered from the lowest to the highest'),
+    ([["1, 2, 3", "3, 4"], ["2, 3, 4", "3, 4, 5"]], 'wrong format'),
+    ([["1, 2, 3", "3, 4, 5"], ["2, 3, 4", "3, 4, 5", "4, 5, 6", "5, 6, 7"]], 'wrong format'),
+])
+def test_results_calculation_fuzzy_matrix_error(client, matrix, message):
+    """
+        Test verifying that the fuzzy matrix given as text with invalid Triangular Fuzzy Numbers is rejected
+    """
+    data = [
+        {
+            "id": 1,
+            "node_type": "matrix",
+            "extension": "fuzzy",
+            "matrix": matrix,
+            "criteria_types": [1, -1],
+            "method": "input",
+            "connections_from": [],
+            "connections_to": [2],
+            "position_x": 10,
+            "position_y": 10,
+        },
+        {
+            "id": 2,
+            "node_type": "weights",
+            "extension": "fuzzy",
+            "weights": [],
+            "method": "EQUAL",
+            "connections_from": [1],
+            "connections_to": [],
+            "position_x": 20,
+            "position_y": 20,
+        }
+    ]
+
+    response = client.post('/api/v1/calculations/calculate', headers={'locale': 'en'}, json={'data': data}, content_type='application/json')
+    payload = json.loads(response.data.decode('utf-8'))
+
+    assert response.status_code == 400
+    assert message in payload['message']
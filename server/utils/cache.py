@@ -0,0 +1,243 @@
+# Copyright (c) 2024 Jakub Więckowski
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+
+# CONST
+from config import CACHE_SIZE, CACHE_TTL, COMET_CACHE_SIZE
+
+def get_cache_key(*items):
+    """
+    Creates the content hash of the given items.
+
+    Arrays are hashed by their data type, shape and bytes, other items by their JSON representation.
+
+    Parameters
+    ----------
+    *items
+        Arrays, numbers, strings, lists or dictionaries describing the calculation.
+
+    Returns
+    -------
+    str
+        Hexadecimal SHA-256 digest of the items.
+    """
+    digest = hashlib.sha256()
+    for item in items:
+        if isinstance(item, np.ndarray):
+            item = np.ascontiguousarray(item)
+            digest.update(f'{item.dtype.str}{item.shape}'.encode())
+            digest.update(item.tobytes())
+        else:
+            digest.update(json.dumps(item, sort_keys=True, default=str).encode())
+        digest.update(b'|')
+
+    return digest.hexdigest()
+
+class LRUCache:
+    def __init__(self, size=CACHE_SIZE, ttl=CACHE_TTL) -> None:
+        """
+        Initializes the thread-safe cache with the least recently used eviction.
+
+        Parameters
+        ----------
+        size : int, optional
+            Maximum number of stored items (default is CACHE_SIZE).
+        ttl : int, optional
+            Time in seconds after which the stored item expires (default is CACHE_TTL).
+        """
+        self.size = size
+        self.ttl = ttl
+        self.items = OrderedDict() # key -> (expiration time, value)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """
+        Retrieves the stored value and marks it as recently used.
+
+        Parameters
+        ----------
+        key : str
+            Key of the value.
+
+        Returns
+        -------
+        object
+            Stored value, or None if the key is not found or expired.
+        """
+        with self.lock:
+            item = self.items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+
+            expires, value = item
+            if expires < time.monotonic():
+                del self.items[key]
+                self.evictions += 1
+                self.misses += 1
+                return None
+
+            self.items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        """
+        Stores the value, evicting the least recently used items above the size limit.
+
+        Parameters
+        ----------
+        key : str
+            Key of the value.
+        value : object
+            Value to store.
+        """
+        if self.size <= 0:
+            return
+
+        with self.lock:
+            self.items[key] = (time.monotonic() + self.ttl, value)
+            self.items.move_to_end(key)
+            while len(self.items) > self.size:
+                self.items.popitem(last=False)
+                self.evictions += 1
+
+    def remove(self, key):
+        """
+        Removes the stored value.
+
+        Parameters
+        ----------
+        key : str
+            Key of the value.
+
+        Returns
+        -------
+        object
+            Removed value, or None if the key is not found.
+        """
+        with self.lock:
+            item = self.items.pop(key, None)
+
+        return item[1] if item is not None else None
+
+    def clear(self):
+        """
+        Removes all stored items and resets the counters.
+        """
+        with self.lock:
+            self.items.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def get_stats(self):
+        """
+        Retrieves the statistics of the cache usage.
+
+        Returns
+        -------
+        dict
+            Number of stored items, hits, misses and evictions.
+        """
+        with self.lock:
+            return {
+                "size": len(self.items),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+class SingleFlight:
+    def __init__(self) -> None:
+        """
+        Initializes the thread-safe coalescing of identical calls running at the same time.
+
+        The first call with the key is evaluated, and the calls with the same key made before it finishes wait for its result.
+        """
+        self.calls = {} # key -> (event set when the call finishes, [result, error])
+        self.lock = threading.Lock()
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key, function):
+        """
+        Evaluates the function, or waits for the result of the function evaluated with the same key.
+
+        Parameters
+        ----------
+        key : str
+            Key of the call, e.g. the content hash of the request.
+        function : callable
+            Function without arguments evaluated by the first call with the key.
+
+        Raises
+        ------
+        Exception
+            The error raised by the function, also in the waiting calls.
+
+        Returns
+        -------
+        object
+            Result of the function, shared by all coalesced calls.
+        """
+        with self.lock:
+            call = self.calls.get(key)
+            if call is None:
+                call = (threading.Event(), [None, None])
+                self.calls[key] = call
+                self.executed += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        event, outcome = call
+        if not leader:
+            event.wait()
+        else:
+            try:
+                outcome[0] = function()
+            except Exception as err:
+                outcome[1] = err
+            finally:
+                with self.lock:
+                    del self.calls[key]
+                event.set()
+
+        if outcome[1] is not None:
+            raise outcome[1]
+
+        return outcome[0]
+
+    def get_stats(self):
+        """
+        Retrieves the statistics of the coalesced calls.
+
+        Returns
+        -------
+        dict
+            Number of calls running at the moment, evaluated calls and calls which waited for the result of another call.
+        """
+        with self.lock:
+            return {
+                "in_flight": len(self.calls),
+                "executed": self.executed,
+                "coalesced": self.coalesced,
+            }
+
+# results of the MCDA methods and criteria weighting methods shared between requests
+preferences_cache = LRUCache()
+weights_cache = LRUCache()
+# fitted COMET models (characteristic objects and their preferences) reused for other decision matrices
+comet_cache = LRUCache(COMET_CACHE_SIZE)
+# identical calculation requests evaluated at the same time share a single calculation
+calculations_flight = SingleFlight()
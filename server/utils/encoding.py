@@ -0,0 +1,106 @@
+# Copyright (c) 2024 Jakub Więckowski
+
+import base64
+import numpy as np
+
+# little-endian float64, the same on all platforms
+ARRAY_DTYPE = np.dtype('<f8')
+
+def encode_array(values):
+    """
+    Encodes the numeric values as the base64 buffer of little-endian float64 numbers.
+
+    Parameters
+    ----------
+    values : array_like
+        Numeric values of any shape, missing values (None) are not allowed.
+
+    Returns
+    -------
+    dict
+        Encoded array with the 'dtype', 'shape' and 'data' keys.
+    """
+    array = np.ascontiguousarray(values, dtype=ARRAY_DTYPE)
+    return {
+        "dtype": ARRAY_DTYPE.str,
+        "shape": list(array.shape),
+        "data": base64.b64encode(array.tobytes()).decode('ascii'),
+    }
+
+def decode_array(encoded):
+    """
+    Decodes the array encoded with `encode_array`.
+
+    Parameters
+    ----------
+    encoded : dict
+        Encoded array with the 'dtype', 'shape' and 'data' keys.
+
+    Returns
+    -------
+    ndarray
+        Decoded array of the given shape.
+    """
+    return np.frombuffer(base64.b64decode(encoded['data']), dtype=np.dtype(encoded['dtype'])).reshape(encoded['shape'])
+
+def encode_fields(data, fields):
+    """
+    Encodes the numeric fields of the calculation results.
+
+    Parameters
+    ----------
+    data : list
+        Calculation results of the node.
+    fields : tuple
+        Keys of the fields with numeric values.
+
+    Returns
+    -------
+    list
+        Copies of the results with the fields encoded with `encode_array`.
+    """
+    return [item | {key: encode_array(item[key]) for key in fields if key in item} for item in data]
+
+def round_values(values, precision):
+    """
+    Rounds the numeric values to the given number of decimal places.
+
+    Parameters
+    ----------
+    values : array_like
+        Numeric values of any shape, rows given as None are kept.
+    precision : int
+        Number of decimal places.
+
+    Returns
+    -------
+    list
+        Rounded values.
+    """
+    if isinstance(values, list) and any([row is None for row in values]):
+        return [None if row is None else round_values(row, precision) for row in values]
+
+    return np.round(np.asarray(values, dtype=float), precision).tolist()
+
+def round_fields(data, fields, precision):
+    """
+    Rounds the numeric fields of the calculation results, which are kept in full precision during the calculation.
+
+    Parameters
+    ----------
+    data : list
+        Calculation results of the node.
+    fields : tuple
+        Keys of the fields with numeric values.
+    precision : int or None
+        Number of decimal places, None to return the results without rounding and copying.
+
+    Returns
+    -------
+    list
+        Copies of the results with the rounded fields, or the same results if precision is None.
+    """
+    if precision is None:
+        return data
+
+    return [item | {key: round_values(item[key], precision) for key in fields if key in item} for item in data]
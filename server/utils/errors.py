@@ -38,4 +38,18 @@ def get_error_message(locale, key):
     if key not in list(error_codes[locale].keys()):
         return error_codes[locale]['key-error']
     
-    return error_codes[locale][key]
\ No newline at end of file
+    return error_codes[locale][key]
+
+def log_error(err):
+    """
+    Log the error with the logger of the API namespace.
+
+    The namespace is imported on the first use, so the calculation modules can be imported without the routes (e.g. in the worker processes).
+
+    Parameters
+    ----------
+    err : Exception or str
+        The error to be logged.
+    """
+    from routes.namespaces import v1 as api
+    api.logger.info(str(err))
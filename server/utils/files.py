@@ -5,10 +5,8 @@ import json
 import pandas as pd
 
 from .validator import validate_dimensions, validate_matrix, validate_types
-from .errors import get_error_message
-
-# LOGGER
-from routes.namespaces import v1 as api
+from .fuzzy import parse_fuzzy_cells
+from .errors import get_error_message, log_error
 
 class Files():
     @staticmethod
@@ -41,7 +39,7 @@ class Files():
             validate_types(locale, criteria_types)
             validate_dimensions(locale, matrix, criteria_types)
         except Exception as err:
-            api.logger.info(str(err))
+            log_error(err)
             raise ValueError(err)
 
     @staticmethod
@@ -118,7 +116,7 @@ class Files():
                 Files.__validate_input_data(locale, matrix, extension, criteria_types)
                 return matrix, criteria_types
             except Exception as err:
-                api.logger.info(str(err))
+                log_error(err)
                 raise ValueError(err)
         
         def read_from_csv_fuzzy(file):
@@ -151,18 +149,7 @@ class Files():
             matrix, criteria_types = None, None
             try:
                 data = df.iloc[0:-1].to_numpy()
-                matrix = []
-                for row in range(data.shape[0]):
-                    temp = []
-                    for col in range(data.shape[1]):
-                        items = data[row, col].split(' ')
-                        items = [float(item) for item in items if item != ''] 
-                        temp.append(items)
-                    matrix.append(temp)             
-                matrix = np.array(matrix, dtype='object')
-
-                if any([any([len(mm) != 3 for mm in m]) for m in matrix]):
-                    raise ValueError(f'{get_error_message(locale, "fuzzy-matrix-format-error")}')
+                matrix = parse_fuzzy_cells(data)
                 
             except:
                 raise ValueError(f'{get_error_message(locale, "fuzzy-matrix-format-error")}')
@@ -178,7 +165,7 @@ class Files():
                 Files.__validate_input_data(locale, matrix, extension, criteria_types)
                 return matrix, criteria_types
             except Exception as err:
-                api.logger.info(str(err))
+                log_error(err)
                 raise ValueError(err)
 
         def read_from_xlsx_crisp(file):
@@ -228,7 +215,7 @@ class Files():
                 Files.__validate_input_data(locale, matrix, extension, criteria_types)
                 return matrix, criteria_types
             except Exception as err:
-                api.logger.info(str(err))
+                log_error(err)
                 raise ValueError(err)
         
         def read_from_xlsx_fuzzy(file):
@@ -260,18 +247,7 @@ class Files():
             matrix, criteria_types = None, None
             try:
                 data = df.iloc[0:-2].to_numpy()
-                matrix = []
-                for row in range(data.shape[0]):
-                    temp = []
-                    for col in range(data.shape[1]):
-                        items = data[row, col].split(' ')
-                        items = [float(item) for item in items if item != ''] 
-                        temp.append(items)
-                    matrix.append(temp)             
-                matrix = np.array(matrix, dtype='object')
-
-                if any([any([len(mm) != 3 for mm in m]) for m in matrix]):
-                    raise ValueError(f'{get_error_message(locale, "fuzzy-matrix-format-error")}')
+                matrix = parse_fuzzy_cells(data)
 
             except:
                 raise ValueError(f'{get_error_message(locale, "fuzzy-matrix-format-error")}')
@@ -287,7 +263,7 @@ class Files():
                 Files.__validate_input_data(locale, matrix, extension, criteria_types)
                 return matrix, criteria_types
             except Exception as err:
-                api.logger.info(str(err))
+                log_error(err)
                 raise ValueError(err)
 
         def read_from_json_crisp(file):
@@ -332,7 +308,7 @@ class Files():
                 Files.__validate_input_data(locale, matrix, extension, criteria_types)
                 return matrix, criteria_types
             except Exception as err:
-                api.logger.info(str(err))
+                log_error(err)
                 raise ValueError(err)
         
         def read_from_json_fuzzy(file):
@@ -363,7 +339,7 @@ class Files():
 
             matrix = data['matrix']
             try:
-                matrix = np.array(matrix)
+                matrix = np.array(matrix, dtype=np.float64)
             except:
                 raise ValueError(f'{get_error_message(locale, "matrix-array-convert-error")}')
             
@@ -377,7 +353,7 @@ class Files():
                 Files.__validate_input_data(locale, matrix, extension, criteria_types)
                 return matrix, criteria_types
             except Exception as err:
-                api.logger.info(str(err))
+                log_error(err)
                 raise ValueError(err)
 
         if extension == 'crisp':
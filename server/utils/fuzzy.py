@@ -0,0 +1,51 @@
+# Copyright (c) 2024 Jakub Więckowski
+
+import numpy as np
+
+def parse_fuzzy_cells(cells):
+    """
+    Converts the cells with Triangular Fuzzy Numbers written as text to the fuzzy decision matrix.
+
+    Values in the cell are separated by spaces or commas, e.g. '1 2 3' or '1, 2, 3'.
+
+    Parameters
+    ----------
+    cells : array_like
+        Cells of the decision matrix (m x n), each with three values.
+
+    Raises
+    ------
+    ValueError
+        If the rows have different numbers of cells, or any cell does not contain exactly three numeric values.
+
+    Returns
+    -------
+    ndarray
+        Fuzzy decision matrix (m x n x 3) of float64 values.
+    """
+    rows = [[str(cell).replace(',', ' ') for cell in row] for row in cells]
+    # values of ragged rows would be reshaped into cells of other alternatives and criteria
+    if len(set([len(row) for row in rows])) > 1:
+        raise ValueError('Each row of the fuzzy matrix should contain the same number of cells')
+    if any(len(cell.split()) != 3 for row in rows for cell in row):
+        raise ValueError('Each cell of the fuzzy matrix should contain three values')
+
+    # values of all cells are converted at once
+    values = np.array(' '.join([' '.join(row) for row in rows]).split(), dtype=np.float64)
+    return values.reshape(len(rows), -1, 3)
+
+def fuzzy_to_strings(matrix):
+    """
+    Converts the fuzzy decision matrix to the cells with Triangular Fuzzy Numbers written as text.
+
+    Parameters
+    ----------
+    matrix : ndarray
+        Fuzzy decision matrix (m x n x 3).
+
+    Returns
+    -------
+    list
+        Cells of the decision matrix (m x n) with values separated by commas, e.g. '1.0, 2.0, 3.0'.
+    """
+    return [[', '.join(cell) for cell in row] for row in np.asarray(matrix).astype(str).tolist()]
@@ -1,10 +1,7 @@
 import numpy as np
 import pyfdm
 
-from .errors import get_error_message
-
-# LOGGER
-from routes.namespaces import v1 as api
+from .errors import get_error_message, log_error
 
 def generate_random_matrix(locale, alternatives, criteria, extension, lower_bound=None, upper_bound=None, precision=None):
     """
@@ -66,7 +63,7 @@ def generate_random_matrix(locale, alternatives, criteria, extension, lower_boun
         else:
             raise ValueError(f'{get_error_message(locale, "random-matrix-extension-error")} {extension}')
     except Exception as err:  
-        api.logger.info(str(err))
+        log_error(err)
         raise ValueError(err)
 
 
@@ -101,9 +101,34 @@ def validate_matrix(locale: str, matrix: np.ndarray, extension: str):
         # dimension
         if matrix.ndim != 3 or matrix.shape[2] != 3:
             raise ValueError(f'{get_error_message(locale, "fuzzy-matrix-format-error")}')
+        # numeric values
+        if matrix.dtype != np.float64:
+            raise ValueError(f'{get_error_message(locale, "fuzzy-matrix-format-error")}')
+        validate_fuzzy_numbers(locale, matrix)
     else:
         raise ValueError(f'{extension} {get_error_message(locale, "data-extension-error")}')
 
+def validate_fuzzy_numbers(locale: str, matrix: np.ndarray):
+    """
+        Validates if all Triangular Fuzzy Numbers in the fuzzy matrix are finite and ordered
+
+        Parameters
+        ----------
+            locale : string,
+                User application language
+
+            matrix : ndarray
+                Fuzzy decision matrix formatted as numpy array (m x n x 3).
+
+        Raises
+        -------
+            ValueError Exception
+                If any value is not finite, or the values of any Triangular Fuzzy Number are not in ascending order, the exception is thrown
+    """
+
+    if not np.all(np.isfinite(matrix)) or np.any(matrix[..., 1:] < matrix[..., :-1]):
+        raise ValueError(f'{get_error_message(locale, "fuzzy-matrix-values-error")}')
+
 
         
 
@@ -1,7 +1,6 @@
 # Copyright (c) 2023 Jakub Więckowski
 
-from utils.errors import get_error_message
-from routes.namespaces import v1 as api
+from utils.errors import get_error_message, log_error
 
 def assessment_wrapper(func):
     def wrapper(*args, **kwargs):
@@ -10,7 +9,7 @@ def assessment_wrapper(func):
 
         except Exception as err:
             locale = kwargs.get('locale')
-            api.logger.info(str(err))
+            log_error(err)
             raise ValueError(f'{get_error_message(locale, "assessment-error")}')
             
     return wrapper
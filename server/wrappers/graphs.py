@@ -5,8 +5,7 @@ from PIL import Image
 from base64 import encodebytes
 import matplotlib.pyplot as plt
 
-from utils.errors import get_error_message
-from routes.namespaces import v1 as api
+from utils.errors import get_error_message, log_error
 
 def graphs_wrapper(func):
     def wrapper(*args, **kwargs):
@@ -24,7 +23,7 @@ def graphs_wrapper(func):
             return f'data:image/jpeg;base64,{encoded_img}'
         except Exception as err:
             locale = 'en'
-            api.logger.info(str(err))
+            log_error(err)
             raise ValueError(f'{get_error_message(locale, "graph-error")}')
 
     return wrapper